@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from config.rules import CONNECTION_LEVEL_ALIASES, THEORETICAL_CHARGE_RULES
+
+
+def get_cardinalities(n_rows):
+    """
+    Get realistic numbers of distinct resources and projects for a timesheet size.
+
+    Args:
+        n_rows (int): Number of timesheet rows
+
+    Returns:
+        tuple: (int, int) - Number of resources and number of projects
+    """
+    n_resources = int(np.clip(n_rows // 200, 5, 2000))
+    n_projects = int(np.clip(n_rows // 50, 10, 20000))
+    return n_resources, n_projects
+
+
+def generate_timesheet(n_rows, seed=0):
+    """
+    Generate a synthetic timesheet DataFrame.
+
+    Args:
+        n_rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Columns 'Ressource', 'Projet' and 'Soumise (h)'
+    """
+    rng = np.random.default_rng(seed)
+    n_resources, n_projects = get_cardinalities(n_rows)
+
+    resources = np.array([f"Ressource {i:04d}" for i in range(n_resources)], dtype=object)
+    projects = np.array([f"Projet {i:05d}" for i in range(n_projects)], dtype=object)
+
+    # Resources work on a skewed subset of projects, as in real exports
+    project_weights = rng.pareto(1.5, n_projects) + 1
+    project_weights /= project_weights.sum()
+
+    return pd.DataFrame({
+        'Ressource': resources[rng.integers(0, n_resources, n_rows)],
+        'Projet': projects[rng.choice(n_projects, n_rows, p=project_weights)],
+        # Half-hour granularity, up to a full day
+        'Soumise (h)': rng.integers(1, 17, n_rows) / 2
+    })
+
+
+def generate_deployments(n_rows, seed=0, duplicate_ratio=0.1, missing_ratio=0.05):
+    """
+    Generate a synthetic deployments DataFrame matching generate_timesheet(n_rows).
+
+    Connection levels and phases are drawn from THEORETICAL_CHARGE_RULES (aliases
+    included), some projects are listed twice and some values are missing.
+
+    Args:
+        n_rows (int): Number of rows of the matching timesheet
+        seed (int): Random seed
+        duplicate_ratio (float): Share of projects listed a second time
+        missing_ratio (float): Share of missing connection levels and phases
+
+    Returns:
+        pandas.DataFrame: Columns 'Nom', 'Niveau de connexion' and 'Phase du projet'
+    """
+    rng = np.random.default_rng(seed + 1)
+    _, n_projects = get_cardinalities(n_rows)
+
+    levels = np.array(list(THEORETICAL_CHARGE_RULES) + list(CONNECTION_LEVEL_ALIASES), dtype=object)
+    phases = np.array(list(next(iter(THEORETICAL_CHARGE_RULES.values()))), dtype=object)
+
+    names = [f"Projet {i:05d}" for i in range(n_projects)]
+    n_duplicates = int(n_projects * duplicate_ratio)
+    names += [names[i] for i in rng.integers(0, n_projects, n_duplicates)]
+    n_deployments = len(names)
+
+    deployments_df = pd.DataFrame({
+        'Nom': names,
+        'Niveau de connexion': levels[rng.integers(0, len(levels), n_deployments)],
+        'Phase du projet': phases[rng.integers(0, len(phases), n_deployments)]
+    })
+
+    for column in ['Niveau de connexion', 'Phase du projet']:
+        deployments_df.loc[rng.random(n_deployments) < missing_ratio, column] = None
+
+    return deployments_df
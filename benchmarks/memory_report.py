@@ -0,0 +1,119 @@
+"""
+Report the memory footprint of the pipeline frames with plain and encoded identifiers.
+
+"before" keeps resource and project names as object columns, "after" encodes them
+once as categoricals, as the pipeline does. For each stage the deep size of the
+frame is reported, followed by the tracemalloc peak of the whole summary.
+
+format_resource_summary encodes the pivot itself and returns typed columns
+(categorical labels, float charges), so the summary frame and the peak are the
+same in both columns: the difference is in the timesheet, charge and pivot frames.
+
+Usage:
+    python -m benchmarks.memory_report --scales 100000 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.generators import generate_deployments, generate_timesheet
+from config.settings import DEPLOYMENT_LOOKUP_COLUMNS, IDENTIFIER_COLUMNS
+from core.data_processor import DataProcessor
+from core.excel_handler import ExcelHandler
+
+DEFAULT_SCALES = [100000, 1000000]
+
+
+def get_frame_mb(df):
+    """
+    Get the deep memory usage of a DataFrame, strings included.
+
+    Args:
+        df (pandas.DataFrame): The DataFrame to measure
+
+    Returns:
+        float: Memory usage in MB
+    """
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def run_pipeline(timesheet_df, lookup_df):
+    """
+    Run the summary stages and keep every intermediate frame.
+
+    Args:
+        timesheet_df (pandas.DataFrame): The timesheet data
+        lookup_df (pandas.DataFrame): Project information indexed by project name
+
+    Returns:
+        dict: Frame of each stage, by stage name
+    """
+    charge_df = DataProcessor.calculate_charge_jh(timesheet_df)
+    pivot_df = ExcelHandler.create_pivot_table(charge_df, 'Charge JH', ['Ressource', 'Projet'])
+    summary_df = DataProcessor.format_resource_summary(pivot_df, lookup_df)
+    return {'timesheet': timesheet_df, 'charge': charge_df, 'pivot': pivot_df, 'summary': summary_df}
+
+
+def get_peak_mb(func):
+    """
+    Measure the Python memory peak of a function call with tracemalloc.
+
+    Args:
+        func (callable): Function without arguments
+
+    Returns:
+        float: Peak memory in MB
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def report_scale(n_rows):
+    """
+    Print the before/after footprint of every stage at one timesheet size.
+
+    Args:
+        n_rows (int): Number of timesheet rows
+    """
+    plain_df = generate_timesheet(n_rows).astype({column: object for column in IDENTIFIER_COLUMNS})
+    encoded_df = DataProcessor.encode_identifiers(plain_df)
+    lookup_df = DataProcessor.create_lookup_table(generate_deployments(n_rows), DEPLOYMENT_LOOKUP_COLUMNS)
+
+    before = run_pipeline(plain_df, lookup_df)
+    after = run_pipeline(encoded_df, lookup_df)
+
+    print(f"\n{n_rows:,} rows")
+    print(f"  {'Stage':<12} {'Before (MB)':>12} {'After (MB)':>12} {'Ratio':>7}")
+    for stage in before:
+        before_mb, after_mb = get_frame_mb(before[stage]), get_frame_mb(after[stage])
+        print(f"  {stage:<12} {before_mb:>12.1f} {after_mb:>12.1f} {before_mb / after_mb:>6.1f}x")
+
+    before_peak = get_peak_mb(lambda: run_pipeline(plain_df, lookup_df))
+    after_peak = get_peak_mb(lambda: run_pipeline(encoded_df, lookup_df))
+    print(f"  {'peak':<12} {before_peak:>12.1f} {after_peak:>12.1f} {before_peak / after_peak:>6.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the memory footprint of encoded identifiers.")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="timesheet sizes in rows")
+    args = parser.parse_args(argv)
+
+    for n_rows in args.scales:
+        report_scale(n_rows)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Benchmark the pipeline stages on synthetic data.
+
+Usage:
+    python -m benchmarks.run_benchmarks --scales 1000 10000 100000 --output results.json
+    python -m benchmarks.run_benchmarks --baseline results.json --threshold 0.2
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.generators import generate_deployments, generate_timesheet
+from config.settings import DEPLOYMENT_LOOKUP_COLUMNS, TIMESHEET_COLUMNS
+from core.data_processor import DataProcessor
+from core.excel_handler import ExcelHandler
+
+DEFAULT_SCALES = [1000, 10000, 100000, 1000000]
+
+# Writing and reading XLSX files above this size takes minutes per run
+DEFAULT_MAX_EXCEL_ROWS = 100000
+
+
+def measure(func, track_memory=True):
+    """
+    Run a function and measure its wall time and peak Python memory.
+
+    The function is run once for timing and, when track_memory is set, a second
+    time under tracemalloc, so that tracing does not inflate the timing.
+
+    Args:
+        func (callable): Function without arguments
+        track_memory (bool): Whether to measure peak memory
+
+    Returns:
+        tuple: (object, float, float) - The function result, wall time in seconds
+            and peak memory in MB (None when not tracked)
+    """
+    gc.collect()
+    start_time = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start_time
+
+    peak_mb = None
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = peak / (1024 * 1024)
+
+    return result, seconds, peak_mb
+
+
+def run_scale(n_rows, work_dir, max_excel_rows=DEFAULT_MAX_EXCEL_ROWS, track_memory=True):
+    """
+    Benchmark every pipeline stage at one timesheet size.
+
+    Args:
+        n_rows (int): Number of timesheet rows
+        work_dir (str): Directory for the temporary Excel files
+        max_excel_rows (int): Largest size for which read_excel and write_excel are measured
+        track_memory (bool): Whether to measure peak memory
+
+    Returns:
+        list: One result dict per stage
+    """
+    timesheet_df = generate_timesheet(n_rows)
+    deployments_df = generate_deployments(n_rows)
+    with_excel = n_rows <= max_excel_rows
+
+    results = []
+
+    def record(stage, func):
+        result, seconds, peak_mb = measure(func, track_memory)
+        results.append({'scale': n_rows, 'stage': stage, 'seconds': seconds, 'peak_mb': peak_mb})
+        print(f"  {stage:<28} {seconds:>9.3f}s" + (f"  {peak_mb:>9.1f} MB" if peak_mb is not None else ""))
+        return result
+
+    if with_excel:
+        input_file = os.path.join(work_dir, f"timesheet_{n_rows}.xlsx")
+        timesheet_df.to_excel(input_file, index=False)
+        timesheet_df = record('read_excel', lambda: ExcelHandler.read_excel(input_file, TIMESHEET_COLUMNS))
+
+    charge_df = record('calculate_charge_jh', lambda: DataProcessor.calculate_charge_jh(timesheet_df))
+    pivot_df = record(
+        'create_pivot_table', lambda: ExcelHandler.create_pivot_table(charge_df, 'Charge JH', ['Ressource', 'Projet'])
+    )
+    record(
+        'create_connection_dict', lambda: DataProcessor.create_connection_dict(deployments_df, 'Niveau de connexion')
+    )
+    lookup_df = record(
+        'create_lookup_table', lambda: DataProcessor.create_lookup_table(deployments_df, DEPLOYMENT_LOOKUP_COLUMNS)
+    )
+    result_df = record(
+        'format_resource_summary', lambda: DataProcessor.format_resource_summary(pivot_df, lookup_df)
+    )
+
+    if with_excel:
+        output_file = os.path.join(work_dir, f"summary_{n_rows}.xlsx")
+        record('write_excel', lambda: ExcelHandler.write_excel(result_df, output_file, 'Resource Summary'))
+
+    return results
+
+
+def compare_results(results, baseline, threshold, min_seconds=0.01):
+    """
+    Find the stages that got slower than a baseline run.
+
+    Args:
+        results (list): Result dicts of the current run
+        baseline (list): Result dicts of the baseline run
+        threshold (float): Allowed relative slowdown (0.2 means 20%)
+        min_seconds (float): Slowdowns smaller than this are timing noise and ignored
+
+    Returns:
+        list: (scale, stage, baseline seconds, current seconds) for each regression
+    """
+    baseline_times = {(r['scale'], r['stage']): r['seconds'] for r in baseline}
+
+    regressions = []
+    for result in results:
+        previous = baseline_times.get((result['scale'], result['stage']))
+        if previous is None:
+            continue
+        slowdown = result['seconds'] - previous
+        if slowdown > previous * threshold and slowdown > min_seconds:
+            regressions.append((result['scale'], result['stage'], previous, result['seconds']))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resource summary pipeline.")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="timesheet sizes in rows")
+    parser.add_argument('--max-excel-rows', type=int, default=DEFAULT_MAX_EXCEL_ROWS,
+                        help="largest size for which Excel reading and writing are measured")
+    parser.add_argument('--no-memory', action='store_true', help="skip peak memory measurement")
+    parser.add_argument('--output', help="JSON file to save the results to")
+    parser.add_argument('--baseline', help="JSON results of a previous run to compare with")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="relative slowdown reported as a regression (default: 0.2)")
+    parser.add_argument('--min-seconds', type=float, default=0.01,
+                        help="absolute slowdown below which differences are ignored (default: 0.01)")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_rows in args.scales:
+            print(f"\n{n_rows:,} rows")
+            results.extend(run_scale(n_rows, work_dir, args.max_excel_rows, not args.no_memory))
+
+    if args.output:
+        report = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'results': results
+        }
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+        regressions = compare_results(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for scale, stage, previous, current in regressions:
+                print(f"  {stage} at {scale:,} rows: {previous:.3f}s -> {current:.3f}s")
+            return 1
+        print(f"\nNo regression above {args.threshold:.0%}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
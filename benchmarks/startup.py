@@ -0,0 +1,109 @@
+"""
+Benchmark the startup time of the command-line entry point.
+
+Each scenario runs main.py in a fresh interpreter with `-X importtime`, so that the
+wall time includes interpreter start and every import, as in real use.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 10 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(project_root, 'main.py')
+
+# Commands that must answer without loading the heavy data modules
+SCENARIOS = {
+    'help': ['--help'],
+    'batch --help': ['batch', '--help'],
+    'missing input': ['batch', '-d', 'missing_deployments.xlsx', 'missing_timesheet.xlsx'],
+    'invalid argument': ['stream', '-d', 'deployments.xlsx', 'timesheet.csv', '--chunk-size', 'many'],
+}
+
+HEAVY_MODULES = ['pandas', 'numpy', 'openpyxl', 'pyarrow']
+
+
+def parse_importtime(stderr):
+    """
+    Parse the `-X importtime` report of an interpreter run.
+
+    Args:
+        stderr (str): Standard error of the run
+
+    Returns:
+        tuple: (dict, set) - Cumulative import time in microseconds of each top-level
+            import, and the root package of every module imported, at any nesting depth
+    """
+    imports = {}
+    packages = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented under the module importing them
+        if not name.startswith('  '):
+            imports[name.strip()] = int(cumulative)
+        packages.add(name.strip().split('.')[0])
+    return imports, packages
+
+
+def run_scenario(args, repeat):
+    """
+    Run main.py several times with the same arguments.
+
+    Args:
+        args (list): Command-line arguments of main.py
+        repeat (int): Number of runs
+
+    Returns:
+        tuple: (list, dict, set) - Wall time in seconds of each run, and the top-level
+            imports and imported root packages of the last run
+    """
+    seconds = []
+    imports = {}
+    packages = set()
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', MAIN_SCRIPT] + args,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, cwd=project_root
+        )
+        seconds.append(time.perf_counter() - start_time)
+        imports, packages = parse_importtime(completed.stderr)
+    return seconds, imports, packages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of main.py.")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per scenario (default: 5)")
+    parser.add_argument('--top', type=int, default=10, help="slowest imports listed per scenario (default: 10)")
+    args = parser.parse_args(argv)
+
+    failed = []
+    for scenario, scenario_args in SCENARIOS.items():
+        seconds, imports, packages = run_scenario(scenario_args, args.repeat)
+        heavy = [name for name in HEAVY_MODULES if name in packages]
+
+        print(f"\n{scenario}: median {statistics.median(seconds) * 1000:.0f} ms, "
+              f"min {min(seconds) * 1000:.0f} ms over {args.repeat} runs")
+        for name, microseconds in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {name:<40} {microseconds / 1000:>8.1f} ms")
+        if heavy:
+            print(f"  Heavy modules loaded: {', '.join(heavy)}")
+            failed.append(scenario)
+
+    if failed:
+        print(f"\nHeavy modules were loaded by: {', '.join(failed)}")
+        return 1
+    print("\nNo scenario loaded a heavy module")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
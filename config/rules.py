@@ -1,4 +1,9 @@
 # Rules for theoretical charge calculation based on connection level and project phase
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
 
 # Mapping of connection level and phase to theoretical charge (NB JH)
 THEORETICAL_CHARGE_RULES = {
@@ -75,6 +80,91 @@ THEORETICAL_CHARGE_RULES = {
 }
 
 
+# Connection levels that share the rules of another connection level
+CONNECTION_LEVEL_ALIASES = {
+    "Connexion EDI Sortante Pilote": "Connexion EDI Pilote"
+}
+
+
+@lru_cache(maxsize=None)
+def get_charge_table():
+    """
+    Compile THEORETICAL_CHARGE_RULES into a (connection level x phase) lookup table.
+
+    Aliased connection levels get their own row, copied from the level they point to.
+    The table is built on first use and cached for the lifetime of the process.
+
+    Returns:
+        tuple: (pandas.Index, pandas.Index, numpy.ndarray) - Connection levels (rows),
+            project phases (columns) and the 2-D charge array (NaN where no rule exists)
+    """
+    levels, phases, tables = compile_charge_tables([THEORETICAL_CHARGE_RULES])
+    return levels, phases, tables[0]
+
+
+def compile_charge_tables(rule_sets, aliases=CONNECTION_LEVEL_ALIASES):
+    """
+    Compile several rule sets into one (rule set x connection level x phase) table.
+
+    Levels and phases are the union of those of every rule set, so the same
+    coordinates address all rule sets; a rule missing from a set is NaN there.
+
+    Args:
+        rule_sets (list): Rule mappings shaped like THEORETICAL_CHARGE_RULES
+        aliases (dict): Connection levels sharing the rules of another level
+
+    Returns:
+        tuple: (pandas.Index, pandas.Index, numpy.ndarray) - Connection levels, project
+            phases and the read-only 3-D charge array
+    """
+    levels = []
+    phases = []
+    for rules in rule_sets:
+        for level, phase_rules in rules.items():
+            if level not in levels:
+                levels.append(level)
+            for phase in phase_rules:
+                if phase not in phases:
+                    phases.append(phase)
+    levels += [level for level in aliases if level not in levels]
+
+    levels = pd.Index(levels)
+    phases = pd.Index(phases)
+
+    tables = np.full((len(rule_sets), len(levels), len(phases)), np.nan)
+    for s, rules in enumerate(rule_sets):
+        for i, level in enumerate(levels):
+            phase_rules = rules.get(aliases.get(level, level), {})
+            tables[s, i, phases.get_indexer(list(phase_rules))] = list(phase_rules.values())
+
+    tables.setflags(write=False)
+    return levels, phases, tables
+
+
+def get_theoretical_charges(connection_levels, project_phases):
+    """
+    Get the theoretical charges for whole columns of connection levels and project phases.
+
+    Args:
+        connection_levels (array-like): The connection levels
+        project_phases (array-like): The project phases, aligned with connection_levels
+
+    Returns:
+        numpy.ndarray: The theoretical charge values, NaN where no matching rule is found
+    """
+    levels, phases, table = get_charge_table()
+
+    # Translate labels to table coordinates; unknown or empty labels map to -1
+    level_codes = levels.get_indexer(pd.Index(connection_levels, dtype=object))
+    phase_codes = phases.get_indexer(pd.Index(project_phases, dtype=object))
+
+    charges = np.full(len(level_codes), np.nan)
+    matched = (level_codes >= 0) & (phase_codes >= 0)
+    charges[matched] = table[level_codes[matched], phase_codes[matched]]
+
+    return charges
+
+
 def get_theoretical_charge(connection_level, project_phase):
     """
     Get the theoretical charge based on connection level and project phase.
@@ -86,21 +176,9 @@ def get_theoretical_charge(connection_level, project_phase):
     Returns:
         float: The theoretical charge value, or None if no matching rule is found
     """
-    # Handle empty values
-    if not connection_level or not project_phase:
-        return None
-
-    # Special case for "Connexion EDI Sortante Pilote" - use "Connexion EDI Pilote" rules
-    if connection_level == "Connexion EDI Sortante Pilote":
-        connection_level = "Connexion EDI Pilote"
-
-    # Check if connection level exists in rules
-    if connection_level not in THEORETICAL_CHARGE_RULES:
-        return None
+    charge = get_theoretical_charges([connection_level], [project_phase])[0]
 
-    # Check if project phase exists for this connection level
-    phase_rules = THEORETICAL_CHARGE_RULES[connection_level]
-    if project_phase not in phase_rules:
+    if np.isnan(charge):
         return None
 
-    return phase_rules[project_phase]
\ No newline at end of file
+    return float(charge)
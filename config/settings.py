@@ -0,0 +1,67 @@
+# General settings for the resource summary pipeline
+import os
+
+# Column of the deployments file holding the project name
+DEPLOYMENT_KEY_COLUMN = 'Nom'
+
+# Columns looked up in the deployments file for each project
+DEPLOYMENT_LOOKUP_COLUMNS = ['Niveau de connexion', 'Phase du projet']
+
+# Columns read from the timesheet file
+TIMESHEET_COLUMNS = ['Ressource', 'Projet', 'Soumise (h)']
+
+# Alternative spellings of column names found in input files
+COLUMN_ALIASES = {
+    'Resource': 'Ressource'
+}
+
+# Timesheet columns holding repeated names, encoded as categoricals through the pipeline
+IDENTIFIER_COLUMNS = ['Ressource', 'Projet']
+
+# Compact dtypes applied to projected columns when reading input files. 'Soumise (h)'
+# stays float64: float32 hours would change the Charge JH written (7.3 h -> 0.91250002)
+COLUMN_DTYPES = {
+    'Ressource': 'category',
+    'Projet': 'category',
+    'Nom': 'category',
+    'Niveau de connexion': 'category',
+    'Phase du projet': 'category'
+}
+
+# Data checks: largest plausible 'Soumise (h)' of a timesheet row (a 31-day month),
+# and number of offending rows listed per check in the Diagnostics sheet
+MAX_SUBMITTED_HOURS = 744
+MAX_DIAGNOSTIC_ROWS = 1000
+
+# Capacity analytics: capacity of a resource over the timesheet period when no
+# capacity file is given (working days in a month), and size of the rankings
+CAPACITY_COLUMN = 'Capacite JH'
+DEFAULT_CAPACITY_JH = 20.0
+CAPACITY_TOP_N = 10
+
+# Cache of parsed input files
+CACHE_DIR = os.environ.get(
+    'RESOURCE_SUMMARY_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'resource_summary')
+)
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_ENABLED = os.environ.get('RESOURCE_SUMMARY_CACHE', '1') != '0'
+
+# History of the summary rows of every run, for trend queries
+HISTORY_FILE = os.environ.get(
+    'RESOURCE_SUMMARY_HISTORY_FILE',
+    os.path.join(os.path.expanduser('~'), '.local', 'share', 'resource_summary', 'history.sqlite')
+)
+HISTORY_ENABLED = os.environ.get('RESOURCE_SUMMARY_HISTORY', '1') != '0'
+
+# Number of timesheet rows read at a time by the stream command
+DEFAULT_CHUNK_SIZE = 100000
+
+# Watch mode: seconds between two scans of the watched files, and seconds a changed
+# file must stay unchanged before it is processed (exports are written in several steps)
+WATCH_INTERVAL = 2.0
+WATCH_DEBOUNCE = 5.0
+
+# Local summary service
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = int(os.environ.get('RESOURCE_SUMMARY_PORT', '8765'))
@@ -0,0 +1,262 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config.settings import CACHE_ENABLED
+from core.cache import DataFrameCache
+from core.file_handler import SUPPORTED_EXTENSIONS
+from core.pipeline import create_matcher, process_timesheet, read_lookup_table
+from utils.helpers import get_default_output_path
+
+# Suffix of the summary files, also used to skip them when scanning input directories
+OUTPUT_SUFFIX = "_resource_summary"
+
+# State shared by the tasks of a worker process, set once by init_worker
+_worker_state = {}
+
+
+def collect_input_files(inputs):
+    """
+    Expand files, directories and glob patterns into a list of timesheet files.
+
+    Directories contribute their Excel, CSV and Parquet files. Previously generated
+    summaries (and their sibling sheet files) and Excel lock files (~$...) are skipped.
+
+    Args:
+        inputs (list): File paths, directory paths or glob patterns
+
+    Returns:
+        list: Sorted, de-duplicated list of file paths
+    """
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            files.extend(
+                os.path.join(item, name) for name in os.listdir(item)
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+            )
+        elif glob.has_magic(item):
+            files.extend(glob.glob(item))
+        else:
+            files.append(item)
+
+    selected = []
+    for file_path in files:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        if name.startswith('~$') or OUTPUT_SUFFIX in name:
+            continue
+        selected.append(os.path.normpath(file_path))
+
+    return sorted(set(selected))
+
+
+def get_output_path(input_file, output_dir=None, output_format='xlsx'):
+    """
+    Get the summary path of a timesheet file.
+
+    Args:
+        input_file (str): Path to the timesheet file
+        output_dir (str): Directory for the summaries, or None to write next to the input
+        output_format (str): Extension of the summary file ('xlsx', 'csv' or 'parquet')
+
+    Returns:
+        str: Output file path
+    """
+    output_file = os.path.splitext(get_default_output_path(input_file, OUTPUT_SUFFIX))[0] + f".{output_format}"
+    if output_dir:
+        output_file = os.path.join(output_dir, os.path.basename(output_file))
+    return output_file
+
+
+def get_output_paths(input_files, output_dir=None, output_format='xlsx'):
+    """
+    Get the summary path of several timesheet files, making sure no two of them share it.
+
+    Timesheets differing only by extension (e.g. ts.xlsx and ts.csv), or with the same
+    name in different directories when output_dir is set, would overwrite each other's summary.
+
+    Args:
+        input_files (list): Paths to the timesheet files
+        output_dir (str): Directory for the summaries, or None to write next to each input
+        output_format (str): Extension of the summary files ('xlsx', 'csv' or 'parquet')
+
+    Returns:
+        dict: Mapping of timesheet file to output file path, in input order
+
+    Raises:
+        ValueError: If several timesheets would be summarized to the same file
+    """
+    output_files = {input_file: get_output_path(input_file, output_dir, output_format) for input_file in input_files}
+
+    collisions = find_output_collisions(output_files)
+    if collisions:
+        details = "; ".join(", ".join(inputs) for inputs in collisions)
+        raise ValueError(
+            f"Several timesheets would be summarized to the same file, rename or separate them: {details}"
+        )
+
+    return output_files
+
+
+def find_output_collisions(output_files):
+    """
+    Find the timesheets that share their summary path.
+
+    Args:
+        output_files (dict): Mapping of timesheet file to output file path
+
+    Returns:
+        list: One list of timesheet files per output path shared by several of them
+    """
+    inputs_by_output = {}
+    for input_file, output_file in output_files.items():
+        inputs_by_output.setdefault(os.path.normcase(os.path.abspath(output_file)), []).append(input_file)
+
+    return [inputs for inputs in inputs_by_output.values() if len(inputs) > 1]
+
+
+def init_worker(lookup_df, use_cache, sheet_pattern, match_mode, deployment_issues=None, capacity_plan=None,
+                history_store=None, drilldown=False):
+    """
+    Set up the state shared by the tasks of a worker process.
+
+    Args:
+        lookup_df (pandas.DataFrame): Project information indexed by project name
+        use_cache (bool): Whether to use the cache of parsed files
+        sheet_pattern (str): Pattern of the timesheet sheets to read, or None for the first sheet only
+        match_mode (str): How project names are matched: 'exact', 'normalized' or 'fuzzy'
+        deployment_issues (list): Issues of the deployments data checks, to add a
+            Diagnostics sheet to each summary; None to leave it out
+        capacity_plan (CapacityPlan): Resource capacities, to add the capacity sheet; or None
+        history_store (HistoryStore): Store recording the summary rows of each file, or None
+        drilldown (bool): Whether to add the per-project, per-level and per-phase sheets
+    """
+    _worker_state['lookup_df'] = lookup_df
+    _worker_state['cache'] = DataFrameCache() if use_cache else None
+    _worker_state['sheet_pattern'] = sheet_pattern
+    _worker_state['matcher'] = create_matcher(lookup_df, match_mode, use_cache)
+    _worker_state['deployment_issues'] = deployment_issues
+    _worker_state['capacity_plan'] = capacity_plan
+    _worker_state['history_store'] = history_store
+    _worker_state['drilldown'] = drilldown
+
+
+def process_file(input_file, output_file):
+    """
+    Process one timesheet in a worker process, reporting failures instead of raising.
+
+    Returns:
+        dict: File name, output path, row count, elapsed seconds and error message (or None)
+    """
+    start_time = time.perf_counter()
+    result = {'input': input_file, 'output': output_file, 'rows': None, 'error': None}
+
+    try:
+        result['rows'] = process_timesheet(
+            input_file, _worker_state['lookup_df'], output_file,
+            cache=_worker_state['cache'], sheet_pattern=_worker_state['sheet_pattern'],
+            matcher=_worker_state['matcher'], deployment_issues=_worker_state['deployment_issues'],
+            capacity_plan=_worker_state['capacity_plan'], history_store=_worker_state['history_store'],
+            drilldown=_worker_state['drilldown']
+        )
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['seconds'] = time.perf_counter() - start_time
+    return result
+
+
+def run_batch(deployments_file, input_files, output_dir=None, workers=None, use_cache=CACHE_ENABLED,
+              sheet_pattern=None, output_format='xlsx', match_mode='exact', diagnostics=False, capacity_plan=None,
+              history_store=None, drilldown=False):
+    """
+    Summarize many timesheet files against one deployments file.
+
+    The deployments file is read and indexed once, then the timesheets are processed
+    in a process pool. A failure in one file is reported and does not stop the batch.
+
+    Args:
+        deployments_file (str): Path to the deployments Excel file
+        input_files (list): Paths to the timesheet files
+        output_dir (str): Directory for the summaries, or None to write next to each input
+        workers (int): Number of worker processes (defaults to the number of CPUs)
+        use_cache (bool): Whether to use the cache of parsed files
+        sheet_pattern (str): Pattern of the timesheet sheets to read, or None for the first sheet only
+        output_format (str): Format of the summaries ('xlsx', 'csv' or 'parquet')
+        match_mode (str): How project names are matched: 'exact', 'normalized' or 'fuzzy'
+        diagnostics (bool): Whether to add a Diagnostics sheet of the data checks to each summary
+        capacity_plan (CapacityPlan): Resource capacities, to add the capacity sheet; or None
+        history_store (HistoryStore): Store recording the summary rows of each file, or None
+        drilldown (bool): Whether to add the per-project, per-level and per-phase sheets
+
+    Returns:
+        list: One result dict per input file, in input order
+
+    Raises:
+        ValueError: If several timesheets would be summarized to the same file
+    """
+    output_files = get_output_paths(input_files, output_dir, output_format)
+    cache = DataFrameCache() if use_cache else None
+
+    print(f"Reading deployments data from '{deployments_file}'...")
+    deployment_issues = None
+    if diagnostics:
+        lookup_df, deployment_issues = read_lookup_table(deployments_file, cache=cache, verbose=True, check=True)
+    else:
+        lookup_df = read_lookup_table(deployments_file, cache=cache, verbose=True)
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Processing {len(input_files)} file(s)...")
+    results = {}
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker,
+        initargs=(
+            lookup_df, use_cache, sheet_pattern, match_mode, deployment_issues, capacity_plan, history_store, drilldown
+        )
+    ) as executor:
+        futures = {
+            executor.submit(process_file, input_file, output_file): input_file
+            for input_file, output_file in output_files.items()
+        }
+
+        for future in as_completed(futures):
+            input_file = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = {
+                    'input': input_file, 'output': None, 'rows': None,
+                    'seconds': None, 'error': f"{type(e).__name__}: {e}"
+                }
+
+            status = "OK" if result['error'] is None else "FAILED"
+            print(f"  [{status}] {input_file}")
+            results[input_file] = result
+
+    return [results[input_file] for input_file in input_files]
+
+
+def print_timing_table(results):
+    """
+    Print a per-file summary of a batch run.
+
+    Args:
+        results (list): Result dicts as returned by run_batch
+    """
+    name_width = max([len('File')] + [len(os.path.basename(r['input'])) for r in results])
+
+    print(f"\n{'File':<{name_width}}  {'Rows':>10}  {'Time (s)':>9}  Status")
+    print(f"{'-' * name_width}  {'-' * 10}  {'-' * 9}  {'-' * 6}")
+
+    for result in results:
+        rows = f"{result['rows']:,}" if result['rows'] is not None else '-'
+        seconds = f"{result['seconds']:.2f}" if result['seconds'] is not None else '-'
+        status = "OK" if result['error'] is None else f"FAILED ({result['error']})"
+        print(f"{os.path.basename(result['input']):<{name_width}}  {rows:>10}  {seconds:>9}  {status}")
+
+    failed = sum(1 for result in results if result['error'] is not None)
+    print(f"\n{len(results) - failed} succeeded, {failed} failed")
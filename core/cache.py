@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+from config.settings import CACHE_DIR, CACHE_MAX_BYTES
+
+try:
+    import pyarrow.feather as feather
+    CACHE_FORMAT = 'feather'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+
+class DataFrameCache:
+    """
+    On-disk cache of parsed DataFrames, keyed by source file identity.
+
+    Entries are stored as uncompressed Feather (Arrow IPC) files when pyarrow is
+    installed, pickles otherwise. Feather entries are read through a memory map: the
+    columns of the DataFrame are views of the mapped file rather than copies, so the
+    processes reading the same entry (batch workers, repeated summaries of one pivot)
+    share its pages in the OS page cache instead of each holding their own copy.
+    The cache is bounded in size; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, hash_content=False):
+        """
+        Args:
+            cache_dir (str): Directory where cache entries are stored
+            max_bytes (int): Maximum total size of the cache entries
+            hash_content (bool): Whether to include a hash of the file content in the key,
+                to detect changes that keep the same size and modification time
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+
+    def make_key(self, file_path, **options):
+        """
+        Build the cache key of a source file read with the given options.
+
+        Args:
+            file_path (str): Path to the source file
+            **options: Reader options that change the parsed result (e.g. columns)
+
+        Returns:
+            str: The cache key
+        """
+        stat = os.stat(file_path)
+        identity = {
+            'path': os.path.abspath(file_path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'options': options,
+            'format': CACHE_FORMAT
+        }
+
+        if self.hash_content:
+            identity['content'] = self._hash_file(file_path)
+
+        encoded = json.dumps(identity, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key):
+        """
+        Load a cached DataFrame.
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            pandas.DataFrame: The cached DataFrame, or None if the key is not cached
+        """
+        entry_path = self._entry_path(key)
+        if not os.path.exists(entry_path):
+            return None
+
+        try:
+            if CACHE_FORMAT == 'feather':
+                df = DataFrameCache._read_mapped(entry_path)
+            else:
+                with open(entry_path, 'rb') as entry_file:
+                    df = pickle.load(entry_file)
+        except Exception:
+            # Corrupted or unreadable entry: drop it and parse the source again
+            self._remove(entry_path)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(entry_path)
+        return df
+
+    def put(self, key, df):
+        """
+        Store a DataFrame in the cache and evict old entries if needed.
+
+        Caching is best effort: a DataFrame that cannot be stored (e.g. a column mixing
+        numbers and text, which Feather cannot type) is skipped with a warning.
+
+        Args:
+            key (str): The cache key
+            df (pandas.DataFrame): The DataFrame to store
+
+        Returns:
+            bool: True if the DataFrame was stored
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                if CACHE_FORMAT == 'feather':
+                    # A single uncompressed record batch: each column is then one contiguous
+                    # buffer of the file, readable without decompressing or concatenating chunks
+                    feather.write_feather(
+                        df.reset_index(drop=True), temp_file, compression='uncompressed', chunksize=max(len(df), 1)
+                    )
+                else:
+                    pickle.dump(df, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception as e:
+            self._remove(temp_path)
+            print(f"Warning: not caching the parsed data ({type(e).__name__}: {e})")
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits in max_bytes.
+        """
+        entries = []
+        for entry in self._entries():
+            stat = os.stat(entry)
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            self._remove(entry)
+            total_size -= size
+
+    def clear(self):
+        """
+        Remove all cache entries.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = self._entries()
+        for entry in entries:
+            self._remove(entry)
+        return len(entries)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.{CACHE_FORMAT}")
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        suffix = f".{CACHE_FORMAT}"
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(suffix)
+        ]
+
+    @staticmethod
+    def _read_mapped(entry_path):
+        """
+        Read a Feather entry through a memory map, without copying its columns.
+
+        Numeric columns and the codes of categorical columns without missing values
+        are read-only views of the mapped buffers; pandas copies them on write.
+        """
+        table = feather.read_table(entry_path, memory_map=True)
+
+        # split_blocks keeps one block per column instead of consolidating them into copies
+        return table.to_pandas(split_blocks=True)
+
+    @staticmethod
+    def _hash_file(file_path, block_size=1024 * 1024):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as source_file:
+            for block in iter(lambda: source_file.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,224 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from config.rules import get_theoretical_charges
+from config.settings import CAPACITY_COLUMN, CAPACITY_TOP_N, DEFAULT_CAPACITY_JH
+from core.data_processor import DataProcessor
+from core.file_handler import FileHandler
+from utils.instrumentation import instrumented
+
+CAPACITY_SHEET_COLUMNS = [
+    'Ressource / Projet', 'Charge JH', 'Charge Theorique', 'Ecart', CAPACITY_COLUMN, "Taux d'occupation", 'Nombre'
+]
+
+
+class CapacityPlan:
+    """
+    Available capacity of each resource, in JH, over the period of a timesheet.
+    """
+
+    def __init__(self, capacities=None, default=DEFAULT_CAPACITY_JH, top=CAPACITY_TOP_N):
+        """
+        Args:
+            capacities (pandas.Series): Capacity indexed by resource name, or None
+            default (float): Capacity of the resources missing from capacities
+            top (int): Number of over-allocated resources and projects listed
+        """
+        self.capacities = capacities if capacities is not None else pd.Series(dtype='float64')
+        self.default = float(default)
+        self.top = top
+
+    @classmethod
+    def from_option(cls, value, top=CAPACITY_TOP_N):
+        """
+        Create a plan from a command-line value: a capacity shared by every
+        resource (e.g. '18.5'), or a file with 'Ressource' and CAPACITY_COLUMN columns.
+
+        Args:
+            value (str): The capacity or the path of the capacity file
+            top (int): Number of over-allocated resources and projects listed
+
+        Returns:
+            CapacityPlan: The capacity plan
+
+        Raises:
+            ValueError: If the value is neither a number nor an existing file
+        """
+        try:
+            return cls(default=float(value), top=top)
+        except ValueError:
+            pass
+
+        if not os.path.exists(value):
+            raise ValueError(f"Capacity must be a number of JH or a capacity file, got '{value}'")
+
+        capacity_df = FileHandler.read_table(value, ['Ressource', CAPACITY_COLUMN])
+        capacities = pd.to_numeric(capacity_df[CAPACITY_COLUMN], errors='coerce')
+        capacities.index = capacity_df['Ressource'].astype(object)
+        return cls(capacities.dropna().groupby(level=0).last(), top=top)
+
+    def for_resources(self, resource_names):
+        """
+        Get the capacity of each resource.
+
+        Args:
+            resource_names (array-like): The resource names
+
+        Returns:
+            numpy.ndarray: Capacities aligned with resource_names
+        """
+        return self.capacities.reindex(pd.Index(resource_names, dtype=object)).fillna(self.default).to_numpy()
+
+
+class CapacityAnalytics:
+    """
+    Compares resource loads with their capacity and finds over-allocations.
+
+    Every total is computed from the pivot with one pass per column over the category
+    codes (numpy.bincount), and the top-N rankings use partial sorts (numpy.argpartition).
+    """
+
+    @staticmethod
+    @instrumented
+    def compute_loads(pivot_df, lookup_df, plan):
+        """
+        Compute the per-resource and per-project loads of a pivot table.
+
+        Resource totals of 'Charge Theorique' and 'Ecart' only cover the projects that
+        have a theoretical charge, as the Ecart of the resource summary rows.
+
+        Args:
+            pivot_df (pandas.DataFrame): Charge JH by 'Ressource' and 'Projet'
+            lookup_df (pandas.DataFrame): Project information indexed by project name
+            plan (CapacityPlan): The resource capacities
+
+        Returns:
+            tuple: (pandas.DataFrame, pandas.DataFrame) - Resource loads, in resource
+                name order, and project loads, in project name order
+        """
+        pivot_df = DataProcessor.encode_identifiers(pivot_df)
+        resources = pivot_df['Ressource'].cat.remove_unused_categories()
+        projects = pivot_df['Projet'].cat.remove_unused_categories()
+        resource_names = resources.cat.categories.to_numpy(dtype=object)
+        project_names = projects.cat.categories.to_numpy(dtype=object)
+        resource_codes = resources.cat.codes.to_numpy()
+        project_codes = projects.cat.codes.to_numpy()
+        charges = np.nan_to_num(pivot_df['Charge JH'].to_numpy(dtype='float64'))
+
+        # Theoretical charge of each distinct project, then of each pivot row
+        project_info = lookup_df.reindex(project_names)
+        project_theoretical = get_theoretical_charges(
+            project_info['Niveau de connexion'].astype(object).fillna(''),
+            project_info['Phase du projet'].astype(object).fillna('')
+        )
+        row_theoretical = project_theoretical[project_codes]
+        known = ~np.isnan(row_theoretical)
+
+        def total_by(codes, weights, size):
+            return np.bincount(codes, weights=weights, minlength=size)
+
+        n_resources = len(resource_names)
+        resource_actual = total_by(resource_codes, charges, n_resources)
+        resource_theoretical = total_by(resource_codes, np.where(known, row_theoretical, 0.0), n_resources)
+        resource_known_actual = total_by(resource_codes, np.where(known, charges, 0.0), n_resources)
+        has_theoretical = total_by(resource_codes, known.astype('float64'), n_resources) > 0
+        capacities = plan.for_resources(resource_names)
+
+        resource_loads = pd.DataFrame({
+            'Ressource': resource_names,
+            'Charge JH': resource_actual,
+            'Charge Theorique': np.where(has_theoretical, resource_theoretical, np.nan),
+            'Ecart': np.where(has_theoretical, resource_theoretical - resource_known_actual, np.nan),
+            CAPACITY_COLUMN: capacities,
+            "Taux d'occupation": np.divide(
+                resource_actual, capacities, out=np.full(n_resources, np.nan), where=capacities > 0
+            ),
+            'Nombre': np.bincount(resource_codes, minlength=n_resources),
+        })
+
+        project_actual = total_by(project_codes, charges, len(project_names))
+        project_loads = pd.DataFrame({
+            'Projet': project_names,
+            'Charge JH': project_actual,
+            'Charge Theorique': project_theoretical,
+            'Ecart': project_theoretical - project_actual,
+            'Nombre': np.bincount(project_codes, minlength=len(project_names)),
+        })
+
+        return resource_loads, project_loads
+
+    @staticmethod
+    def top_positions(values, n):
+        """
+        Find the positions of the n largest values, largest first, ignoring NaN.
+
+        Only the n selected values are sorted: the rest is split off with a partial sort.
+
+        Args:
+            values (numpy.ndarray): The values to rank
+            n (int): Number of positions to return
+
+        Returns:
+            numpy.ndarray: Positions of the largest values, in decreasing value order
+        """
+        candidates = np.flatnonzero(~np.isnan(values))
+        if n <= 0:
+            return candidates[:0]
+        if len(candidates) > n:
+            candidates = candidates[np.argpartition(-values[candidates], n - 1)[:n]]
+
+        # Stable sort of the positions by value: ties keep name order
+        candidates.sort()
+        return candidates[np.argsort(-values[candidates], kind='stable')]
+
+    @staticmethod
+    @instrumented
+    def build_sheet(pivot_df, lookup_df, plan):
+        """
+        Build the capacity sheet of a summary.
+
+        The sheet lists the most over-allocated resources (occupation above 100% of
+        their capacity), the projects whose charge most exceeds their theoretical
+        charge, and the load of every resource. Section rows are not indented, so
+        they are written in bold.
+
+        Args:
+            pivot_df (pandas.DataFrame): Charge JH by 'Ressource' and 'Projet'
+            lookup_df (pandas.DataFrame): Project information indexed by project name
+            plan (CapacityPlan): The resource capacities
+
+        Returns:
+            pandas.DataFrame: The capacity sheet
+        """
+        resource_loads, project_loads = CapacityAnalytics.compute_loads(pivot_df, lookup_df, plan)
+
+        occupation = resource_loads["Taux d'occupation"].to_numpy()
+        over_allocated = np.where(occupation > 1, occupation, np.nan)
+        top_resources = CapacityAnalytics.top_positions(over_allocated, plan.top)
+
+        overrun = -project_loads['Ecart'].to_numpy()
+        over_theoretical = np.where(overrun > 0, overrun, np.nan)
+        top_projects = CapacityAnalytics.top_positions(over_theoretical, plan.top)
+
+        def section(title, loads, name_column, positions=None):
+            rows = loads if positions is None else loads.iloc[positions]
+            rows = rows.rename(columns={name_column: 'Ressource / Projet'})
+            rows['Ressource / Projet'] = '    ' + rows['Ressource / Projet'].astype(str)
+            return [pd.DataFrame({'Ressource / Projet': [title]}), rows]
+
+        frames = (
+            section(
+                f"Ressources sur-allouees (top {len(top_resources)} sur {np.count_nonzero(occupation > 1)})",
+                resource_loads, 'Ressource', top_resources
+            )
+            + section(
+                f"Projets depassant leur charge theorique "
+                f"(top {len(top_projects)} sur {np.count_nonzero(overrun > 0)})",
+                project_loads, 'Projet', top_projects
+            )
+            + section("Toutes les ressources", resource_loads, 'Ressource')
+        )
+
+        return pd.concat(frames, ignore_index=True).reindex(columns=CAPACITY_SHEET_COLUMNS).astype(object)
@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
-from config.rules import get_theoretical_charge
+from config.rules import get_theoretical_charge, get_theoretical_charges
+from config.settings import DEPLOYMENT_KEY_COLUMN, IDENTIFIER_COLUMNS
+from utils.instrumentation import instrumented
 
 
 class DataProcessor:
@@ -8,6 +11,7 @@ class DataProcessor:
     """
 
     @staticmethod
+    @instrumented
     def validate_dataframe(df, required_columns):
         """
         Validate that a DataFrame has the required columns.
@@ -25,6 +29,38 @@ class DataProcessor:
         return len(missing_columns) == 0, missing_columns
 
     @staticmethod
+    @instrumented
+    def create_lookup_table(deployments_df, columns, key_column=DEPLOYMENT_KEY_COLUMN):
+        """
+        Create a lookup table of project information indexed by project name.
+
+        The deployments file may list the same project several times. For each
+        column, the last non-null value found for a project wins; projects whose
+        name is empty are dropped. Columns missing from the file are returned empty.
+
+        Args:
+            deployments_df (pandas.DataFrame): The deployments DataFrame
+            columns (list): The columns to extract values from
+            key_column (str): The column holding the project name
+
+        Returns:
+            pandas.DataFrame: One row per project name, one column per requested column
+        """
+        available_columns = [col for col in columns if col in deployments_df.columns]
+
+        # Single pass over the file: last() skips nulls, so each column keeps
+        # the last non-null value seen for a duplicated project
+        lookup_df = deployments_df[[key_column] + available_columns].groupby(
+            key_column, sort=False, observed=True
+        ).last()
+
+        # Plain index, so projects unknown to the deployments file can be looked up
+        lookup_df.index = lookup_df.index.astype(object)
+
+        return lookup_df.reindex(columns=columns)
+
+    @staticmethod
+    @instrumented
     def create_connection_dict(deployments_df, column_name):
         """
         Create a lookup dictionary for a specific column by project name.
@@ -36,17 +72,57 @@ class DataProcessor:
         Returns:
             dict: Mapping of project names to column values
         """
-        result_dict = {}
+        if column_name not in deployments_df.columns:
+            return {}
 
-        if column_name in deployments_df.columns:
-            for _, row in deployments_df.iterrows():
-                project_name = row['Nom']
-                if not pd.isna(row.get(column_name, pd.NA)):
-                    result_dict[project_name] = row[column_name]
+        lookup_df = DataProcessor.create_lookup_table(deployments_df, [column_name])
+        return lookup_df[column_name].dropna().to_dict()
 
-        return result_dict
+    @staticmethod
+    def encode_identifiers(df, columns=IDENTIFIER_COLUMNS):
+        """
+        Store identifier columns as categoricals with sorted categories.
+
+        Each distinct name is kept once, in the categories shared by every row, and rows
+        only hold integer codes; since the categories are sorted, ordering by code is
+        ordering by name. Columns already encoded this way are left untouched.
+
+        Args:
+            df (pandas.DataFrame): The DataFrame holding the identifier columns
+            columns (list): The identifier columns to encode
+
+        Returns:
+            pandas.DataFrame: The DataFrame with encoded identifier columns
+        """
+        encoded = {}
+        for column in columns:
+            values = df[column]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = encoded[column] = values.astype('category')
+
+            # astype('category') puts numbers before text; mixed categories are sorted by
+            # their text, so that encoding twice gives the same order
+            categories = values.cat.categories
+            if not categories.is_monotonic_increasing:
+                sorted_categories = DataProcessor._sorted_categories(categories)
+                if not categories.equals(sorted_categories):
+                    encoded[column] = values.cat.reorder_categories(sorted_categories)
+
+        # assign() replaces the columns in a new frame without a deep copy of the others
+        return df.assign(**encoded) if encoded else df
 
     @staticmethod
+    def _sorted_categories(categories):
+        """
+        Sort categories, by their text when they mix numbers and text (e.g. numeric project codes).
+        """
+        try:
+            return categories.sort_values()
+        except TypeError:
+            return pd.Index(sorted(categories, key=str), dtype=object)
+
+    @staticmethod
+    @instrumented
     def calculate_charge_jh(df):
         """
         Calculate Charge JH (Soumise / 8).
@@ -57,9 +133,26 @@ class DataProcessor:
         Returns:
             pandas.DataFrame: DataFrame with added Charge JH column
         """
-        df_copy = df.copy()
-        df_copy['Charge JH'] = df_copy['Soumise (h)'] / 8
-        return df_copy
+        hours = df['Soumise (h)'].astype('float64')
+
+        # assign() adds the column to a new frame without a deep copy of the others
+        return df.assign(**{'Charge JH': hours / 8})
+
+    @staticmethod
+    def aggregate_charge(df):
+        """
+        Reduce timesheet rows to their Charge JH summed by resource and project.
+
+        Args:
+            df (pandas.DataFrame): Timesheet rows with 'Ressource', 'Projet' and 'Soumise (h)'
+
+        Returns:
+            pandas.DataFrame: 'Charge JH' indexed by ('Ressource', 'Projet')
+        """
+        charge_jh = df['Soumise (h)'].astype('float64') / 8
+        keys = [df['Ressource'].astype(object), df['Projet'].astype(object)]
+
+        return charge_jh.groupby(keys, observed=True).sum().to_frame('Charge JH')
 
     @staticmethod
     def calculate_theoretical_charge(connection_level, project_phase):
@@ -135,63 +228,173 @@ class DataProcessor:
     #
     #     return result_df
     @staticmethod
-    def format_resource_summary(pivot_df, connection_dict, phase_dict):
+    @instrumented
+    def format_resource_summary(pivot_df, lookup_df, value_columns=None):
         """
         Format the resource summary with hierarchical structure.
 
         Args:
             pivot_df (pandas.DataFrame): The pivot table DataFrame
-            connection_dict (dict): Dictionary of connection levels by project
-            phase_dict (dict): Dictionary of project phases by project
+            lookup_df (pandas.DataFrame): Project information indexed by project name,
+                as built by create_lookup_table
+            value_columns (list): Additional pivot columns copied to the project rows,
+                placed right after 'Charge JH'
 
         Returns:
-            pandas.DataFrame: The formatted resource summary
+            pandas.DataFrame: The formatted resource summary, with categorical labels, levels
+                and phases and float charges, missing where a row has no value
         """
-        # Create output DataFrame with all required columns
-        result_df = pd.DataFrame(columns=[
-            'Resource/ PROJET', 'Charge JH', 'Somme de Charge JH',
+        value_columns = list(value_columns or [])
+        columns = [
+            'Resource/ PROJET', 'Charge JH', *value_columns, 'Somme de Charge JH',
             'Niveau de connexion', 'Phase du projet', 'Charge Theorique', 'Ecart'
-        ])
+        ]
 
-        current_resource = None
-        row_index = 0
+        # Identifiers are categoricals with sorted categories: sorting and grouping
+        # work on their integer codes, and names are only decoded for the output
+        pivot_df = DataProcessor.encode_identifiers(pivot_df)
 
         # Sort by resource first, then by project
-        pivot_df = pivot_df.sort_values(['Ressource', 'Projet'])
-
-        for _, row in pivot_df.iterrows():
-            resource = row['Ressource']
-            project = row['Projet']
-            charge = row['Charge JH']
-
-            # If this is a new resource, add the resource row
-            if resource != current_resource:
-                result_df.loc[row_index, 'Resource/ PROJET'] = resource
-                resource_charge = pivot_df[pivot_df['Ressource'] == resource]['Charge JH'].sum()
-                result_df.loc[row_index, 'Somme de Charge JH'] = resource_charge
-                row_index += 1
-                current_resource = resource
-
-            # Look up connection level and project phase for this project
-            connection_level = connection_dict.get(project, '')
-            project_phase = phase_dict.get(project, '')
-
-            # Calculate theoretical charge if both values are available
-            theoretical_charge = None
-            if connection_level and project_phase:
-                theoretical_charge = DataProcessor.calculate_theoretical_charge(connection_level, project_phase)
-
-            # Add the project row indented under the resource
-            result_df.loc[row_index, 'Resource/ PROJET'] = f"    {project}"
-            result_df.loc[row_index, 'Charge JH'] = charge
-            result_df.loc[row_index, 'Niveau de connexion'] = connection_level
-            result_df.loc[row_index, 'Phase du projet'] = project_phase
-
-            if theoretical_charge is not None:
-                result_df.loc[row_index, 'Charge Theorique'] = theoretical_charge
-                # Calculate Ecart (Charge Theorique - Charge JH)
-                result_df.loc[row_index, 'Ecart'] = theoretical_charge - charge
-
-            row_index += 1
-
-        return result_df
\ No newline at end of file
+        pivot_df = pivot_df.sort_values(['Ressource', 'Projet']).reset_index(drop=True)
+        if pivot_df.empty:
+            return pd.DataFrame(columns=columns)
+
+        # Look up connection level, project phase and theoretical charge once per
+        # distinct project, then spread them to the rows through the project codes
+        projects = pivot_df['Projet'].cat.remove_unused_categories()
+        project_names = projects.cat.categories
+        project_codes = projects.cat.codes.to_numpy()
+
+        project_info = lookup_df.reindex(project_names.to_numpy(dtype=object))
+        project_levels = project_info['Niveau de connexion'].astype(object).fillna('').to_numpy()
+        project_phases = project_info['Phase du projet'].astype(object).fillna('').to_numpy()
+        project_charges = get_theoretical_charges(project_levels, project_phases)
+        project_labels = ('    ' + project_names.astype(str)).to_numpy(dtype=object)
+        level_codes, levels = pd.factorize(project_levels)
+        phase_codes, phases = pd.factorize(project_phases)
+
+        # Resource rows, one per resource with the subtotal of its projects
+        charges = pivot_df['Charge JH'].to_numpy(dtype='float64')
+        resource_codes = pivot_df['Ressource'].cat.codes
+        resource_totals = pd.Series(charges).groupby(resource_codes.to_numpy(), sort=False).sum()
+        first_positions = resource_codes.drop_duplicates().index.to_numpy()
+        resource_names = pivot_df['Ressource'].cat.categories.to_numpy(dtype=object)
+        n_resources = len(resource_totals)
+
+        # Place each resource row just before its first project row; a stable sort keeps
+        # the project rows in pivot order
+        order = np.argsort(
+            np.concatenate([first_positions - 0.5, np.arange(len(pivot_df), dtype='float64')]), kind='stable'
+        )
+
+        def resource_then_projects(resource_values, project_values):
+            return np.concatenate([resource_values, project_values])[order]
+
+        def blank_resources(project_values):
+            return resource_then_projects(np.full(n_resources, np.nan), project_values)
+
+        def blank_resource_codes(project_codes):
+            return resource_then_projects(np.full(n_resources, -1), project_codes)
+
+        # The labels, levels and phases stay categorical (codes into a few hundred
+        # names) and the charges numeric; they are only converted to cells when written
+        theoretical_charges = project_charges[project_codes]
+        result_df = pd.DataFrame({
+            'Resource/ PROJET': DataProcessor._categorical(
+                resource_then_projects(resource_totals.index.to_numpy(), len(resource_names) + project_codes),
+                np.concatenate([resource_names, project_labels])
+            ),
+            'Charge JH': blank_resources(charges),
+            **{column: blank_resources(pivot_df[column].to_numpy(dtype='float64')) for column in value_columns},
+            'Somme de Charge JH': resource_then_projects(resource_totals.to_numpy(), np.full(len(pivot_df), np.nan)),
+            'Niveau de connexion': pd.Categorical.from_codes(blank_resource_codes(level_codes[project_codes]), levels),
+            'Phase du projet': pd.Categorical.from_codes(blank_resource_codes(phase_codes[project_codes]), phases),
+            'Charge Theorique': blank_resources(theoretical_charges),
+            # Ecart (Charge Theorique - Charge JH)
+            'Ecart': blank_resources(theoretical_charges - charges),
+        })
+
+        return result_df[columns]
+
+    @staticmethod
+    def _categorical(codes, categories):
+        """
+        Build a categorical from codes into categories that may repeat a value.
+        """
+        categories = pd.Index(categories, dtype=object)
+        unique_categories = categories.unique()
+        if len(unique_categories) < len(categories):
+            # e.g. projects 5 and '5' share the label '    5'
+            codes = np.where(codes >= 0, unique_categories.get_indexer(categories)[codes], -1)
+        return pd.Categorical.from_codes(codes, unique_categories)
+
+    @staticmethod
+    @instrumented
+    def aggregate_periods(frames):
+        """
+        Aggregate several timesheets, tagged by period, in a single groupby.
+
+        Args:
+            frames (dict): Mapping of period label to timesheet DataFrame
+
+        Returns:
+            pandas.DataFrame: Charge JH summed by ('Periode', 'Ressource', 'Projet')
+        """
+        key_columns = ['Periode', 'Ressource', 'Projet']
+        if not frames:
+            return pd.DataFrame(columns=key_columns + ['Charge JH'])
+
+        tagged = [
+            df[['Ressource', 'Projet', 'Soumise (h)']].assign(Periode=str(period))
+            for period, df in frames.items()
+        ]
+        combined = DataProcessor.calculate_charge_jh(pd.concat(tagged, ignore_index=True))
+
+        return combined.groupby(key_columns, observed=True)['Charge JH'].sum().reset_index()
+
+    @staticmethod
+    @instrumented
+    def format_period_summary(period_pivot_df, lookup_df):
+        """
+        Format a consolidated resource summary over several periods.
+
+        Project rows carry one 'Charge JH <period>' and one 'Ecart <period>' column per
+        period, followed by the totals: 'Charge JH' and 'Ecart' are computed over all
+        periods, and resource rows hold the all-period 'Somme de Charge JH'.
+
+        Args:
+            period_pivot_df (pandas.DataFrame): Charge JH by period, resource and project,
+                as built by aggregate_periods
+            lookup_df (pandas.DataFrame): Project information indexed by project name
+
+        Returns:
+            pandas.DataFrame: The formatted consolidated summary
+        """
+        periods = sorted(period_pivot_df['Periode'].astype(str).unique())
+        charge_columns = [f'Charge JH {period}' for period in periods]
+        ecart_columns = [f'Ecart {period}' for period in periods]
+
+        # One row per (resource, project), one column per period
+        wide_df = period_pivot_df.pivot_table(
+            values='Charge JH', index=['Ressource', 'Projet'], columns='Periode',
+            aggfunc='sum', observed=True
+        ).reindex(columns=periods)
+        wide_df.columns = charge_columns
+        wide_df['Charge JH'] = wide_df[charge_columns].sum(axis=1)
+        wide_df = wide_df.reset_index()
+
+        result_df = DataProcessor.format_resource_summary(wide_df, lookup_df, charge_columns)
+
+        # Per-period Ecart (Charge Theorique - Charge JH of the period)
+        for charge_column, ecart_column in zip(charge_columns, ecart_columns):
+            result_df[ecart_column] = result_df['Charge Theorique'] - result_df[charge_column]
+
+        result_df = result_df.rename(columns={'Charge JH': 'Charge JH Total', 'Ecart': 'Ecart Total'})
+        columns = (
+            ['Resource/ PROJET']
+            + [column for pair in zip(charge_columns, ecart_columns) for column in pair]
+            + ['Charge JH Total', 'Somme de Charge JH', 'Niveau de connexion',
+               'Phase du projet', 'Charge Theorique', 'Ecart Total']
+        )
+
+        return result_df[columns]
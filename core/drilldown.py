@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+from config.rules import get_theoretical_charges
+from core.data_processor import DataProcessor
+from utils.instrumentation import instrumented
+
+# Label of the projects without a connection level or phase in the rollups
+MISSING_LEVEL = '(Sans niveau)'
+MISSING_PHASE = '(Sans phase)'
+
+PROJECT_SHEET_COLUMNS = [
+    'Projet / RESSOURCE', 'Charge JH', 'Somme de Charge JH', 'Niveau de connexion', 'Phase du projet',
+    'Charge Theorique', 'Ecart', 'Ressources'
+]
+LEVEL_SHEET_COLUMNS = [
+    'Niveau / PROJET', 'Charge JH', 'Somme de Charge JH', 'Phase du projet', 'Charge Theorique', 'Ecart', 'Ressources'
+]
+PHASE_SHEET_COLUMNS = [
+    'Phase / PROJET', 'Charge JH', 'Somme de Charge JH', 'Niveau de connexion', 'Charge Theorique', 'Ecart',
+    'Ressources'
+]
+
+
+class DrillDown:
+    """
+    Builds the drill-down sheets of a summary: project -> resources, and the
+    connection level and phase rollups (level or phase -> projects).
+
+    The pivot is reduced once to per-project totals (numpy.bincount over the project
+    codes); the three sheets are then built from these shared totals, so the rollups
+    only group a few hundred project rows rather than the whole pivot.
+    """
+
+    @staticmethod
+    @instrumented
+    def build_sheets(pivot_df, lookup_df):
+        """
+        Build the drill-down sheets of a pivot table.
+
+        Group rows (projects, connection levels, phases) are not indented, so they are
+        written in bold; their detail rows are indented and get the Ecart fills.
+
+        Args:
+            pivot_df (pandas.DataFrame): Charge JH by 'Ressource' and 'Projet'
+            lookup_df (pandas.DataFrame): Project information indexed by project name
+
+        Returns:
+            dict: Mapping of sheet name ('Par Projet', 'Par Niveau', 'Par Phase') to DataFrame
+        """
+        pivot_df = DataProcessor.encode_identifiers(pivot_df)
+        resources = pivot_df['Ressource'].cat.remove_unused_categories()
+        projects = pivot_df['Projet'].cat.remove_unused_categories()
+        resource_names = resources.cat.categories.to_numpy(dtype=object)
+        project_names = projects.cat.categories.to_numpy(dtype=object)
+        resource_codes = resources.cat.codes.to_numpy()
+        project_codes = projects.cat.codes.to_numpy()
+        charges = np.nan_to_num(pivot_df['Charge JH'].to_numpy(dtype='float64'))
+        n_projects = len(project_names)
+
+        # Shared per-project totals; each pivot row is one (resource, project) pair
+        project_info = lookup_df.reindex(project_names)
+        levels = project_info['Niveau de connexion'].astype(object).fillna('').to_numpy()
+        phases = project_info['Phase du projet'].astype(object).fillna('').to_numpy()
+        theoretical = get_theoretical_charges(levels, phases)
+        project_charges = np.bincount(project_codes, weights=charges, minlength=n_projects)
+        project_resources = np.bincount(project_codes, minlength=n_projects)
+
+        projects_df = pd.DataFrame({
+            'Charge JH': project_charges,
+            'Niveau de connexion': levels,
+            'Phase du projet': phases,
+            'Charge Theorique': theoretical,
+            'Ecart': theoretical - project_charges,
+            'Ressources': project_resources,
+        })
+
+        # Project -> resources: the pivot rows in (project, resource) order
+        order = np.lexsort((resource_codes, project_codes))
+        project_groups = projects_df.assign(**{'Projet / RESSOURCE': project_names}).rename(
+            columns={'Charge JH': 'Somme de Charge JH'}
+        )
+        resource_rows = pd.DataFrame({
+            'Projet / RESSOURCE': '    ' + resource_names[resource_codes[order]].astype(str),
+            'Charge JH': charges[order],
+        })
+        project_sheet = DrillDown._nest(project_groups, resource_rows, project_codes[order])
+
+        project_rows = projects_df.assign(Projet='    ' + project_names.astype(str))
+        level_sheet = DrillDown._rollup(
+            project_rows, np.where(levels == '', MISSING_LEVEL, levels), 'Niveau / PROJET',
+            resource_codes, project_codes, len(resource_names)
+        )
+        phase_sheet = DrillDown._rollup(
+            project_rows, np.where(phases == '', MISSING_PHASE, phases), 'Phase / PROJET',
+            resource_codes, project_codes, len(resource_names)
+        )
+
+        return {
+            'Par Projet': project_sheet.reindex(columns=PROJECT_SHEET_COLUMNS).astype(object),
+            'Par Niveau': level_sheet.reindex(columns=LEVEL_SHEET_COLUMNS).astype(object),
+            'Par Phase': phase_sheet.reindex(columns=PHASE_SHEET_COLUMNS).astype(object),
+        }
+
+    @staticmethod
+    def _rollup(project_rows, group_labels, label_column, resource_codes, project_codes, n_resources):
+        """
+        Group the project rows under their connection level or phase.
+
+        Args:
+            project_rows (pandas.DataFrame): Totals of each project, in project code order
+            group_labels (numpy.ndarray): Level or phase of each project
+            label_column (str): Name of the first column of the sheet
+            resource_codes (numpy.ndarray): Resource code of each pivot row
+            project_codes (numpy.ndarray): Project code of each pivot row
+            n_resources (int): Number of resources
+
+        Returns:
+            pandas.DataFrame: The group rows, each followed by its indented project rows
+        """
+        labels, group_codes = np.unique(group_labels.astype(str), return_inverse=True)
+        n_groups = len(labels)
+
+        charges = project_rows['Charge JH'].to_numpy()
+        theoretical = project_rows['Charge Theorique'].to_numpy()
+        known = ~np.isnan(theoretical)
+
+        def total(weights):
+            return np.bincount(group_codes, weights=weights, minlength=n_groups)
+
+        # Group totals of 'Charge Theorique' and 'Ecart' only cover the projects that have one
+        has_rule = total(known.astype('float64')) > 0
+        group_theoretical = total(np.where(known, theoretical, 0.0))
+        group_ecarts = total(np.where(known, theoretical - charges, 0.0))
+
+        # Distinct resources of each group, from the distinct (group, resource) pairs of the pivot
+        pairs = np.unique(group_codes[project_codes].astype('int64') * n_resources + resource_codes)
+        group_resources = np.bincount(pairs // n_resources, minlength=n_groups)
+
+        group_rows = pd.DataFrame({
+            label_column: labels.astype(object),
+            'Somme de Charge JH': total(charges),
+            'Charge Theorique': np.where(has_rule, group_theoretical, np.nan),
+            'Ecart': np.where(has_rule, group_ecarts, np.nan),
+            'Ressources': group_resources,
+        })
+        detail_rows = project_rows.rename(columns={'Projet': label_column})
+
+        return DrillDown._nest(group_rows, detail_rows, group_codes)
+
+    @staticmethod
+    def _nest(group_rows, detail_rows, detail_groups):
+        """
+        Place each group row just before its detail rows.
+
+        Args:
+            group_rows (pandas.DataFrame): One row per group, in group code order
+            detail_rows (pandas.DataFrame): The detail rows, in their order within a group
+            detail_groups (numpy.ndarray): Group code of each detail row
+
+        Returns:
+            pandas.DataFrame: The interleaved rows
+        """
+        keys = np.concatenate([np.arange(len(group_rows)), detail_groups])
+        combined = pd.concat([group_rows, detail_rows], ignore_index=True)
+
+        # Stable sort: a group row comes before its details, which keep their order
+        return combined.iloc[np.argsort(keys, kind='stable')].reset_index(drop=True)
@@ -1,6 +1,21 @@
-import pandas as pd
+import copy
+import fnmatch
+import importlib.util
+import itertools
+import numbers
 import os
-from openpyxl.styles import Font
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from xml.etree import ElementTree
+
+import pandas as pd
+
+from config.settings import COLUMN_ALIASES, COLUMN_DTYPES
+from utils.instrumentation import instrumented
+
+# Rows converted to cell values at a time when writing a worksheet
+WRITE_CHUNK_ROWS = 10000
 
 
 class ExcelHandler:
@@ -9,12 +24,21 @@ class ExcelHandler:
     """
 
     @staticmethod
-    def read_excel(file_path):
+    @instrumented
+    def read_excel(file_path, columns=None, verbose=False, cache=None):
         """
         Read an Excel file and return a pandas DataFrame.
 
+        When columns are given, only those columns (or their aliases from
+        COLUMN_ALIASES) are loaded, using calamine when it is installed and a
+        read-only openpyxl stream otherwise, and compact dtypes from
+        COLUMN_DTYPES are applied. Columns absent from the file are skipped.
+
         Args:
             file_path (str): Path to the Excel file
+            columns (list): Columns to load, or None to load the whole first sheet
+            verbose (bool): Whether to print the number of rows read and the read speed
+            cache (DataFrameCache): Cache of parsed files to use, or None to always parse
 
         Returns:
             pandas.DataFrame: The data from the Excel file
@@ -22,9 +46,294 @@ class ExcelHandler:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        return pd.read_excel(file_path)
+        start_time = time.perf_counter()
+
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(file_path, columns=columns)
+            df = cache.get(cache_key)
+            if df is not None:
+                if verbose:
+                    elapsed = time.perf_counter() - start_time
+                    print(f"Loaded {len(df):,} rows from cache in {elapsed:.3f}s")
+                return df
+
+        df = ExcelHandler._read_sheet(file_path, 0, columns)
+
+        if cache is not None:
+            cache.put(cache_key, df)
+
+        if verbose:
+            elapsed = time.perf_counter() - start_time
+            rate = len(df) / elapsed if elapsed > 0 else float('inf')
+            print(f"Read {len(df):,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+        return df
+
+    @staticmethod
+    @instrumented
+    def read_excel_sheets(file_path, columns, sheet_pattern=None, workers=None, verbose=False, cache=None):
+        """
+        Read every matching sheet of a workbook in parallel and concatenate them.
+
+        Sheets are parsed in a process pool, at most `workers` at a time, and each
+        parsed sheet is collected as soon as it is ready. Sheets lacking one of the
+        requested columns are skipped. The result has an extra 'Feuille source'
+        column with the name of the sheet each row comes from.
+
+        Args:
+            file_path (str): Path to the Excel file
+            columns (list): Columns to load (aliases from COLUMN_ALIASES are accepted)
+            sheet_pattern (str): Shell-style pattern of the sheet names to read
+                (e.g. 'Equipe*'), or None to read every sheet
+            workers (int): Number of worker processes (defaults to the number of CPUs);
+                1 parses the sheets in the current process
+            verbose (bool): Whether to print the sheets read and the read speed
+            cache (DataFrameCache): Cache of parsed files to use, or None to always parse
+
+        Returns:
+            pandas.DataFrame: The rows of all matching sheets
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        start_time = time.perf_counter()
+
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(file_path, columns=columns, sheets=sheet_pattern)
+            df = cache.get(cache_key)
+            if df is not None:
+                if verbose:
+                    elapsed = time.perf_counter() - start_time
+                    print(f"Loaded {len(df):,} rows from cache in {elapsed:.3f}s")
+                return df
+
+        sheet_names = [
+            name for name in ExcelHandler.list_sheets(file_path)
+            if sheet_pattern is None or fnmatch.fnmatchcase(name, sheet_pattern)
+        ]
+        if not sheet_names:
+            raise ValueError(f"No sheet matching '{sheet_pattern}' in {file_path}")
+
+        frames = {}
+        if workers == 1 or len(sheet_names) == 1:
+            for sheet_name in sheet_names:
+                frames[sheet_name] = ExcelHandler._read_sheet(file_path, sheet_name, columns)
+        else:
+            max_pending = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=max_pending) as executor:
+                remaining = iter(sheet_names)
+                pending = {}
+
+                # Keep at most one sheet per worker in flight, collecting each as it finishes
+                while True:
+                    while len(pending) < max_pending:
+                        sheet_name = next(remaining, None)
+                        if sheet_name is None:
+                            break
+                        future = executor.submit(ExcelHandler._read_sheet, file_path, sheet_name, columns)
+                        pending[future] = sheet_name
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        frames[pending.pop(future)] = future.result()
+
+        wanted = set(columns)
+        kept = []
+        for sheet_name in sheet_names:
+            sheet_df = frames[sheet_name]
+            found = {COLUMN_ALIASES.get(column, column) for column in sheet_df.columns}
+            if not wanted <= found:
+                if verbose:
+                    print(f"Skipping sheet '{sheet_name}': missing {sorted(wanted - found)}")
+                continue
+            kept.append(sheet_df.assign(**{'Feuille source': sheet_name}))
+
+        if not kept:
+            raise ValueError(f"No sheet of {file_path} has the columns {columns}")
+
+        # Categories differ between sheets, so the compact dtypes are applied again after concatenation
+        df = pd.concat(kept, ignore_index=True)
+        df = ExcelHandler.apply_compact_dtypes(df)
+        df['Feuille source'] = df['Feuille source'].astype('category')
+
+        if cache is not None:
+            cache.put(cache_key, df)
+
+        if verbose:
+            elapsed = time.perf_counter() - start_time
+            rate = len(df) / elapsed if elapsed > 0 else float('inf')
+            print(f"Read {len(df):,} rows from {len(kept)} sheet(s) in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+        return df
+
+    @staticmethod
+    def list_sheets(file_path):
+        """
+        List the sheet names of a workbook without loading it.
+
+        Args:
+            file_path (str): Path to the Excel file
+
+        Returns:
+            list: Sheet names, in workbook order
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            root = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+
+        namespace = {'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        return [sheet.get('name') for sheet in root.findall('main:sheets/main:sheet', namespace)]
+
+    @staticmethod
+    def _read_sheet(file_path, sheet_name, columns):
+        """
+        Read one sheet, projected to the given columns with compact dtypes.
+
+        Args:
+            file_path (str): Path to the Excel file
+            sheet_name (str or int): Sheet name, or position of the sheet
+            columns (list): Columns to load, or None to load the whole sheet
+
+        Returns:
+            pandas.DataFrame: The data of the sheet
+        """
+        if columns is None:
+            return pd.read_excel(file_path, sheet_name=sheet_name)
+
+        wanted = set(columns)
+
+        def is_wanted(column_name):
+            return column_name in wanted or COLUMN_ALIASES.get(column_name) in wanted
+
+        if importlib.util.find_spec('python_calamine') is not None:
+            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='calamine', usecols=is_wanted)
+        else:
+            df = ExcelHandler._stream_columns(file_path, is_wanted, sheet_name)
+
+        return ExcelHandler.apply_compact_dtypes(df)
+
+    @staticmethod
+    def _stream_columns(file_path, is_wanted, sheet_name=0):
+        """
+        Read selected columns of a sheet with a read-only openpyxl stream.
+
+        Args:
+            file_path (str): Path to the Excel file
+            is_wanted (callable): Predicate telling whether a header name should be loaded
+            sheet_name (str or int): Sheet name, or position of the sheet
+
+        Returns:
+            pandas.DataFrame: The selected columns, typed as pandas would infer them
+        """
+        rows = ExcelHandler._iter_projected_rows(file_path, is_wanted, sheet_name)
+        names = next(rows)
+        projected_rows = list(rows)
+
+        # Drop trailing empty rows, as pandas does
+        while projected_rows and all(value is None for value in projected_rows[-1]):
+            projected_rows.pop()
+
+        return pd.DataFrame.from_records(projected_rows, columns=names)
+
+    @staticmethod
+    def iter_excel_chunks(file_path, columns, chunk_size, sheet_name=0):
+        """
+        Read selected columns of a sheet as a stream of DataFrame chunks.
+
+        Only one chunk of projected rows is held in memory at a time. Empty rows are
+        skipped. Column aliases from COLUMN_ALIASES are renamed to their canonical name.
+
+        Args:
+            file_path (str): Path to the Excel file
+            columns (list): Columns to load
+            chunk_size (int): Number of rows per chunk
+            sheet_name (str or int): Sheet name, or position of the sheet
+
+        Yields:
+            pandas.DataFrame: Consecutive chunks of at most chunk_size rows
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        wanted = set(columns)
+
+        def is_wanted(column_name):
+            return column_name in wanted or COLUMN_ALIASES.get(column_name) in wanted
+
+        rows = ExcelHandler._iter_projected_rows(file_path, is_wanted, sheet_name)
+        names = [COLUMN_ALIASES.get(name, name) for name in next(rows)]
+
+        while True:
+            batch = list(itertools.islice(rows, chunk_size))
+            if not batch:
+                break
+            chunk = [row for row in batch if any(value is not None for value in row)]
+            if chunk:
+                yield pd.DataFrame.from_records(chunk, columns=names)
+
+    @staticmethod
+    def _iter_projected_rows(file_path, is_wanted, sheet_name=0):
+        """
+        Stream the projected cells of a sheet with a read-only openpyxl workbook.
+
+        Yields the list of selected header names first, then one tuple of values per row.
+        """
+        # openpyxl is only loaded when a workbook is actually read or written with it
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if isinstance(sheet_name, int):
+                worksheet = workbook.worksheets[sheet_name]
+            else:
+                worksheet = workbook[sheet_name]
+            rows = worksheet.iter_rows(values_only=True)
+            header = next(rows, ())
+
+            # Keep the first occurrence of each wanted header
+            positions = {}
+            for i, name in enumerate(header):
+                if name is not None and name not in positions and is_wanted(name):
+                    positions[name] = i
+            yield list(positions)
+
+            # Only keep the projected cells, the rest of each row is discarded immediately
+            indexes = list(positions.values())
+            width = max(indexes, default=-1) + 1
+            for row in rows:
+                if len(row) < width:
+                    row = row + (None,) * (width - len(row))
+                yield tuple(row[i] for i in indexes)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def apply_compact_dtypes(df):
+        """
+        Convert known columns to the compact dtypes declared in COLUMN_DTYPES.
+
+        Label columns become categoricals. Numeric columns are downcast only when they
+        are already numeric, so malformed values are left for validation to report.
+
+        Args:
+            df (pandas.DataFrame): The DataFrame to convert
+
+        Returns:
+            pandas.DataFrame: The DataFrame with compact dtypes
+        """
+        for column in df.columns:
+            dtype = COLUMN_DTYPES.get(COLUMN_ALIASES.get(column, column))
+            if dtype is None:
+                continue
+            if dtype == 'category' or pd.api.types.is_numeric_dtype(df[column]):
+                df[column] = df[column].astype(dtype)
+
+        return df
 
     @staticmethod
+    @instrumented
     def create_pivot_table(df, values, index, aggfunc='sum'):
         """
         Create a pivot table from a DataFrame.
@@ -41,42 +350,12 @@ class ExcelHandler:
         pivot_df = df.pivot_table(
             values=values,
             index=index,
-            aggfunc=aggfunc
+            aggfunc=aggfunc,
+            observed=True
         ).reset_index()
 
         return pivot_df
 
-    # @staticmethod
-    # def write_excel(df, output_file, sheet_name='Sheet1'):
-    #     """
-    #     Write a DataFrame to an Excel file with formatting.
-    #
-    #     Args:
-    #         df (pandas.DataFrame): The data to write
-    #         output_file (str): Path where the output file will be saved
-    #         sheet_name (str): Name of the worksheet
-    #     """
-    #     # Create directory if it doesn't exist
-    #     output_dir = os.path.dirname(output_file)
-    #     if output_dir and not os.path.exists(output_dir):
-    #         os.makedirs(output_dir)
-    #
-    #     with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-    #         df.to_excel(writer, index=False, sheet_name=sheet_name)
-    #
-    #         # Get the workbook and worksheet
-    #         workbook = writer.book
-    #         worksheet = writer.sheets[sheet_name]
-    #
-    #         # Apply formatting for resource rows (non-indented)
-    #         for idx, row in enumerate(worksheet.iter_rows(min_row=2, max_row=len(df) + 1)):
-    #             cell_value = str(row[0].value) if row[0].value else ""
-    #             if not cell_value.startswith('    '):
-    #                 # Make resource rows bold
-    #                 for cell in row:
-    #                     cell.font = Font(bold=True)
-    #
-    #     return output_file
     @staticmethod
     def write_excel(df, output_file, sheet_name='Sheet1'):
         """
@@ -87,51 +366,118 @@ class ExcelHandler:
             output_file (str): Path where the output file will be saved
             sheet_name (str): Name of the worksheet
         """
+        return ExcelHandler.write_workbook({sheet_name: df}, output_file)
+
+    @staticmethod
+    @instrumented
+    def write_workbook(sheets, output_file):
+        """
+        Write several DataFrames to the worksheets of one Excel file, with formatting.
+
+        The workbook is written in a single streaming pass (openpyxl write-only mode):
+        resource rows are made bold and Ecart cells get their green/red fill as the
+        rows are written, using style objects created once.
+
+        Args:
+            sheets (dict): Mapping of worksheet name to DataFrame, in sheet order
+            output_file (str): Path where the output file will be saved
+        """
         # Create directory if it doesn't exist
         output_dir = os.path.dirname(output_file)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name=sheet_name)
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        for sheet_name, df in sheets.items():
+            ExcelHandler._write_sheet(workbook, df, sheet_name)
+        workbook.save(output_file)
+
+        return output_file
+
+    @staticmethod
+    def _write_sheet(workbook, df, sheet_name):
+        """
+        Stream a DataFrame into a new worksheet of a write-only workbook.
+
+        Args:
+            workbook (openpyxl.Workbook): The write-only workbook
+            df (pandas.DataFrame): The data to write
+            sheet_name (str): Name of the worksheet
+        """
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+
+        worksheet = workbook.create_sheet(sheet_name)
+
+        # Styles are registered once, on template cells; formatted cells copy the
+        # resulting style ids instead of looking the style objects up again
+        bold_template = WriteOnlyCell(worksheet)
+        bold_template.font = Font(bold=True)
+        positive_template = WriteOnlyCell(worksheet)
+        # Light green color (vert accentuation6 plus clair 60%)
+        positive_template.fill = PatternFill(start_color="C6E0B4", end_color="C6E0B4", fill_type="solid")
+        negative_template = WriteOnlyCell(worksheet)
+        # Light red color (same grade but red)
+        negative_template.fill = PatternFill(start_color="F8CBAD", end_color="F8CBAD", fill_type="solid")
+
+        def styled_cell(value, template):
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell._style = copy.copy(template._style)
+            return cell
+
+        # Find the Ecart column indexes ('Ecart', or 'Ecart <period>' in consolidated summaries)
+        columns = df.columns.tolist()
+        ecart_col_idxs = [idx for idx, col_name in enumerate(columns) if str(col_name).startswith('Ecart')]
+
+        worksheet.append(columns)
+
+        for row, row_length in ExcelHandler._iter_cell_rows(df):
+            cell_value = str(row[0]) if row[0] else ""
+
+            # Make resource rows (non-indented) bold
+            if not cell_value.startswith('    '):
+                worksheet.append([styled_cell(value, bold_template) for value in row])
+                continue
 
-            # Get the workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets[sheet_name]
+            row = list(row[:row_length])
 
-            # Find the Ecart column index
-            ecart_col_idx = None
-            for idx, col_name in enumerate(df.columns):
-                if col_name == 'Ecart':
-                    ecart_col_idx = idx
+            # Apply conditional formatting to Ecart columns
+            for ecart_col_idx in ecart_col_idxs:
+                if ecart_col_idx >= row_length:
                     break
+                ecart_value = row[ecart_col_idx]
+                if isinstance(ecart_value, numbers.Real) and ecart_value != 0:
+                    row[ecart_col_idx] = styled_cell(
+                        ecart_value, positive_template if ecart_value > 0 else negative_template
+                    )
 
-            # Apply formatting for resource rows (non-indented) and Ecart column
-            for idx, row in enumerate(worksheet.iter_rows(min_row=2, max_row=len(df) + 1)):
-                cell_value = str(row[0].value) if row[0].value else ""
-
-                # Make resource rows bold
-                if not cell_value.startswith('    '):
-                    for cell in row:
-                        cell.font = Font(bold=True)
-
-                # Apply conditional formatting to Ecart column
-                if ecart_col_idx is not None and not cell_value.startswith('    '):
-                    # Skip resource rows for Ecart formatting (they don't have Ecart values)
-                    continue
-
-                if ecart_col_idx is not None:
-                    ecart_cell = row[ecart_col_idx]
-                    if ecart_cell.value is not None and isinstance(ecart_cell.value, (int, float)):
-                        from openpyxl.styles import PatternFill
-                        if ecart_cell.value > 0:  # Positive value
-                            # Light green color (vert accentuation6 plus clair 60%)
-                            ecart_cell.fill = PatternFill(start_color="C6E0B4", end_color="C6E0B4", fill_type="solid")
-                        elif ecart_cell.value < 0:  # Negative value
-                            # Light red color (same grade but red)
-                            ecart_cell.fill = PatternFill(start_color="F8CBAD", end_color="F8CBAD", fill_type="solid")
+            worksheet.append(row)
 
-        return output_file
+    @staticmethod
+    def _iter_cell_rows(df):
+        """
+        Convert a DataFrame to rows of cell values, a chunk of rows at a time.
+
+        Typed columns (numbers, categoricals) are only turned into Python objects
+        chunk by chunk, so writing never holds an object copy of the whole frame.
+
+        Yields:
+            tuple: (numpy.ndarray, int) - The cell values of a row, empty cells as None,
+                and the length of the row without its trailing empty cells
+        """
+        for start in range(0, len(df), WRITE_CHUNK_ROWS):
+            chunk = df.iloc[start:start + WRITE_CHUNK_ROWS]
+            filled = chunk.notna().to_numpy()
+            values = chunk.astype(object).where(filled, None).to_numpy()
+
+            # Unstyled trailing empty cells are not written: cut them from the rows
+            # (drill-down detail rows leave most of their columns empty)
+            row_lengths = filled.shape[1] - filled[:, ::-1].argmax(axis=1)
+            row_lengths[~filled.any(axis=1)] = 0
+
+            yield from zip(values, row_lengths)
 
     @staticmethod
     def open_file(file_path):
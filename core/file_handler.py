@@ -0,0 +1,231 @@
+import csv
+import importlib.util
+import os
+import time
+
+import pandas as pd
+
+from config.settings import COLUMN_ALIASES
+from core.excel_handler import ExcelHandler
+from utils.helpers import atomic_output_path
+from utils.instrumentation import instrumented
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+CSV_EXTENSIONS = ('.csv',)
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+SUPPORTED_EXTENSIONS = EXCEL_EXTENSIONS + CSV_EXTENSIONS + PARQUET_EXTENSIONS
+
+
+class FileHandler:
+    """
+    Reads and writes tables in Excel, CSV or Parquet format, chosen by file extension.
+    """
+
+    @staticmethod
+    def get_format(file_path):
+        """
+        Get the table format of a file from its extension.
+
+        Args:
+            file_path (str): Path to the file
+
+        Returns:
+            str: 'excel', 'csv' or 'parquet'
+
+        Raises:
+            ValueError: If the extension is not supported
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in EXCEL_EXTENSIONS:
+            return 'excel'
+        if extension in CSV_EXTENSIONS:
+            return 'csv'
+        if extension in PARQUET_EXTENSIONS:
+            return 'parquet'
+        raise ValueError(
+            f"Unsupported file type '{extension}' for {file_path}, expected one of {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
+
+    @staticmethod
+    def normalize_columns(df):
+        """
+        Rename alternative column spellings (e.g. Resource) to their canonical name.
+
+        Args:
+            df (pandas.DataFrame): The DataFrame to normalize
+
+        Returns:
+            pandas.DataFrame: The DataFrame with canonical column names
+        """
+        renames = {
+            alias: canonical for alias, canonical in COLUMN_ALIASES.items()
+            if alias in df.columns and canonical not in df.columns
+        }
+        return df.rename(columns=renames) if renames else df
+
+    @staticmethod
+    def read_table(file_path, columns=None, verbose=False, cache=None):
+        """
+        Read a table file, dispatching on its extension, and normalize its column names.
+
+        Args:
+            file_path (str): Path to an Excel, CSV or Parquet file
+            columns (list): Columns to load, or None to load every column
+            verbose (bool): Whether to print the number of rows read and the read speed
+            cache (DataFrameCache): Cache of parsed files to use, or None to always parse
+
+        Returns:
+            pandas.DataFrame: The data from the file
+        """
+        file_format = FileHandler.get_format(file_path)
+
+        if file_format == 'excel':
+            df = ExcelHandler.read_excel(file_path, columns, verbose=verbose, cache=cache)
+            return FileHandler.normalize_columns(df)
+
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        start_time = time.perf_counter()
+
+        # CSV and Parquet parse fast; the cache only pays off for Excel files
+        if file_format == 'csv':
+            df = FileHandler.read_csv(file_path, columns)
+        else:
+            df = FileHandler.read_parquet(file_path, columns)
+
+        if columns is not None:
+            df = ExcelHandler.apply_compact_dtypes(df)
+
+        if verbose:
+            elapsed = time.perf_counter() - start_time
+            rate = len(df) / elapsed if elapsed > 0 else float('inf')
+            print(f"Read {len(df):,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+        return FileHandler.normalize_columns(df)
+
+    @staticmethod
+    @instrumented
+    def read_csv(file_path, columns=None):
+        """
+        Read a CSV file, with the pyarrow parser when it is installed.
+
+        Args:
+            file_path (str): Path to the CSV file
+            columns (list): Columns to load (aliases accepted), or None to load every column
+
+        Returns:
+            pandas.DataFrame: The data from the file
+        """
+        options = {}
+        if columns is not None:
+            with open(file_path, newline='', encoding='utf-8-sig') as csv_file:
+                header = next(csv.reader(csv_file), [])
+            options['usecols'] = FileHandler._project(header, columns)
+
+        if importlib.util.find_spec('pyarrow') is not None:
+            options['engine'] = 'pyarrow'
+
+        return pd.read_csv(file_path, encoding='utf-8-sig', **options)
+
+    @staticmethod
+    @instrumented
+    def read_parquet(file_path, columns=None):
+        """
+        Read a Parquet file, loading only the requested column chunks.
+
+        Args:
+            file_path (str): Path to the Parquet file
+            columns (list): Columns to load (aliases accepted), or None to load every column
+
+        Returns:
+            pandas.DataFrame: The data from the file
+        """
+        if columns is not None:
+            import pyarrow.parquet as pq
+            columns = FileHandler._project(pq.read_schema(file_path).names, columns)
+
+        return pd.read_parquet(file_path, columns=columns)
+
+    @staticmethod
+    def write_table(df, output_file, sheet_name='Sheet1'):
+        """
+        Write a DataFrame, dispatching on the output file extension.
+
+        Excel files get the formatted workbook of ExcelHandler.write_excel; CSV and
+        Parquet files get the plain data, for jobs that do not need the styling.
+
+        Args:
+            df (pandas.DataFrame): The data to write
+            output_file (str): Path where the output file will be saved
+            sheet_name (str): Name of the worksheet (Excel only)
+
+        Returns:
+            str: The output file path
+        """
+        return FileHandler.write_tables({sheet_name: df}, output_file)
+
+    @staticmethod
+    @instrumented
+    def write_tables(sheets, output_file):
+        """
+        Write several DataFrames, dispatching on the output file extension.
+
+        Excel files get one formatted worksheet per DataFrame. CSV and Parquet files
+        hold a single table: the first DataFrame goes to output_file and each other
+        one to a sibling file suffixed with its sheet name (e.g. summary_diagnostics.csv).
+        Each file is written to a temporary file first and renamed when complete.
+
+        Args:
+            sheets (dict): Mapping of sheet name to DataFrame, in sheet order
+            output_file (str): Path where the output file will be saved
+
+        Returns:
+            str: The output file path
+        """
+        file_format = FileHandler.get_format(output_file)
+
+        if file_format == 'excel':
+            with atomic_output_path(output_file) as temp_path:
+                ExcelHandler.write_workbook(sheets, temp_path)
+            return output_file
+
+        stem, extension = os.path.splitext(output_file)
+        for position, (sheet_name, df) in enumerate(sheets.items()):
+            file_path = output_file if position == 0 else f"{stem}_{sheet_name.lower().replace(' ', '_')}{extension}"
+            with atomic_output_path(file_path) as temp_path:
+                if file_format == 'csv':
+                    df.to_csv(temp_path, index=False, encoding='utf-8-sig')
+                else:
+                    FileHandler._parquet_columns(df).to_parquet(temp_path, index=False)
+
+        return output_file
+
+    @staticmethod
+    def _parquet_columns(df):
+        """
+        Give the object-typed and categorical columns of a DataFrame a single Parquet type.
+
+        Categorical columns are written as their plain values. Columns holding one kind
+        of value get its type; columns still mixing kinds (e.g. numeric resource codes
+        next to indented project names) are written as text, missing values staying null.
+        """
+        df = df.infer_objects()
+        for column in df.columns:
+            values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = df[column] = values.astype(object).infer_objects()
+            if values.dtype == object:
+                df[column] = values.where(values.isna(), values.astype(str))
+        return df
+
+    @staticmethod
+    def _project(available_columns, columns):
+        """
+        Select the available columns matching the requested ones or their aliases.
+        """
+        wanted = set(columns)
+        return [
+            column for column in available_columns
+            if column in wanted or COLUMN_ALIASES.get(column) in wanted
+        ]
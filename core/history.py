@@ -0,0 +1,260 @@
+import os
+import sqlite3
+from datetime import date, datetime
+
+import pandas as pd
+
+from config.rules import get_theoretical_charges
+from config.settings import HISTORY_FILE
+from core.data_processor import DataProcessor
+from utils.instrumentation import instrumented
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    period TEXT NOT NULL,
+    source TEXT NOT NULL,
+    ressource TEXT NOT NULL,
+    projet TEXT NOT NULL,
+    charge_jh REAL,
+    charge_theorique REAL,
+    ecart REAL,
+    niveau TEXT,
+    phase TEXT
+);
+CREATE INDEX IF NOT EXISTS snapshots_ressource ON snapshots (ressource, period);
+CREATE INDEX IF NOT EXISTS snapshots_projet ON snapshots (projet, period);
+CREATE INDEX IF NOT EXISTS snapshots_period ON snapshots (period, source);
+
+CREATE TABLE IF NOT EXISTS resource_totals (
+    period TEXT NOT NULL,
+    ressource TEXT NOT NULL,
+    charge_jh REAL,
+    charge_theorique REAL,
+    ecart REAL,
+    projets INTEGER,
+    PRIMARY KEY (ressource, period)
+);
+CREATE INDEX IF NOT EXISTS resource_totals_period ON resource_totals (period);
+
+CREATE TABLE IF NOT EXISTS runs (
+    period TEXT NOT NULL,
+    source TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    row_count INTEGER,
+    PRIMARY KEY (period, source)
+);
+"""
+
+# Column names of the query results
+RESULT_COLUMNS = {
+    'period': 'Periode', 'source': 'Source', 'ressource': 'Ressource', 'projet': 'Projet',
+    'charge_jh': 'Charge JH', 'charge_theorique': 'Charge Theorique', 'ecart': 'Ecart',
+    'niveau': 'Niveau de connexion', 'phase': 'Phase du projet', 'projets': 'Projets',
+    'ressources': 'Ressources', 'recorded_at': 'Enregistre le', 'row_count': 'Lignes'
+}
+
+
+class HistoryStore:
+    """
+    SQLite store of the summary rows of every run, for trend and ranking queries.
+
+    Rows are kept by (period, source file): recording a timesheet again for the
+    same period replaces its previous rows. Per-resource totals of each period
+    are maintained in their own table, so resource queries never scan the rows.
+    """
+
+    def __init__(self, db_path=HISTORY_FILE, period=None):
+        """
+        Args:
+            db_path (str): Path to the SQLite database, created on first use
+            period (str): Period under which record() stores runs, defaults to the current month (YYYY-MM)
+        """
+        self.db_path = db_path
+        self.period = period or date.today().strftime('%Y-%m')
+
+    def _connect(self):
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # Parallel batch workers record concurrently; wait for each other's writes
+        connection = sqlite3.connect(self.db_path, timeout=60)
+        connection.executescript(SCHEMA)
+        return connection
+
+    @instrumented
+    def record(self, pivot_df, lookup_df, source, period=None):
+        """
+        Store the summary rows of a pivot table for one period and source file.
+
+        Args:
+            pivot_df (pandas.DataFrame): Charge JH by 'Ressource' and 'Projet'
+            lookup_df (pandas.DataFrame): Project information indexed by project name
+            source (str): Name of the timesheet file the rows come from
+            period (str): Period of the rows, defaults to the period of the store
+
+        Returns:
+            int: Number of rows stored
+        """
+        period = str(period or self.period)
+        rows = HistoryStore._build_rows(pivot_df, lookup_df)
+        row_count = len(rows['ressource'])
+
+        with self._connect() as connection:
+            connection.execute("DELETE FROM snapshots WHERE period = ? AND source = ?", (period, source))
+            connection.executemany(
+                "INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    [period] * row_count, [source] * row_count,
+                    *(rows[column].tolist() for column in
+                      ['ressource', 'projet', 'charge_jh', 'charge_theorique', 'ecart', 'niveau', 'phase'])
+                )
+            )
+
+            # Rebuild the resource totals of the period, over all of its sources
+            connection.execute("DELETE FROM resource_totals WHERE period = ?", (period,))
+            connection.execute(
+                """
+                INSERT INTO resource_totals
+                SELECT period, ressource, SUM(charge_jh), SUM(charge_theorique), SUM(ecart), COUNT(DISTINCT projet)
+                FROM snapshots WHERE period = ? GROUP BY ressource
+                """,
+                (period,)
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)",
+                (period, source, datetime.now().isoformat(timespec='seconds'), row_count)
+            )
+
+        return row_count
+
+    def runs(self):
+        """
+        List the recorded runs.
+
+        Returns:
+            pandas.DataFrame: Period, source, recording time and row count of each run
+        """
+        return self._query("SELECT period, source, recorded_at, row_count FROM runs ORDER BY period, source")
+
+    def trend(self, resource=None, project=None, last=None):
+        """
+        Get the charge and Ecart totals of each period, oldest first.
+
+        Args:
+            resource (str): Only count the rows of this resource
+            project (str): Only count the rows of this project
+            last (int): Only return the most recent periods, or None for all
+
+        Returns:
+            pandas.DataFrame: 'Periode', 'Charge JH', 'Charge Theorique' and 'Ecart'
+        """
+        if project is None:
+            # Resource totals are precomputed by period
+            table = 'resource_totals'
+            measures = "SUM(charge_theorique) AS charge_theorique, SUM(ecart) AS ecart, SUM(projets) AS projets"
+        else:
+            # Every row of a project repeats its theoretical charge: count it once
+            table = 'snapshots'
+            measures = (
+                "MAX(charge_theorique) AS charge_theorique, MAX(charge_theorique) - SUM(charge_jh) AS ecart, "
+                "COUNT(DISTINCT ressource) AS ressources"
+            )
+
+        conditions, parameters = [], []
+        for column, value in (('ressource', resource), ('projet', project)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        limit = "LIMIT ?" if last else ""
+        if last:
+            parameters.append(last)
+
+        return self._query(
+            f"""
+            SELECT * FROM (
+                SELECT period, SUM(charge_jh) AS charge_jh, {measures}
+                FROM {table} {where}
+                GROUP BY period ORDER BY period DESC {limit}
+            ) ORDER BY period
+            """,
+            parameters
+        )
+
+    def top(self, period=None, by='ressource', n=10):
+        """
+        Rank the resources or projects with the most negative Ecart of a period,
+        i.e. whose charge most exceeds their theoretical charge.
+
+        Args:
+            period (str): The period, defaults to the most recent one
+            by (str): 'ressource' or 'projet'
+            n (int): Number of rows returned
+
+        Returns:
+            pandas.DataFrame: The ranked rows with their charge and Ecart totals
+        """
+        if by not in ('ressource', 'projet'):
+            raise ValueError(f"Cannot rank by '{by}', expected 'ressource' or 'projet'")
+
+        if period is None:
+            latest = self._query("SELECT MAX(period) AS period FROM runs")
+            period = latest['Periode'].iloc[0]
+            if period is None:
+                return pd.DataFrame(columns=['Periode', by.capitalize(), 'Charge JH', 'Charge Theorique', 'Ecart'])
+
+        if by == 'ressource':
+            sql = """
+                SELECT period, ressource, charge_jh, charge_theorique, ecart, projets
+                FROM resource_totals WHERE period = ? AND ecart IS NOT NULL
+                ORDER BY ecart LIMIT ?
+            """
+        else:
+            sql = """
+                SELECT period, projet, SUM(charge_jh) AS charge_jh, MAX(charge_theorique) AS charge_theorique,
+                       MAX(charge_theorique) - SUM(charge_jh) AS ecart, COUNT(*) AS ressources
+                FROM snapshots WHERE period = ? GROUP BY projet
+                HAVING ecart IS NOT NULL ORDER BY ecart LIMIT ?
+            """
+        return self._query(sql, (str(period), n))
+
+    def _query(self, sql, parameters=()):
+        with self._connect() as connection:
+            df = pd.read_sql_query(sql, connection, params=list(parameters))
+        return df.rename(columns=RESULT_COLUMNS)
+
+    @staticmethod
+    def _build_rows(pivot_df, lookup_df):
+        """
+        Compute the stored columns of every pivot row, looking projects up once each.
+
+        Returns a dict of object arrays, one per column of the snapshots table.
+        """
+        pivot_df = DataProcessor.encode_identifiers(pivot_df)
+        projects = pivot_df['Projet'].cat.remove_unused_categories()
+        project_codes = projects.cat.codes.to_numpy()
+
+        project_info = lookup_df.reindex(projects.cat.categories.to_numpy(dtype=object))
+        levels = project_info['Niveau de connexion'].astype(object).fillna('').to_numpy()
+        phases = project_info['Phase du projet'].astype(object).fillna('').to_numpy()
+        project_charges = get_theoretical_charges(levels, phases)
+
+        charges = pivot_df['Charge JH'].to_numpy(dtype='float64')
+        theoretical = project_charges[project_codes]
+
+        def nullable(values):
+            # SQLite stores None as NULL, which SUM() skips like the summary skips blanks
+            values = values.astype(object)
+            values[pd.isna(values) | (values == '')] = None
+            return values
+
+        return {
+            'ressource': pivot_df['Ressource'].astype(str).to_numpy(dtype=object),
+            'projet': projects.astype(str).to_numpy(dtype=object),
+            'charge_jh': nullable(charges),
+            'charge_theorique': nullable(theoretical),
+            'ecart': nullable(theoretical - charges),
+            'niveau': nullable(levels[project_codes]),
+            'phase': nullable(phases[project_codes]),
+        }
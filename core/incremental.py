@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.data_processor import DataProcessor
+from core.excel_handler import ExcelHandler
+
+# Number of already-ingested rows sampled to check that the timesheet was only appended to
+FINGERPRINT_SAMPLES = 64
+
+KEY_COLUMNS = ['Ressource', 'Projet']
+
+
+class IncrementalAggregator:
+    """
+    Charge JH by (resource, project) of an append-only timesheet, updated from new rows only.
+
+    The state keeps the aggregates, the number of rows already ingested (the watermark)
+    and a fingerprint of sampled ingested rows. When the fingerprint no longer matches,
+    the file was edited rather than appended to, and the state is rebuilt from scratch.
+    """
+
+    def __init__(self, state_path):
+        """
+        Args:
+            state_path (str): Path of the state file
+        """
+        self.state_path = state_path
+        self.pivot_df = pd.DataFrame(columns=KEY_COLUMNS + ['Charge JH'])
+        self.watermark = 0
+        self.fingerprint = None
+
+        if os.path.exists(state_path):
+            state = pd.read_pickle(state_path)
+            self.pivot_df = state['pivot']
+            self.watermark = state['watermark']
+            self.fingerprint = state['fingerprint']
+
+    def update(self, df, full_rebuild=False):
+        """
+        Bring the aggregates up to date with a timesheet and save the state.
+
+        Args:
+            df (pandas.DataFrame): The whole timesheet, including rows already ingested
+            full_rebuild (bool): Whether to ignore the stored state and aggregate every row
+
+        Returns:
+            tuple: (pandas.DataFrame, int, bool) - The pivot table, the number of rows
+                aggregated in this run and whether the state was rebuilt from scratch
+        """
+        rebuild = full_rebuild or not self._is_append_of_state(df)
+
+        if rebuild:
+            self.pivot_df = self.aggregate(df)
+            delta_rows = len(df)
+        else:
+            delta_df = df.iloc[self.watermark:]
+            delta_rows = len(delta_df)
+            if delta_rows:
+                merged_df = pd.concat([self.pivot_df, self.aggregate(delta_df)], ignore_index=True)
+                self.pivot_df = merged_df.groupby(KEY_COLUMNS, observed=True)['Charge JH'].sum().reset_index()
+
+        self.watermark = len(df)
+        self.fingerprint = self._fingerprint(df, self.watermark)
+        self.save()
+
+        return self.pivot_df, delta_rows, rebuild
+
+    def verify(self, df):
+        """
+        Check that the incremental aggregates equal a full rebuild of the timesheet.
+
+        Args:
+            df (pandas.DataFrame): The whole timesheet
+
+        Returns:
+            bool: True if both paths give the same result
+        """
+        full_df = self.aggregate(df)
+        merged = self.pivot_df.merge(full_df, on=KEY_COLUMNS, how='outer', suffixes=('_incremental', '_full'))
+
+        return bool(np.allclose(
+            merged['Charge JH_incremental'].astype('float64'),
+            merged['Charge JH_full'].astype('float64'),
+            equal_nan=False
+        ))
+
+    def save(self):
+        """
+        Save the state to disk.
+        """
+        state_dir = os.path.dirname(self.state_path)
+        if state_dir and not os.path.exists(state_dir):
+            os.makedirs(state_dir)
+
+        state = {'pivot': self.pivot_df, 'watermark': self.watermark, 'fingerprint': self.fingerprint}
+        pd.to_pickle(state, self.state_path)
+
+    @staticmethod
+    def aggregate(df):
+        """
+        Aggregate timesheet rows into Charge JH by resource and project.
+
+        Args:
+            df (pandas.DataFrame): Timesheet rows
+
+        Returns:
+            pandas.DataFrame: The pivot table, with plain (non-categorical) keys
+        """
+        pivot_df = ExcelHandler.create_pivot_table(
+            DataProcessor.calculate_charge_jh(df), 'Charge JH', KEY_COLUMNS
+        )
+        return pivot_df.astype({column: object for column in KEY_COLUMNS})
+
+    def _is_append_of_state(self, df):
+        if self.fingerprint is None or len(df) < self.watermark:
+            return False
+        return self._fingerprint(df, self.watermark) == self.fingerprint
+
+    @staticmethod
+    def _fingerprint(df, row_count):
+        """
+        Hash a sample of the first row_count rows (always including the last one).
+        """
+        if row_count == 0:
+            return None
+
+        positions = np.unique(np.linspace(0, row_count - 1, FINGERPRINT_SAMPLES).astype(int))
+        sample = df.iloc[positions][KEY_COLUMNS + ['Soumise (h)']].astype(object)
+        hashes = pd.util.hash_pandas_object(sample, index=False).to_numpy()
+
+        return f"{row_count}:{hashes.sum(dtype=np.uint64)}:{hashes[-1]}"
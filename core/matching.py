@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from config.settings import CACHE_DIR
+
+# Minimum Dice similarity of character trigrams for an approximate match
+DEFAULT_MIN_SCORE = 0.85
+
+MATCH_CACHE_FILE = os.path.join(CACHE_DIR, 'project_matches.json')
+
+NGRAM_SIZE = 3
+
+
+def normalize_names(names):
+    """
+    Normalize project names for comparison: casefold, strip accents, collapse whitespace.
+
+    Args:
+        names (pandas.Series): Project names
+
+    Returns:
+        pandas.Series: Normalized keys, aligned with names
+    """
+    return (
+        names.astype(str)
+        .str.normalize('NFKD')
+        # Combining accents split off by NFKD; not a raw string, the Arrow regex engine has no \u escapes
+        .str.replace('[\u0300-\u036f]', '', regex=True)
+        .str.casefold()
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
+
+
+class ProjectMatcher:
+    """
+    Resolves timesheet project names to deployments names in one batch.
+
+    Names are matched exactly first, then on their normalized key and, when enabled,
+    approximately through an index of character trigrams of the normalized keys.
+    Resolved names are cached on disk per set of deployments names.
+    """
+
+    def __init__(self, deployment_names, fuzzy=False, min_score=DEFAULT_MIN_SCORE, cache_path=None):
+        """
+        Args:
+            deployment_names (iterable): Project names of the deployments file
+            fuzzy (bool): Whether to look for approximate matches of names left unresolved
+            min_score (float): Minimum trigram similarity (0 to 1) of an approximate match
+            cache_path (str): JSON file caching resolved names between runs, or None
+        """
+        self.names = pd.Series(pd.unique(pd.Series(list(deployment_names), dtype=object).dropna()), dtype=object)
+        self.fuzzy = fuzzy
+        self.min_score = min_score
+        self.cache_path = cache_path
+
+        self._exact = set(self.names)
+        # When several names share a key, the last one wins, as for duplicated projects
+        self.keys = normalize_names(self.names)
+        self._by_key = dict(zip(self.keys, self.names))
+        self._ngram_index = None
+
+        fingerprint_source = json.dumps([sorted(self.names.astype(str)), fuzzy, min_score])
+        self.fingerprint = hashlib.sha256(fingerprint_source.encode('utf-8')).hexdigest()
+
+    def resolve(self, projects):
+        """
+        Resolve timesheet project names to deployments names.
+
+        Args:
+            projects (iterable): Timesheet project names (duplicates are resolved once)
+
+        Returns:
+            pandas.DataFrame: One row per distinct project with 'Projet', 'Nom' (None when
+                unresolved), 'Correspondance' ('exacte', 'normalisee', 'approchee' or
+                'aucune') and 'Score'
+        """
+        distinct = pd.Series(pd.unique(pd.Series(list(projects), dtype=object).dropna()), dtype=object)
+        cached = self._load_cache()
+
+        results = {}
+        pending = []
+        for project in distinct:
+            key = str(project)
+            if key in cached:
+                results[project] = tuple(cached[key])
+            else:
+                pending.append(project)
+
+        if pending:
+            resolved = self._resolve_batch(pd.Series(pending, dtype=object))
+            results.update(resolved)
+            cached.update({str(project): list(match) for project, match in resolved.items()})
+            self._save_cache(cached)
+
+        report = pd.DataFrame(
+            [(project, *results[project]) for project in distinct],
+            columns=['Projet', 'Nom', 'Correspondance', 'Score']
+        )
+        return report
+
+    def align_lookup(self, lookup_df, report):
+        """
+        Re-key a lookup table on timesheet project names using resolved matches.
+
+        Args:
+            lookup_df (pandas.DataFrame): Project information indexed by deployments name
+            report (pandas.DataFrame): Matches as returned by resolve
+
+        Returns:
+            pandas.DataFrame: Project information indexed by timesheet project name
+        """
+        matched = report[report['Nom'].notna()]
+        aligned = lookup_df.reindex(matched['Nom'].to_numpy())
+        aligned.index = pd.Index(matched['Projet'].to_numpy(), dtype=object)
+        return aligned
+
+    def _resolve_batch(self, projects):
+        results = {}
+        keys = normalize_names(projects)
+
+        unresolved = []
+        for project, key in zip(projects, keys):
+            if project in self._exact:
+                results[project] = (project, 'exacte', 1.0)
+            elif key in self._by_key:
+                results[project] = (self._by_key[key], 'normalisee', 1.0)
+            else:
+                unresolved.append((project, key))
+
+        for project, key in unresolved:
+            match = self._best_approximate(key) if self.fuzzy else None
+            if match is None:
+                results[project] = (None, 'aucune', 0.0)
+            else:
+                results[project] = (self.names.iloc[match[0]], 'approchee', round(match[1], 4))
+
+        return results
+
+    def _best_approximate(self, key):
+        """
+        Find the deployments name with the most similar trigram set to a normalized key.
+
+        Returns:
+            tuple: (int, float) - Position of the best name and its Dice score, or None
+                when no name is close enough or several are equally close
+        """
+        if self._ngram_index is None:
+            self._build_ngram_index()
+        postings, gram_counts = self._ngram_index
+
+        grams = _ngrams(key)
+        candidate_lists = [postings[gram] for gram in grams if gram in postings]
+        if not candidate_lists:
+            return None
+
+        # Count shared trigrams with every candidate name in one bincount
+        shared = np.bincount(np.concatenate(candidate_lists), minlength=len(gram_counts))
+        scores = 2 * shared / (len(grams) + gram_counts)
+        best = int(np.argmax(scores))
+
+        if scores[best] < self.min_score:
+            return None
+        # Two equally close names: the match is ambiguous, leave it unresolved
+        if np.count_nonzero(scores == scores[best]) > 1:
+            return None
+        return best, float(scores[best])
+
+    def _build_ngram_index(self):
+        postings = {}
+        gram_counts = np.zeros(len(self.keys), dtype=np.int64)
+        for position, key in enumerate(self.keys):
+            grams = _ngrams(key)
+            gram_counts[position] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+
+        self._ngram_index = (
+            {gram: np.array(positions, dtype=np.int64) for gram, positions in postings.items()},
+            gram_counts
+        )
+
+    def _load_cache(self):
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding='utf-8') as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        # Matches are only valid for the deployments names they were resolved against
+        return cache.get('matches', {}) if cache.get('fingerprint') == self.fingerprint else {}
+
+    def _save_cache(self, matches):
+        if self.cache_path is None:
+            return
+
+        cache_dir = os.path.dirname(self.cache_path) or '.'
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+            json.dump({'fingerprint': self.fingerprint, 'matches': matches}, temp_file, ensure_ascii=False)
+        os.replace(temp_path, self.cache_path)
+
+
+def _ngrams(key):
+    """
+    Get the set of character trigrams of a normalized key, padded with spaces.
+    """
+    padded = f" {key} "
+    if len(padded) <= NGRAM_SIZE:
+        return {padded}
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
@@ -0,0 +1,93 @@
+import os
+
+import pandas as pd
+
+from core.data_processor import DataProcessor
+
+
+class PeriodAggregates:
+    """
+    Charge JH aggregated by (period, resource, project), reusable across runs.
+
+    Adding a period only aggregates the new timesheet: the aggregates of the
+    periods already known are kept as they are and can be saved to disk.
+    """
+
+    def __init__(self, pivot_df=None):
+        """
+        Args:
+            pivot_df (pandas.DataFrame): Existing aggregates, as built by
+                DataProcessor.aggregate_periods
+        """
+        if pivot_df is None:
+            pivot_df = DataProcessor.aggregate_periods({})
+        self.pivot_df = pivot_df
+
+    @property
+    def periods(self):
+        """list: The periods currently aggregated, sorted."""
+        return sorted(self.pivot_df['Periode'].astype(str).unique())
+
+    def add_periods(self, frames, replace=False):
+        """
+        Aggregate new periods and merge them with the existing ones.
+
+        Args:
+            frames (dict): Mapping of period label to timesheet DataFrame
+            replace (bool): Whether to re-aggregate periods that are already known;
+                otherwise they are skipped
+
+        Returns:
+            list: The periods that were aggregated
+        """
+        known = set(self.periods)
+        frames = {str(period): df for period, df in frames.items() if replace or str(period) not in known}
+        if not frames:
+            return []
+
+        new_df = DataProcessor.aggregate_periods(frames)
+        kept_df = self.pivot_df[~self.pivot_df['Periode'].astype(str).isin(frames)]
+        self.pivot_df = pd.concat([kept_df, new_df], ignore_index=True)
+
+        return sorted(frames)
+
+    def consolidated_summary(self, lookup_df):
+        """
+        Build the consolidated summary over all aggregated periods.
+
+        Args:
+            lookup_df (pandas.DataFrame): Project information indexed by project name
+
+        Returns:
+            pandas.DataFrame: The formatted consolidated summary
+        """
+        return DataProcessor.format_period_summary(self.pivot_df, lookup_df)
+
+    def save(self, file_path):
+        """
+        Save the aggregates to disk.
+
+        Args:
+            file_path (str): Path of the state file
+        """
+        output_dir = os.path.dirname(file_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        self.pivot_df.to_pickle(file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load aggregates saved with save(), or start empty if the file does not exist.
+
+        Args:
+            file_path (str): Path of the state file
+
+        Returns:
+            PeriodAggregates: The loaded aggregates
+        """
+        if not os.path.exists(file_path):
+            return cls()
+
+        return cls(pd.read_pickle(file_path))
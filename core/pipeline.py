@@ -0,0 +1,299 @@
+import os
+
+from config.settings import CACHE_ENABLED, DEPLOYMENT_KEY_COLUMN, DEPLOYMENT_LOOKUP_COLUMNS, TIMESHEET_COLUMNS
+from core.capacity import CapacityAnalytics
+from core.data_processor import DataProcessor
+from core.drilldown import DrillDown
+from core.excel_handler import ExcelHandler
+from core.file_handler import FileHandler
+from core.matching import MATCH_CACHE_FILE, ProjectMatcher
+from core.validation import DataValidator
+
+
+def read_timesheet(file_path, cache=None, verbose=False, sheet_pattern=None, workers=None):
+    """
+    Read a timesheet file and normalize its column names.
+
+    Args:
+        file_path (str): Path to the timesheet file (Excel, CSV or Parquet)
+        cache (DataFrameCache): Cache of parsed files to use, or None to always parse
+        verbose (bool): Whether to print read statistics
+        sheet_pattern (str): Pattern of the Excel sheets to read and concatenate ('*' for all),
+            or None to read only the first sheet
+        workers (int): Number of processes parsing the sheets in parallel
+
+    Returns:
+        pandas.DataFrame: The timesheet data
+    """
+    if sheet_pattern is None or FileHandler.get_format(file_path) != 'excel':
+        return FileHandler.read_table(file_path, TIMESHEET_COLUMNS, verbose=verbose, cache=cache)
+
+    df = ExcelHandler.read_excel_sheets(
+        file_path, TIMESHEET_COLUMNS, sheet_pattern, workers=workers, verbose=verbose, cache=cache
+    )
+    return FileHandler.normalize_columns(df)
+
+
+def read_pivot(file_path, cache=None, verbose=False, sheet_pattern=None):
+    """
+    Read a timesheet and aggregate it to Charge JH by resource and project.
+
+    The pivot is cached on its own, so that commands evaluating the same timesheet
+    several times (e.g. scenarios) skip both parsing and aggregation.
+
+    Args:
+        file_path (str): Path to the timesheet file (Excel, CSV or Parquet)
+        cache (DataFrameCache): Cache of parsed files to use, or None to always parse
+        verbose (bool): Whether to print read statistics
+        sheet_pattern (str): Pattern of the Excel sheets to read, or None for the first sheet only
+
+    Returns:
+        pandas.DataFrame: Charge JH by 'Ressource' and 'Projet'
+
+    Raises:
+        ValueError: If required columns are missing from the timesheet
+    """
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(file_path, columns=TIMESHEET_COLUMNS, sheets=sheet_pattern, stage='pivot')
+        pivot_df = cache.get(cache_key)
+        if pivot_df is not None:
+            if verbose:
+                print(f"Loaded the aggregated timesheet ({len(pivot_df):,} rows) from cache")
+            return pivot_df
+
+    df = read_timesheet(file_path, cache=cache, verbose=verbose, sheet_pattern=sheet_pattern)
+    is_valid, missing_columns = DataProcessor.validate_dataframe(df, TIMESHEET_COLUMNS)
+    if not is_valid:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+    df, _ = DataValidator.check_timesheet(df)
+    df = DataProcessor.calculate_charge_jh(DataProcessor.encode_identifiers(df))
+    pivot_df = ExcelHandler.create_pivot_table(df, 'Charge JH', ['Ressource', 'Projet'])
+
+    if cache is not None:
+        cache.put(cache_key, pivot_df)
+
+    return pivot_df
+
+
+def read_lookup_table(deployments_file, cache=None, verbose=False, check=False):
+    """
+    Read a deployments file and build the project lookup table.
+
+    Args:
+        deployments_file (str): Path to the deployments file (Excel, CSV or Parquet)
+        cache (DataFrameCache): Cache of parsed files to use, or None to always parse
+        verbose (bool): Whether to print read statistics
+        check (bool): Whether to also run the data checks of the deployments rows
+
+    Returns:
+        pandas.DataFrame: Project information indexed by project name, or a tuple
+            (pandas.DataFrame, list) with the issues found when check is set
+    """
+    deployments_df = FileHandler.read_table(
+        deployments_file, [DEPLOYMENT_KEY_COLUMN] + DEPLOYMENT_LOOKUP_COLUMNS, verbose=verbose, cache=cache
+    )
+
+    if verbose:
+        print("Creating lookup table for project information...")
+
+    lookup_df = DataProcessor.create_lookup_table(deployments_df, DEPLOYMENT_LOOKUP_COLUMNS)
+    if not check:
+        return lookup_df
+
+    issues = DataValidator.check_deployments(deployments_df)
+    if verbose and issues:
+        print(f"Deployments data checks: {DataValidator.describe_issues(issues)}")
+
+    return lookup_df, issues
+
+
+def create_matcher(lookup_df, match_mode, use_cache=CACHE_ENABLED):
+    """
+    Create the project name matcher for a matching mode.
+
+    Args:
+        lookup_df (pandas.DataFrame): Project information indexed by project name
+        match_mode (str): 'exact', 'normalized' or 'fuzzy'
+        use_cache (bool): Whether to reuse and store the matches in the match cache
+
+    Returns:
+        ProjectMatcher: The matcher, or None for exact matching
+    """
+    if match_mode in (None, 'exact'):
+        return None
+
+    cache_path = MATCH_CACHE_FILE if use_cache else None
+    return ProjectMatcher(lookup_df.index, fuzzy=(match_mode == 'fuzzy'), cache_path=cache_path)
+
+
+def match_projects(projects, lookup_df, matcher, verbose=False, match_report_file=None):
+    """
+    Resolve timesheet project names against the deployments names in one batch.
+
+    Args:
+        projects (pandas.Series): Timesheet project names
+        lookup_df (pandas.DataFrame): Project information indexed by deployments name
+        matcher (ProjectMatcher): The project name matcher
+        verbose (bool): Whether to print match statistics
+        match_report_file (str): Path where the matching report is written, or None
+
+    Returns:
+        pandas.DataFrame: Project information indexed by timesheet project name
+    """
+    if verbose:
+        print("Matching project names with the deployments file...")
+
+    report = matcher.resolve(projects)
+
+    if verbose:
+        counts = report['Correspondance'].value_counts()
+        print("Project names matched: " + ", ".join(f"{kind} {count}" for kind, count in counts.items()))
+    if match_report_file:
+        FileHandler.write_table(report, match_report_file, 'Correspondances')
+
+    return matcher.align_lookup(lookup_df, report)
+
+
+def summarize(df, lookup_df, verbose=False, matcher=None, match_report_file=None):
+    """
+    Build the resource summary of a validated timesheet.
+
+    Args:
+        df (pandas.DataFrame): The timesheet data
+        lookup_df (pandas.DataFrame): Project information indexed by project name
+        verbose (bool): Whether to print progress messages
+        matcher (ProjectMatcher): Matcher resolving timesheet project names to deployments
+            names, or None to require exact names
+        match_report_file (str): Path where the name matching report is written, or None
+
+    Returns:
+        pandas.DataFrame: The formatted resource summary
+    """
+    return summarize_sheets(df, lookup_df, verbose, matcher, match_report_file)['Resource Summary']
+
+
+def summarize_sheets(df, lookup_df, verbose=False, matcher=None, match_report_file=None, capacity_plan=None,
+                     history_store=None, source=None, drilldown=False):
+    """
+    Build the output sheets of a validated timesheet.
+
+    Args:
+        df (pandas.DataFrame): The timesheet data
+        lookup_df (pandas.DataFrame): Project information indexed by project name
+        verbose (bool): Whether to print progress messages
+        matcher (ProjectMatcher): Matcher resolving timesheet project names to deployments
+            names, or None to require exact names
+        match_report_file (str): Path where the name matching report is written, or None
+        capacity_plan (CapacityPlan): Resource capacities, to add the capacity sheet; or None
+        history_store (HistoryStore): Store recording the summary rows, or None
+        source (str): Name under which the rows are recorded in history_store
+        drilldown (bool): Whether to add the per-project, per-level and per-phase sheets
+
+    Returns:
+        dict: Mapping of sheet name to DataFrame, the resource summary first
+    """
+    # Encode resource and project names once; the next stages work on their codes
+    df = DataProcessor.encode_identifiers(df)
+
+    # Calculate Charge JH
+    if verbose:
+        print("Calculating 'Charge JH' (Soumise (h) / 8)...")
+    df = DataProcessor.calculate_charge_jh(df)
+
+    # Create pivot table
+    if verbose:
+        print("Creating pivot table...")
+    pivot_df = ExcelHandler.create_pivot_table(df, 'Charge JH', ['Ressource', 'Projet'])
+
+    if matcher is not None:
+        lookup_df = match_projects(pivot_df['Projet'], lookup_df, matcher, verbose, match_report_file)
+
+    return build_sheets(pivot_df, lookup_df, verbose, capacity_plan, history_store, source, drilldown)
+
+
+def build_sheets(pivot_df, lookup_df, verbose=False, capacity_plan=None, history_store=None, source=None,
+                 drilldown=False):
+    """
+    Format the output sheets of a pivot table of Charge JH by resource and project.
+
+    Args:
+        pivot_df (pandas.DataFrame): Charge JH by 'Ressource' and 'Projet'
+        lookup_df (pandas.DataFrame): Project information indexed by project name
+        verbose (bool): Whether to print progress messages
+        capacity_plan (CapacityPlan): Resource capacities, to add the capacity sheet; or None
+        history_store (HistoryStore): Store recording the summary rows, or None
+        source (str): Name under which the rows are recorded in history_store
+        drilldown (bool): Whether to add the per-project, per-level and per-phase sheets
+
+    Returns:
+        dict: Mapping of sheet name to DataFrame, the resource summary first
+    """
+    # Format the resource summary with theoretical charge
+    if verbose:
+        print("Formatting output data and calculating theoretical charges...")
+    sheets = {'Resource Summary': DataProcessor.format_resource_summary(pivot_df, lookup_df)}
+
+    if capacity_plan is not None:
+        if verbose:
+            print("Comparing resource loads with their capacity...")
+        sheets['Capacite'] = CapacityAnalytics.build_sheet(pivot_df, lookup_df, capacity_plan)
+
+    if drilldown:
+        if verbose:
+            print("Building the per-project, per-level and per-phase views...")
+        sheets.update(DrillDown.build_sheets(pivot_df, lookup_df))
+
+    if history_store is not None:
+        row_count = history_store.record(pivot_df, lookup_df, source)
+        if verbose:
+            print(f"Recorded {row_count:,} rows of {source} in the history of {history_store.period}")
+
+    return sheets
+
+
+def process_timesheet(input_file, lookup_df, output_file, cache=None, sheet_pattern=None, matcher=None,
+                      deployment_issues=None, capacity_plan=None, history_store=None, drilldown=False):
+    """
+    Run the whole pipeline for one timesheet file and write its summary.
+
+    Args:
+        input_file (str): Path to the timesheet file (Excel, CSV or Parquet)
+        lookup_df (pandas.DataFrame): Project information indexed by project name
+        output_file (str): Path where the summary will be saved; the extension selects
+            a formatted workbook (.xlsx) or plain data (.csv, .parquet)
+        cache (DataFrameCache): Cache of parsed files to use, or None to always parse
+        sheet_pattern (str): Pattern of the sheets to read, or None for the first sheet only
+        matcher (ProjectMatcher): Project name matcher, or None to require exact names
+        deployment_issues (list): Issues of the deployments data checks, to write a
+            Diagnostics sheet with the timesheet issues; None to leave it out
+        capacity_plan (CapacityPlan): Resource capacities, to add the capacity sheet; or None
+        history_store (HistoryStore): Store recording the summary rows under the timesheet
+            file name, or None
+        drilldown (bool): Whether to add the per-project, per-level and per-phase sheets
+
+    Returns:
+        int: Number of timesheet rows processed
+
+    Raises:
+        ValueError: If required columns are missing from the timesheet
+    """
+    # Files are already processed in parallel, so sheets are parsed sequentially
+    df = read_timesheet(input_file, cache=cache, sheet_pattern=sheet_pattern, workers=1)
+
+    is_valid, missing_columns = DataProcessor.validate_dataframe(df, TIMESHEET_COLUMNS)
+    if not is_valid:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+    df, issues = DataValidator.check_timesheet(df)
+    sheets = summarize_sheets(
+        df, lookup_df, matcher=matcher, capacity_plan=capacity_plan,
+        history_store=history_store, source=os.path.basename(input_file), drilldown=drilldown
+    )
+    if deployment_issues is not None:
+        sheets['Diagnostics'] = DataValidator.format_diagnostics(deployment_issues + issues)
+
+    FileHandler.write_tables(sheets, output_file)
+
+    return len(df)
@@ -0,0 +1,157 @@
+import copy
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from config.rules import THEORETICAL_CHARGE_RULES, compile_charge_tables
+from core.data_processor import DataProcessor
+from utils.instrumentation import instrumented
+
+# Name of the built-in rule set in the comparison
+BASELINE_SCENARIO = 'Actuel'
+
+
+def load_rule_set(file_path, base_rules=THEORETICAL_CHARGE_RULES):
+    """
+    Load an alternative rule set from a JSON or YAML file.
+
+    The file holds the rules that change, shaped like THEORETICAL_CHARGE_RULES
+    ({connection level: {phase: charge}}); they are applied over base_rules, so a
+    scenario only lists its differences. A null charge removes a rule and a null
+    connection level removes all of its rules.
+
+    Args:
+        file_path (str): Path to the .json, .yaml or .yml file
+        base_rules (dict): Rules the file is applied to
+
+    Returns:
+        dict: The complete rule set
+
+    Raises:
+        ValueError: If the file is not a mapping of mappings of numbers, or YAML
+            support (PyYAML) is not installed
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    with open(file_path, encoding='utf-8') as rules_file:
+        if extension in ('.yaml', '.yml'):
+            if importlib.util.find_spec('yaml') is None:
+                raise ValueError(f"Reading {file_path} requires PyYAML (pip install pyyaml)")
+            import yaml
+            overrides = yaml.safe_load(rules_file)
+        else:
+            overrides = json.load(rules_file)
+
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{file_path} must map connection levels to {{phase: charge}} mappings")
+
+    rules = copy.deepcopy(base_rules)
+    for level, phase_rules in overrides.items():
+        if phase_rules is None:
+            rules.pop(level, None)
+            continue
+        if not isinstance(phase_rules, dict):
+            raise ValueError(f"{file_path}: rules of '{level}' must map phases to charges")
+
+        level_rules = rules.setdefault(level, {})
+        for phase, charge in phase_rules.items():
+            if charge is None:
+                level_rules.pop(phase, None)
+            elif isinstance(charge, (int, float)) and not isinstance(charge, bool):
+                level_rules[phase] = charge
+            else:
+                raise ValueError(f"{file_path}: charge of '{level}' / '{phase}' must be a number, got {charge!r}")
+
+    return rules
+
+
+def load_scenarios(file_paths):
+    """
+    Load the built-in rule set and the alternative rule sets of several files.
+
+    Args:
+        file_paths (list): Paths to the rule set files; each scenario is named after its file
+
+    Returns:
+        dict: Mapping of scenario name to rule set, the built-in rules first
+    """
+    scenarios = {BASELINE_SCENARIO: THEORETICAL_CHARGE_RULES}
+    for file_path in file_paths:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        if name in scenarios:
+            raise ValueError(f"Two scenarios are named '{name}'")
+        scenarios[name] = load_rule_set(file_path)
+    return scenarios
+
+
+@instrumented
+def compare_scenarios(pivot_df, lookup_df, scenarios):
+    """
+    Evaluate the theoretical charge and Ecart of every resource under several rule sets.
+
+    The rule sets are compiled into one (scenario x connection level x phase) array.
+    Each distinct project is translated once to its (level, phase) coordinates, and
+    the charges of all scenarios are gathered for every pivot row at once, then
+    summed by resource in a single bincount over (scenario, resource) codes.
+
+    Args:
+        pivot_df (pandas.DataFrame): Charge JH by 'Ressource' and 'Projet'
+        lookup_df (pandas.DataFrame): Project information indexed by project name
+        scenarios (dict): Mapping of scenario name to rule set, as built by load_scenarios
+
+    Returns:
+        pandas.DataFrame: The comparison sheet: a bold total row, then one indented row
+            per resource, with 'Charge JH' and a 'Charge Theorique <name>' and
+            'Ecart <name>' column per scenario
+    """
+    names = list(scenarios)
+    levels, phases, tables = compile_charge_tables([scenarios[name] for name in names])
+
+    pivot_df = DataProcessor.encode_identifiers(pivot_df)
+    resources = pivot_df['Ressource'].cat.remove_unused_categories()
+    projects = pivot_df['Projet'].cat.remove_unused_categories()
+    resource_codes = resources.cat.codes.to_numpy()
+    project_codes = projects.cat.codes.to_numpy()
+    charges = np.nan_to_num(pivot_df['Charge JH'].to_numpy(dtype='float64'))
+    n_resources = len(resources.cat.categories)
+
+    # (level, phase) coordinates of each distinct project; -1 when unknown or empty
+    project_info = lookup_df.reindex(projects.cat.categories.to_numpy(dtype=object))
+    level_codes = levels.get_indexer(pd.Index(project_info['Niveau de connexion'].astype(object), dtype=object))
+    phase_codes = phases.get_indexer(pd.Index(project_info['Phase du projet'].astype(object), dtype=object))
+    matched = (level_codes >= 0) & (phase_codes >= 0)
+
+    # Theoretical charge of each project under each scenario: (scenarios, projects)
+    project_charges = np.full((len(names), len(project_info)), np.nan)
+    project_charges[:, matched] = tables[:, level_codes[matched], phase_codes[matched]]
+
+    # Rows without a rule are left out of the Ecart, as in the resource summary
+    row_charges = project_charges[:, project_codes]
+    known = ~np.isnan(row_charges)
+    row_ecarts = np.where(known, row_charges - charges, 0.0)
+
+    # One bincount per measure over the flattened (scenario, resource) codes
+    flat_codes = (np.arange(len(names))[:, None] * n_resources + resource_codes).ravel()
+    size = len(names) * n_resources
+    theoretical = np.bincount(flat_codes, weights=np.where(known, row_charges, 0.0).ravel(), minlength=size)
+    ecarts = np.bincount(flat_codes, weights=row_ecarts.ravel(), minlength=size)
+    has_rule = np.bincount(flat_codes, weights=known.ravel().astype('float64'), minlength=size) > 0
+
+    theoretical = np.where(has_rule, theoretical, np.nan).reshape(len(names), n_resources)
+    ecarts = np.where(has_rule, ecarts, np.nan).reshape(len(names), n_resources)
+
+    columns = {
+        'Ressource': '    ' + resources.cat.categories.astype(str).to_numpy(dtype=object),
+        'Charge JH': np.bincount(resource_codes, weights=charges, minlength=n_resources),
+    }
+    for i, name in enumerate(names):
+        columns[f'Charge Theorique {name}'] = theoretical[i]
+        columns[f'Ecart {name}'] = ecarts[i]
+    resource_rows = pd.DataFrame(columns)
+
+    total_row = resource_rows.drop(columns='Ressource').sum(min_count=1).to_frame().T
+    total_row.insert(0, 'Ressource', 'Total')
+
+    return pd.concat([total_row, resource_rows], ignore_index=True).astype(object)
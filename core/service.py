@@ -0,0 +1,271 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.settings import CACHE_ENABLED, SERVICE_HOST, SERVICE_PORT
+
+
+class SummaryService:
+    """
+    Keeps the deployments lookup warm and runs summary jobs in a process pool.
+
+    The deployments file is re-read when its modification time changes; the worker
+    pool is then replaced, letting jobs already submitted finish on the old one.
+    """
+
+    def __init__(self, deployments_file, workers=None, use_cache=CACHE_ENABLED, sheet_pattern=None,
+                 match_mode='exact', diagnostics=False, capacity_plan=None, history_store=None, drilldown=False):
+        """
+        Args:
+            deployments_file (str): Path to the deployments file
+            workers (int): Number of worker processes (defaults to the number of CPUs)
+            use_cache (bool): Whether to use the cache of parsed files
+            sheet_pattern (str): Pattern of the timesheet sheets to read, or None for the first sheet only
+            match_mode (str): How project names are matched: 'exact', 'normalized' or 'fuzzy'
+            diagnostics (bool): Whether to add a Diagnostics sheet of the data checks to each summary
+            capacity_plan (CapacityPlan): Resource capacities, to add the capacity sheet; or None
+            history_store (HistoryStore): Store recording the summary rows of each job, or None
+            drilldown (bool): Whether to add the per-project, per-level and per-phase sheets
+        """
+        self.deployments_file = os.path.abspath(deployments_file)
+        self.workers = workers
+        self.use_cache = use_cache
+        self.sheet_pattern = sheet_pattern
+        self.match_mode = match_mode
+        self.diagnostics = diagnostics
+        self.capacity_plan = capacity_plan
+        self.history_store = history_store
+        self.drilldown = drilldown
+
+        self.lookup_df = None
+        self.loaded_mtime = None
+        self.loaded_at = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+        # The pipeline modules are imported here rather than at module level,
+        # so that the submit client does not load pandas
+        from config.rules import get_charge_table
+
+        # Compile the theoretical charge table once for the whole service
+        get_charge_table()
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reload the deployments lookup if the file changed since it was loaded.
+
+        If the file cannot be read (missing, or still being written), the error is
+        raised and the previous lookup and worker pool are kept.
+
+        Returns:
+            bool: True if the lookup was (re)loaded
+        """
+        from core.batch import init_worker
+        from core.cache import DataFrameCache
+        from core.pipeline import read_lookup_table
+
+        with self._lock:
+            mtime = os.stat(self.deployments_file).st_mtime_ns
+            if mtime == self.loaded_mtime:
+                return False
+
+            cache = DataFrameCache() if self.use_cache else None
+            print(f"Loading deployments data from '{self.deployments_file}'...")
+            deployment_issues = None
+            if self.diagnostics:
+                lookup_df, deployment_issues = read_lookup_table(
+                    self.deployments_file, cache=cache, verbose=True, check=True
+                )
+            else:
+                lookup_df = read_lookup_table(self.deployments_file, cache=cache, verbose=True)
+            self.lookup_df = lookup_df
+            self.loaded_mtime = mtime
+            self.loaded_at = time.time()
+
+            old_pool = self._pool
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=init_worker,
+                initargs=(
+                    self.lookup_df, self.use_cache, self.sheet_pattern, self.match_mode, deployment_issues,
+                    self.capacity_plan, self.history_store, self.drilldown
+                )
+            )
+            if old_pool is not None:
+                old_pool.shutdown(wait=False)
+            return True
+
+    def run_job(self, timesheet_file, output_file=None):
+        """
+        Summarize one timesheet with the current deployments lookup.
+
+        Args:
+            timesheet_file (str): Path to the timesheet file
+            output_file (str): Path of the summary, or None to write it next to the timesheet
+
+        Returns:
+            dict: Output path, row count, elapsed seconds and error message (or None)
+        """
+        from core.batch import get_output_path, process_file
+
+        self.refresh()
+        output_file = output_file or get_output_path(timesheet_file)
+
+        with self._lock:
+            future = self._pool.submit(process_file, timesheet_file, output_file)
+        return future.result()
+
+    def status(self):
+        """
+        Describe the loaded deployments lookup.
+
+        Returns:
+            dict: Deployments file, number of projects and load time
+        """
+        return {
+            'status': 'ok',
+            'deployments': self.deployments_file,
+            'projects': len(self.lookup_df),
+            'loaded_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.loaded_at))
+        }
+
+    def shutdown(self):
+        """
+        Stop the worker pool, waiting for running jobs.
+        """
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+def serve(service, host=SERVICE_HOST, port=SERVICE_PORT):
+    """
+    Serve summary jobs over HTTP on a local address until interrupted.
+
+    Endpoints:
+        GET  /status   Loaded deployments information
+        POST /summary  JSON body {"timesheet": path, "output": optional path}
+
+    Args:
+        service (SummaryService): The service running the jobs
+        host (str): Address to listen on
+        port (int): Port to listen on
+    """
+
+    class SummaryRequestHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path != '/status':
+                self._send_json(404, {'error': f"Unknown path {self.path}"})
+                return
+            if self._refresh():
+                self._send_json(200, service.status())
+
+        def do_POST(self):
+            if self.path != '/summary':
+                self._send_json(404, {'error': f"Unknown path {self.path}"})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                job = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(job, dict):
+                    raise ValueError("The JSON body is not an object")
+                timesheet_file = job['timesheet']
+                output_file = job.get('output')
+                if not isinstance(timesheet_file, str) or not isinstance(output_file, (str, type(None))):
+                    raise ValueError("The paths are not strings")
+            except (ValueError, KeyError):
+                self._send_json(400, {'error': "Expected a JSON body with a 'timesheet' path"})
+                return
+
+            if not os.path.exists(timesheet_file):
+                self._send_json(404, {'error': f"File not found: {timesheet_file}"})
+                return
+
+            if not self._refresh():
+                return
+            try:
+                result = service.run_job(timesheet_file, output_file)
+            except Exception as e:
+                self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+                return
+            self._send_json(200 if result['error'] is None else 500, result)
+
+        def _refresh(self):
+            """
+            Reload the deployments if they changed, answering 503 if they cannot be read.
+
+            Returns:
+                bool: True if the service can run jobs
+            """
+            try:
+                service.refresh()
+            except Exception as e:
+                # The previous lookup is kept; the file is read again on the next request
+                self.log_message("Could not load '%s': %s: %s", service.deployments_file, type(e).__name__, e)
+                self._send_json(503, {
+                    'error': f"Could not load the deployments file: {type(e).__name__}: {e}"
+                })
+                return False
+            return True
+
+        def log_message(self, format, *args):
+            print(f"[{self.log_date_time_string()}] {format % args}")
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), SummaryRequestHandler)
+    print(f"Serving summary jobs on http://{host}:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+def submit_job(timesheet_file, output_file=None, host=SERVICE_HOST, port=SERVICE_PORT):
+    """
+    Submit a summary job to a running service and wait for its result.
+
+    Args:
+        timesheet_file (str): Path to the timesheet file
+        output_file (str): Path of the summary, or None to write it next to the timesheet
+        host (str): Address of the service
+        port (int): Port of the service
+
+    Returns:
+        dict: The job result, with an 'error' message on failure
+    """
+    job = {'timesheet': os.path.abspath(timesheet_file)}
+    if output_file:
+        job['output'] = os.path.abspath(output_file)
+
+    request = urllib.request.Request(
+        f"http://{host}:{port}/summary",
+        data=json.dumps(job).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read() or b'{}') or {'error': str(e)}
+    except urllib.error.URLError as e:
+        return {'error': f"Could not reach the service at {host}:{port}: {e.reason}"}
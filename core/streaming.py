@@ -0,0 +1,112 @@
+import pandas as pd
+
+from config.settings import COLUMN_ALIASES, DEFAULT_CHUNK_SIZE, TIMESHEET_COLUMNS
+from core.data_processor import DataProcessor
+from core.excel_handler import ExcelHandler
+from core.file_handler import FileHandler
+from core.validation import DataValidator
+from utils.instrumentation import instrumented
+
+# Number of partial aggregates kept before they are merged together
+MAX_PENDING_PARTIALS = 8
+
+KEY_COLUMNS = ['Ressource', 'Projet']
+
+
+def iter_timesheet_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read a timesheet file as a stream of chunks holding only the needed columns.
+
+    Args:
+        file_path (str): Path to the timesheet file (Excel, CSV or Parquet)
+        chunk_size (int): Number of rows per chunk
+
+    Yields:
+        pandas.DataFrame: Consecutive chunks, with canonical column names
+    """
+    file_format = FileHandler.get_format(file_path)
+
+    if file_format == 'csv':
+        wanted = set(TIMESHEET_COLUMNS)
+        reader = pd.read_csv(
+            file_path,
+            usecols=lambda column: column in wanted or COLUMN_ALIASES.get(column) in wanted,
+            chunksize=chunk_size,
+            encoding='utf-8-sig'
+        )
+        for chunk in reader:
+            yield FileHandler.normalize_columns(chunk)
+    elif file_format == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(file_path)
+        columns = [
+            column for column in parquet_file.schema_arrow.names
+            if column in TIMESHEET_COLUMNS or COLUMN_ALIASES.get(column) in TIMESHEET_COLUMNS
+        ]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield FileHandler.normalize_columns(batch.to_pandas())
+    else:
+        yield from ExcelHandler.iter_excel_chunks(file_path, TIMESHEET_COLUMNS, chunk_size)
+
+
+def aggregate_chunks(chunks):
+    """
+    Reduce a stream of timesheet chunks to Charge JH by resource and project.
+
+    Each chunk is reduced to partial sums as soon as it is read, and partial sums are
+    merged regularly, so memory grows with the number of distinct (resource, project)
+    pairs rather than with the number of rows. The hours of each chunk are coerced to
+    numbers by DataValidator.check_timesheet.
+
+    Args:
+        chunks (iterable): Timesheet DataFrames with 'Ressource', 'Projet' and 'Soumise (h)'
+
+    Returns:
+        tuple: (pandas.DataFrame, int) - The pivot table, equal to the in-memory
+            ExcelHandler.create_pivot_table result, and the number of rows read
+
+    Raises:
+        ValueError: If a chunk lacks required columns
+    """
+    partials = []
+    row_count = 0
+
+    for chunk in chunks:
+        # All chunks share the header of the file, checking the first one is enough
+        if not partials:
+            is_valid, missing_columns = DataProcessor.validate_dataframe(chunk, TIMESHEET_COLUMNS)
+            if not is_valid:
+                raise ValueError(f"Missing required columns: {missing_columns}")
+
+        # Text hours are parsed, unparsable ones are left out of the sums
+        chunk, _ = DataValidator.check_timesheet(chunk)
+        row_count += len(chunk)
+        partials.append(DataProcessor.aggregate_charge(chunk))
+
+        if len(partials) >= MAX_PENDING_PARTIALS:
+            partials = [_merge_partials(partials)]
+
+    return _merge_partials(partials).reset_index(), row_count
+
+
+@instrumented
+def aggregate_file(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Aggregate a timesheet file too large to be loaded at once.
+
+    Args:
+        file_path (str): Path to the timesheet file (Excel, CSV or Parquet)
+        chunk_size (int): Number of rows read at a time
+
+    Returns:
+        tuple: (pandas.DataFrame, int) - The pivot table and the number of rows read
+    """
+    return aggregate_chunks(iter_timesheet_chunks(file_path, chunk_size))
+
+
+def _merge_partials(partials):
+    if not partials:
+        return pd.DataFrame(columns=KEY_COLUMNS + ['Charge JH']).set_index(KEY_COLUMNS)
+
+    merged = pd.concat(partials)
+    return merged.groupby(level=KEY_COLUMNS, observed=True).sum()
@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+
+from config.rules import get_charge_table
+from config.settings import DEPLOYMENT_KEY_COLUMN, MAX_DIAGNOSTIC_ROWS, MAX_SUBMITTED_HOURS
+from utils.instrumentation import instrumented
+
+DIAGNOSTICS_COLUMNS = ['Controle / Ligne', 'Lignes en erreur', 'Fichier', 'Colonne', 'Valeur', 'Ressource', 'Projet']
+
+
+class DataValidator:
+    """
+    Runs the data-quality checks of the timesheet and deployments files.
+
+    Each check is a boolean mask computed over whole columns; on categorical
+    columns it is evaluated once per distinct value and spread to the rows
+    through the category codes. Checks report the offending rows, they do not
+    remove them.
+    """
+
+    @staticmethod
+    @instrumented
+    def check_timesheet(df):
+        """
+        Coerce 'Soumise (h)' to numbers and check the timesheet rows.
+
+        Text hours are parsed, accepting a decimal comma; values that cannot be
+        parsed become missing and are therefore left out of the sums.
+
+        Args:
+            df (pandas.DataFrame): The timesheet data
+
+        Returns:
+            tuple: (pandas.DataFrame, list) - The timesheet with numeric hours, and
+                one issue dict per failed check
+        """
+        raw_hours = df['Soumise (h)']
+        hours = DataValidator._coerce_numbers(raw_hours)
+        if hours is not raw_hours:
+            df = df.assign(**{'Soumise (h)': hours})
+
+        masks = {
+            ('Soumise (h) non numerique', 'Soumise (h)'): hours.isna().to_numpy() & raw_hours.notna().to_numpy(),
+            ('Soumise (h) manquante', 'Soumise (h)'): raw_hours.isna().to_numpy(),
+            ('Soumise (h) negative', 'Soumise (h)'): (hours < 0).to_numpy(),
+            (f'Soumise (h) superieure a {MAX_SUBMITTED_HOURS:g}', 'Soumise (h)'): (
+                hours > MAX_SUBMITTED_HOURS
+            ).to_numpy(),
+            ('Ressource vide', 'Ressource'): DataValidator._blank_mask(df['Ressource']),
+            ('Projet vide', 'Projet'): DataValidator._blank_mask(df['Projet']),
+        }
+
+        issues = [
+            DataValidator._make_issue(
+                df, mask, rule, 'Feuille de temps', column, 'Ressource', 'Projet',
+                # Report the hours as they were read, before coercion
+                values=raw_hours if column == 'Soumise (h)' else None
+            )
+            for (rule, column), mask in masks.items()
+            if mask.any()
+        ]
+        return df, issues
+
+    @staticmethod
+    @instrumented
+    def check_deployments(deployments_df, key_column=DEPLOYMENT_KEY_COLUMN):
+        """
+        Check the deployments rows against THEORETICAL_CHARGE_RULES.
+
+        Connection levels and phases must be keys of the rules (aliases included),
+        and each project should be listed once.
+
+        Args:
+            deployments_df (pandas.DataFrame): The deployments data
+            key_column (str): The column holding the project name
+
+        Returns:
+            list: One issue dict per failed check
+        """
+        levels, phases, _ = get_charge_table()
+        names = deployments_df[key_column]
+        blank_names = DataValidator._blank_mask(names)
+
+        masks = {
+            ('Nom vide', key_column): blank_names,
+            ('Projet en double', key_column): names.duplicated(keep=False).to_numpy() & ~blank_names,
+        }
+        for column, known, missing_rule, unknown_rule in [
+            ('Niveau de connexion', levels, 'Niveau de connexion manquant', 'Niveau de connexion inconnu'),
+            ('Phase du projet', phases, 'Phase du projet manquante', 'Phase du projet inconnue'),
+        ]:
+            if column not in deployments_df.columns:
+                continue
+            values = deployments_df[column]
+            blank = DataValidator._blank_mask(values)
+            masks[(missing_rule, column)] = blank
+            masks[(unknown_rule, column)] = ~blank & ~DataValidator._category_mask(values, lambda v: v.isin(known))
+
+        return [
+            DataValidator._make_issue(deployments_df, mask, rule, 'Deploiements', column, None, key_column)
+            for (rule, column), mask in masks.items()
+            if mask.any()
+        ]
+
+    @staticmethod
+    def format_diagnostics(issues):
+        """
+        Build the Diagnostics sheet: one bold row per check with its count of
+        offending rows, followed by the first offending rows, indented.
+
+        Args:
+            issues (list): Issue dicts from check_timesheet and check_deployments
+
+        Returns:
+            pandas.DataFrame: The diagnostics, empty when every check passed
+        """
+        frames = []
+        for issue in issues:
+            frames.append(pd.DataFrame([{
+                'Controle / Ligne': issue['rule'],
+                'Lignes en erreur': issue['count'],
+                'Fichier': issue['source'],
+                'Colonne': issue['column'],
+            }]))
+            frames.append(issue['rows'])
+
+        if not frames:
+            return pd.DataFrame(columns=DIAGNOSTICS_COLUMNS)
+
+        return pd.concat(frames, ignore_index=True).reindex(columns=DIAGNOSTICS_COLUMNS).astype(object)
+
+    @staticmethod
+    def describe_issues(issues):
+        """
+        Summarize issues in one line, e.g. "Ressource vide: 3, Projet en double: 2".
+
+        Args:
+            issues (list): Issue dicts from check_timesheet and check_deployments
+
+        Returns:
+            str: The summary, or an empty string when every check passed
+        """
+        return ", ".join(f"{issue['rule']}: {issue['count']:,}" for issue in issues)
+
+    @staticmethod
+    def _make_issue(df, mask, rule, source, column, resource_column, project_column, values=None):
+        """
+        Describe the rows of a failed check, keeping at most MAX_DIAGNOSTIC_ROWS of them.
+
+        The reported value is taken from `values`, or from the checked column by default.
+        """
+        if values is None:
+            values = df[column]
+        positions = np.flatnonzero(mask)
+        shown = positions[:MAX_DIAGNOSTIC_ROWS]
+
+        # Row numbers in the source sheet, after its header row
+        if 'Feuille source' in df.columns:
+            sheets = df['Feuille source']
+            row_numbers = sheets.groupby(sheets, observed=True).cumcount().to_numpy()[shown] + 2
+            sheet_names = sheets.iloc[shown].astype(str).to_numpy(dtype=object)
+            labels = '    ' + sheet_names + ', ligne ' + row_numbers.astype(str)
+        else:
+            labels = '    Ligne ' + (shown + 2).astype(str).astype(object)
+
+        rows = pd.DataFrame({
+            'Controle / Ligne': labels,
+            'Valeur': values.iloc[shown].astype(object).to_numpy(),
+            'Ressource': df[resource_column].iloc[shown].astype(object).to_numpy() if resource_column else None,
+            'Projet': df[project_column].iloc[shown].astype(object).to_numpy(),
+        })
+        return {'rule': rule, 'source': source, 'column': column, 'count': len(positions), 'rows': rows}
+
+    @staticmethod
+    def _coerce_numbers(values):
+        """
+        Convert a column to float64, parsing text numbers with a decimal point or comma.
+        """
+        if pd.api.types.is_numeric_dtype(values):
+            return values
+
+        numbers = pd.to_numeric(values, errors='coerce')
+        retry = numbers.isna() & values.notna()
+        if retry.any():
+            text = values[retry].astype(str).str.strip().str.replace(',', '.', regex=False)
+            numbers[retry] = pd.to_numeric(text, errors='coerce')
+
+        return numbers.astype('float64')
+
+    @staticmethod
+    def _blank_mask(values):
+        """
+        Mask of the missing or whitespace-only values of a column.
+        """
+        return values.isna().to_numpy() | DataValidator._category_mask(
+            values, lambda v: v.astype(str).str.strip() == ''
+        )
+
+    @staticmethod
+    def _category_mask(values, predicate):
+        """
+        Evaluate a predicate once per distinct value and spread it to the rows.
+
+        Missing values get False.
+        """
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype('category')
+
+        categories = pd.Series(values.cat.categories.to_numpy(dtype=object))
+        category_mask = np.append(np.asarray(predicate(categories), dtype=bool), False)
+
+        # Code -1 (missing) picks the trailing False
+        return category_mask[values.cat.codes.to_numpy()]
@@ -0,0 +1,255 @@
+import os
+import time
+
+from config.settings import CACHE_ENABLED, WATCH_DEBOUNCE, WATCH_INTERVAL
+from core.batch import collect_input_files, find_output_collisions, get_output_path
+from core.pipeline import create_matcher, process_timesheet, read_lookup_table
+
+
+def file_signature(file_path):
+    """
+    Get the (modification time, size) of a file, or None if it does not exist.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        tuple: (int, int) - Modification time in nanoseconds and size in bytes, or None
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FolderWatcher:
+    """
+    Regenerates timesheet summaries when their files change.
+
+    The watched paths are polled every interval. A changed file is only processed
+    once its size and modification time have stayed the same for the debounce delay,
+    so that exports still being written are not read half-way. A changed timesheet
+    regenerates its own summary; a changed deployments file is reloaded and
+    regenerates every summary. The deployments lookup stays in memory between changes.
+    """
+
+    def __init__(self, deployments_file, inputs, output_dir=None, output_format='xlsx', sheet_pattern=None,
+                 match_mode='exact', capacity_plan=None, history_store=None, drilldown=False,
+                 interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE, use_cache=CACHE_ENABLED):
+        """
+        Args:
+            deployments_file (str): Path to the deployments file
+            inputs (list): Timesheet files, directories or glob patterns, scanned again at every poll
+            output_dir (str): Directory for the summaries, or None to write next to each input
+            output_format (str): Format of the summaries ('xlsx', 'csv' or 'parquet')
+            sheet_pattern (str): Pattern of the timesheet sheets to read, or None for the first sheet only
+            match_mode (str): How project names are matched: 'exact', 'normalized' or 'fuzzy'
+            capacity_plan (CapacityPlan): Resource capacities, to add the capacity sheet; or None
+            history_store (HistoryStore): Store recording the summary rows of each file, or None
+            drilldown (bool): Whether to add the per-project, per-level and per-phase sheets
+            interval (float): Seconds between two polls
+            debounce (float): Seconds a changed file must stay unchanged before it is processed
+            use_cache (bool): Whether to use the cache of project name matches
+        """
+        self.deployments_file = os.path.normpath(deployments_file)
+        self.inputs = inputs
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.sheet_pattern = sheet_pattern
+        self.match_mode = match_mode
+        self.capacity_plan = capacity_plan
+        self.history_store = history_store
+        self.drilldown = drilldown
+        self.interval = interval
+        self.debounce = debounce
+        self.use_cache = use_cache
+
+        self.lookup_df = None
+        self.matcher = None
+
+        # Signature of each file as last processed, and the changes waiting to settle:
+        # {path: (signature, first seen at, last changed at)}
+        self.processed = {}
+        self.pending = {}
+
+        # Timesheets skipped because they share their summary path with another one
+        self.collisions = []
+
+    def scan(self):
+        """
+        Get the current signature of the deployments file and of every watched timesheet.
+
+        Returns:
+            dict: Mapping of file path to (modification time, size)
+        """
+        timesheets = [
+            input_file for input_file in collect_input_files(self.inputs) if input_file != self.deployments_file
+        ]
+
+        # Timesheets that would overwrite each other's summary are left out, reported once
+        collisions = find_output_collisions({input_file: self._output_path(input_file) for input_file in timesheets})
+        if collisions != self.collisions:
+            for inputs in collisions:
+                self._log(f"Skipping timesheets sharing the same summary file, rename or separate them: "
+                          f"{', '.join(inputs)}")
+            self.collisions = collisions
+        skipped = {input_file for inputs in collisions for input_file in inputs}
+
+        files = [self.deployments_file] + [input_file for input_file in timesheets if input_file not in skipped]
+        signatures = {file_path: file_signature(file_path) for file_path in files}
+        return {file_path: signature for file_path, signature in signatures.items() if signature is not None}
+
+    def start(self):
+        """
+        Load the deployments lookup and find the summaries that are missing or out of date.
+
+        Up-to-date summaries are marked as processed; the others are queued like changed files.
+        """
+        self.processed[self.deployments_file] = file_signature(self.deployments_file)
+        self.load_deployments()
+        now = time.time()
+
+        for file_path, signature in self.scan().items():
+            if file_path == self.deployments_file:
+                continue
+
+            output_signature = file_signature(self._output_path(file_path))
+            inputs_mtime = max(signature[0], self.processed[self.deployments_file][0])
+            if output_signature is not None and output_signature[0] >= inputs_mtime:
+                self.processed[file_path] = signature
+            else:
+                self.pending[file_path] = (signature, now, now - self.debounce)
+
+    def poll(self, now=None):
+        """
+        Scan the watched files once and process the changes that have settled.
+
+        Args:
+            now (float): Current time (time.time()), defaults to the actual time
+
+        Returns:
+            list: Result dict of each summary regenerated
+        """
+        now = time.time() if now is None else now
+        signatures = self.scan()
+
+        for file_path in list(self.processed):
+            if file_path not in signatures and file_path != self.deployments_file:
+                del self.processed[file_path]
+        for file_path in list(self.pending):
+            if file_path not in signatures:
+                del self.pending[file_path]
+
+        settled = []
+        for file_path, signature in signatures.items():
+            if signature == self.processed.get(file_path):
+                self.pending.pop(file_path, None)
+                continue
+
+            if file_path not in self.pending:
+                self.pending[file_path] = (signature, now, now)
+                continue
+
+            pending_signature, first_seen, last_changed = self.pending[file_path]
+            if signature != pending_signature:
+                # Still being written: restart the debounce delay
+                self.pending[file_path] = (signature, first_seen, now)
+            elif now - last_changed >= self.debounce:
+                settled.append((file_path, signature, first_seen))
+
+        results = []
+        deployments_change = [change for change in settled if change[0] == self.deployments_file]
+        if deployments_change:
+            _, signature, first_seen = deployments_change[0]
+            del self.pending[self.deployments_file]
+            self.processed[self.deployments_file] = signature
+            try:
+                self.load_deployments()
+            except Exception as e:
+                # Keep the previous lookup until the file changes again
+                self._log(f"FAILED '{self.deployments_file}': {type(e).__name__}: {e}")
+                return results
+
+            # Every summary depends on the deployments: regenerate them all, except the
+            # timesheets still being written, which are processed once they settle
+            settled_files = {change[0] for change in settled}
+            settled = [
+                (file_path, signatures[file_path], first_seen) for file_path in signatures
+                if file_path != self.deployments_file and (file_path not in self.pending or file_path in settled_files)
+            ]
+
+        for file_path, signature, first_seen in settled:
+            self.pending.pop(file_path, None)
+            results.append(self.regenerate(file_path, first_seen))
+            # A failed file is not retried until it changes again
+            self.processed[file_path] = signature
+
+        return results
+
+    def load_deployments(self):
+        """
+        Read the deployments file and build the lookup table and project name matcher.
+        """
+        self._log(f"Loading deployments data from '{self.deployments_file}'...")
+        self.lookup_df = read_lookup_table(self.deployments_file)
+        self.matcher = create_matcher(self.lookup_df, self.match_mode, self.use_cache)
+
+    def regenerate(self, input_file, detected_at):
+        """
+        Regenerate the summary of one timesheet, logging the latency since its change was detected.
+
+        Args:
+            input_file (str): Path to the timesheet file
+            detected_at (float): Time (time.time()) the change was first seen
+
+        Returns:
+            dict: File name, output path, row count, processing and total seconds, and error message (or None)
+        """
+        output_file = self._output_path(input_file)
+        start_time = time.time()
+        result = {'input': input_file, 'output': output_file, 'rows': None, 'error': None}
+
+        try:
+            result['rows'] = process_timesheet(
+                input_file, self.lookup_df, output_file, sheet_pattern=self.sheet_pattern, matcher=self.matcher,
+                capacity_plan=self.capacity_plan, history_store=self.history_store, drilldown=self.drilldown
+            )
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+
+        end_time = time.time()
+        result['seconds'] = end_time - start_time
+        result['latency'] = end_time - detected_at
+
+        if result['error'] is None:
+            self._log(
+                f"Updated '{output_file}' ({result['rows']:,} rows): {result['latency']:.1f}s after the change "
+                f"was detected, {result['seconds']:.2f}s processing"
+            )
+        else:
+            self._log(f"FAILED '{input_file}': {result['error']}")
+        return result
+
+    def run(self):
+        """
+        Poll the watched files until interrupted (Ctrl+C).
+        """
+        self.start()
+        self._log(
+            f"Watching {len(self.processed) + len(self.pending) - 1} timesheet(s) and '{self.deployments_file}' "
+            f"every {self.interval:g}s (Ctrl+C to stop)"
+        )
+        try:
+            while True:
+                self.poll()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            self._log("Stopping...")
+
+    def _output_path(self, input_file):
+        return get_output_path(input_file, self.output_dir, self.output_format)
+
+    @staticmethod
+    def _log(message):
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}")
@@ -1,6 +1,6 @@
+import argparse
 import os
 import sys
-import pandas as pd
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
 
@@ -8,16 +8,42 @@ warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
-from core.excel_handler import ExcelHandler
-from core.data_processor import DataProcessor
+# The core modules import pandas, which takes most of the startup time: they are
+# imported inside the functions that need them, so that --help and argument
+# errors are answered without loading pandas.
 from utils.helpers import get_user_file_path, get_default_output_path
+from utils.instrumentation import tracer
+from config.settings import (
+    CACHE_DIR, CACHE_ENABLED, CAPACITY_TOP_N, DEFAULT_CHUNK_SIZE, HISTORY_ENABLED, HISTORY_FILE, SERVICE_PORT,
+    TIMESHEET_COLUMNS, WATCH_DEBOUNCE, WATCH_INTERVAL
+)
 
 
-def main():
-    """Main entry point for the application."""
+def main(use_cache=CACHE_ENABLED, sheet_pattern=None, match_mode='exact', match_report_file=None,
+         diagnostics=False, capacity_plan=None, history_store=None, drilldown=False):
+    """
+    Interactive entry point for the application.
+
+    Args:
+        use_cache (bool): Whether to use the cache of parsed files
+        sheet_pattern (str): Pattern of the timesheet sheets to read, or None for the first sheet only
+        match_mode (str): How project names are matched: 'exact', 'normalized' or 'fuzzy'
+        match_report_file (str): Path where the name matching report is written, or None
+        diagnostics (bool): Whether to add a Diagnostics sheet of the data checks to the output
+        capacity_plan (CapacityPlan): Resource capacities, to add the capacity sheet; or None
+        history_store (HistoryStore): Store recording the summary rows, or None
+        drilldown (bool): Whether to add the per-project, per-level and per-phase sheets
+    """
     print("\nExcel Resource Summary Generator")
     print("===============================")
 
+    from core.cache import DataFrameCache
+    from core.data_processor import DataProcessor
+    from core.excel_handler import ExcelHandler
+    from core.file_handler import FileHandler
+    from core.pipeline import create_matcher, read_lookup_table, read_timesheet, summarize_sheets
+    from core.validation import DataValidator
+
     try:
         # Get input file path from user
         input_file = get_user_file_path("\nEnter the path to your Excel file with resource data: ")
@@ -25,43 +51,37 @@ def main():
         # Get deployments file path from user
         deployments_file = get_user_file_path("\nEnter the path to your deployments Excel file: ")
 
-        # Read the input Excel files
+        cache = DataFrameCache() if use_cache else None
+
+        # Read the input Excel files, loading only the columns the pipeline needs
         print(f"\nReading data from '{input_file}'...")
-        df = ExcelHandler.read_excel(input_file)
+        df = read_timesheet(input_file, cache=cache, verbose=True, sheet_pattern=sheet_pattern)
 
         print(f"Reading deployments data from '{deployments_file}'...")
-        deployments_df = ExcelHandler.read_excel(deployments_file)
+        lookup_df, deployment_issues = read_lookup_table(deployments_file, cache=cache, verbose=True, check=True)
 
         # Validate the required columns
         print("Validating input data...")
-        required_columns = ['Ressource', 'Projet', 'Soumise (h)']
-        is_valid, missing_columns = DataProcessor.validate_dataframe(df, required_columns)
+        is_valid, missing_columns = DataProcessor.validate_dataframe(df, TIMESHEET_COLUMNS)
 
         if not is_valid:
             print(f"Error: The following required columns are missing: {missing_columns}")
             print(f"Available columns: {df.columns.tolist()}")
             return
 
-        # Fix column names if needed (Resource vs Ressource)
-        if 'Ressource' not in df.columns and 'Resource' in df.columns:
-            df.rename(columns={'Resource': 'Ressource'}, inplace=True)
-
-        # Create lookup dictionaries
-        print("Creating lookup tables for project information...")
-        connection_dict = DataProcessor.create_connection_dict(deployments_df, 'Niveau de connexion')
-        phase_dict = DataProcessor.create_connection_dict(deployments_df, 'Phase du projet')
-
-        # Calculate Charge JH
-        print("Calculating 'Charge JH' (Soumise (h) / 8)...")
-        df = DataProcessor.calculate_charge_jh(df)
+        # Check the rows: hours are coerced to numbers, offending rows are reported
+        df, issues = DataValidator.check_timesheet(df)
+        if issues:
+            print(f"Timesheet data checks: {DataValidator.describe_issues(issues)}")
 
-        # Create pivot table
-        print("Creating pivot table...")
-        pivot_df = ExcelHandler.create_pivot_table(df, 'Charge JH', ['Ressource', 'Projet'])
-
-        # Format the resource summary with theoretical charge
-        print("Formatting output data and calculating theoretical charges...")
-        result_df = DataProcessor.format_resource_summary(pivot_df, connection_dict, phase_dict)
+        matcher = create_matcher(lookup_df, match_mode, use_cache)
+        sheets = summarize_sheets(
+            df, lookup_df, verbose=True, matcher=matcher, match_report_file=match_report_file,
+            capacity_plan=capacity_plan, history_store=history_store, source=os.path.basename(input_file),
+            drilldown=drilldown
+        )
+        if diagnostics:
+            sheets['Diagnostics'] = DataValidator.format_diagnostics(deployment_issues + issues)
 
         # Get output file path
         default_output = get_default_output_path(input_file, "_resource_summary")
@@ -73,9 +93,9 @@ def main():
         if not output_file.strip():
             output_file = default_output
 
-        # Write to Excel
+        # Write the summary (formatted workbook, or plain CSV/Parquet data)
         print(f"\nWriting results to '{output_file}'...")
-        ExcelHandler.write_excel(result_df, output_file, 'Resource Summary')
+        FileHandler.write_tables(sheets, output_file)
 
         print(f"\nSuccess! Results saved to {output_file}")
 
@@ -93,5 +113,656 @@ def main():
     input("\nPress Enter to exit...")
 
 
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Excel Resource Summary Generator. Run without arguments for interactive mode."
+    )
+    parser.add_argument('--no-cache', action='store_true', help="do not use the cache of parsed files")
+    parser.add_argument('--clear-cache', action='store_true', help="empty the cache of parsed files first")
+    parser.add_argument('--sheets', metavar='PATTERN',
+                        help="read and concatenate every timesheet sheet matching PATTERN ('*' for all) "
+                             "instead of only the first sheet")
+    parser.add_argument('--match-names', choices=['exact', 'normalized', 'fuzzy'], default='exact',
+                        help="how timesheet projects are matched to deployments names: exact (default), "
+                             "normalized (ignoring case, accents and spacing) or fuzzy (also close spellings)")
+    parser.add_argument('--match-report', metavar='FILE',
+                        help="write the project name matching report to FILE (.xlsx, .csv or .parquet)")
+    parser.add_argument('--diagnostics', action='store_true',
+                        help="add a Diagnostics sheet listing the rows that fail the data checks "
+                             "(interactive, batch and serve modes)")
+    parser.add_argument('--capacity', metavar='JH_OR_FILE',
+                        help="add a Capacite sheet comparing each resource's charge with its capacity: "
+                             "a number of JH shared by every resource, or a file with 'Ressource' and "
+                             "'Capacite JH' columns (interactive, batch, watch, serve, stream and incremental "
+                             "modes)")
+    parser.add_argument('--top', type=int, default=CAPACITY_TOP_N,
+                        help=f"number of over-allocated resources and projects listed (default: {CAPACITY_TOP_N})")
+    parser.add_argument('--drilldown', action='store_true',
+                        help="add the Par Projet (project -> resources), Par Niveau and Par Phase (connection "
+                             "level or phase -> projects) sheets (interactive, batch, watch, serve, stream "
+                             "and incremental modes)")
+    parser.add_argument('--history-period', metavar='PERIOD',
+                        help="period under which the summary rows are recorded in the history, "
+                             "e.g. 2024-01 (default: the current month)")
+    parser.add_argument('--no-history', action='store_true',
+                        help="do not record the summary rows in the history")
+    parser.add_argument('--timings', action='store_true', help="print the time spent in each stage at the end")
+    parser.add_argument('--memory', action='store_true',
+                        help="also measure the Python memory peak of each stage (slower)")
+    parser.add_argument('--trace', metavar='FILE', help="write the stage measurements to a JSON file")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="save cProfile statistics of the slowest stage to FILE")
+    subparsers = parser.add_subparsers(dest='command')
+    deployments_help = "deployments file (Excel, CSV or Parquet)"
+    output_help = "output file, .xlsx, .csv or .parquet (default: next to the input)"
+
+    batch_parser = subparsers.add_parser('batch', help="summarize many timesheet files non-interactively")
+    batch_parser.add_argument('-d', '--deployments', required=True, help=deployments_help)
+    batch_parser.add_argument('inputs', nargs='+', help="timesheet files, directories or glob patterns")
+    batch_parser.add_argument('-o', '--output-dir', help="directory for the summaries (default: next to each input)")
+    batch_parser.add_argument('-w', '--workers', type=int, default=None,
+                              help="number of worker processes (default: number of CPUs)")
+    batch_parser.add_argument('-f', '--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx',
+                              help="format of the summaries (default: xlsx)")
+
+    consolidate_parser = subparsers.add_parser(
+        'consolidate', help="build one summary over several periods (e.g. the months of a quarter)"
+    )
+    consolidate_parser.add_argument('-d', '--deployments', required=True, help=deployments_help)
+    consolidate_parser.add_argument('-p', '--period', action='append', default=[], metavar='PERIOD=FILE',
+                                    help="timesheet file of a period, e.g. 2024-01=january.xlsx (repeatable)")
+    consolidate_parser.add_argument('-o', '--output', required=True, help="output file (.xlsx, .csv or .parquet)")
+    consolidate_parser.add_argument('-s', '--state',
+                                    help="file keeping the period aggregates between runs; "
+                                         "periods already stored there are not read again")
+    consolidate_parser.add_argument('--refresh', action='store_true',
+                                    help="re-aggregate the given periods even if they are already stored")
+
+    incremental_parser = subparsers.add_parser(
+        'incremental', help="update a summary from the rows appended to a timesheet since the last run"
+    )
+    incremental_parser.add_argument('-d', '--deployments', required=True, help=deployments_help)
+    incremental_parser.add_argument('input', help="timesheet file (Excel, CSV or Parquet)")
+    incremental_parser.add_argument('-o', '--output', help=output_help)
+    incremental_parser.add_argument('-s', '--state',
+                                    help="file keeping the aggregates and watermark (default: next to the input)")
+    incremental_parser.add_argument('--full-rebuild', action='store_true',
+                                    help="ignore the stored state and aggregate every row")
+    incremental_parser.add_argument('--verify', action='store_true',
+                                    help="check the incremental result against a full rebuild")
+
+    stream_parser = subparsers.add_parser(
+        'stream', help="summarize a timesheet too large for memory by aggregating it in chunks"
+    )
+    stream_parser.add_argument('-d', '--deployments', required=True, help=deployments_help)
+    stream_parser.add_argument('input', help="timesheet file (Excel, CSV or Parquet)")
+    stream_parser.add_argument('-o', '--output', help=output_help)
+    stream_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                               help=f"number of rows read at a time (default: {DEFAULT_CHUNK_SIZE})")
+
+    scenario_parser = subparsers.add_parser(
+        'scenario', help="compare the Ecart of each resource under alternative theoretical charge rules"
+    )
+    scenario_parser.add_argument('-d', '--deployments', required=True, help=deployments_help)
+    scenario_parser.add_argument('input', help="timesheet file (Excel, CSV or Parquet)")
+    scenario_parser.add_argument('-r', '--rules', metavar='FILE', action='append', required=True,
+                                 help="JSON or YAML file of rules changed from the built-in ones, shaped like "
+                                      "THEORETICAL_CHARGE_RULES (repeat for several scenarios)")
+    scenario_parser.add_argument('-o', '--output', help="output file, .xlsx, .csv or .parquet "
+                                                        "(default: next to the input)")
+
+    serve_parser = subparsers.add_parser(
+        'serve', help="keep the deployments lookup in memory and serve summary jobs on localhost"
+    )
+    serve_parser.add_argument('-d', '--deployments', required=True, help=deployments_help)
+    serve_parser.add_argument('--port', type=int, default=SERVICE_PORT, help=f"port (default: {SERVICE_PORT})")
+    serve_parser.add_argument('-w', '--workers', type=int, default=None,
+                              help="number of worker processes (default: number of CPUs)")
+
+    submit_parser = subparsers.add_parser('submit', help="send a timesheet to a running 'serve' process")
+    submit_parser.add_argument('input', help="timesheet file (Excel, CSV or Parquet)")
+    submit_parser.add_argument('-o', '--output', help=output_help)
+    submit_parser.add_argument('--port', type=int, default=SERVICE_PORT, help=f"port (default: {SERVICE_PORT})")
+
+    watch_parser = subparsers.add_parser(
+        'watch', help="regenerate the summaries of timesheets, or of all of them when the deployments file changes"
+    )
+    watch_parser.add_argument('-d', '--deployments', required=True, help=deployments_help)
+    watch_parser.add_argument('inputs', nargs='+', help="timesheet files, directories or glob patterns to watch")
+    watch_parser.add_argument('-o', '--output-dir', help="directory for the summaries (default: next to each input)")
+    watch_parser.add_argument('-f', '--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx',
+                              help="format of the summaries (default: xlsx)")
+    watch_parser.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                              help=f"seconds between two scans of the files (default: {WATCH_INTERVAL:g})")
+    watch_parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE,
+                              help=f"seconds a changed file must stay unchanged before it is read "
+                                   f"(default: {WATCH_DEBOUNCE:g})")
+
+    history_parser = subparsers.add_parser(
+        'history', help="query the summary rows recorded by previous runs, without reading any workbook"
+    )
+    history_parser.add_argument('query', choices=['trend', 'top', 'runs'],
+                                help="trend: totals of each period; top: the most negative Ecart of a period; "
+                                     "runs: the recorded runs")
+    history_parser.add_argument('-r', '--resource', help="trend of this resource only")
+    history_parser.add_argument('-p', '--project', help="trend of this project only")
+    history_parser.add_argument('--last', type=int, help="trend of the last LAST periods only")
+    history_parser.add_argument('--period', help="period ranked by top (default: the most recent one)")
+    history_parser.add_argument('--by', choices=['ressource', 'projet'], default='ressource',
+                                help="rank resources (default) or projects")
+    history_parser.add_argument('-n', type=int, default=CAPACITY_TOP_N,
+                                help=f"number of rows ranked by top (default: {CAPACITY_TOP_N})")
+    history_parser.add_argument('-o', '--output', help="also write the result to a file (.xlsx, .csv or .parquet)")
+    history_parser.add_argument('--db', default=HISTORY_FILE, help=f"history database (default: {HISTORY_FILE})")
+
+    return parser
+
+
+def open_history_store(args):
+    """
+    Open the store recording the summary rows of the modes that build a resource summary.
+
+    Each mode opens it once its inputs are checked, so that a command failing on its
+    arguments does not import pandas for it.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        HistoryStore: The history store, or None if the history is disabled
+    """
+    if not HISTORY_ENABLED or args.no_history:
+        return None
+
+    from core.history import HistoryStore
+    return HistoryStore(period=args.history_period)
+
+
+def run_watch_command(args):
+    """
+    Run the watch command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    if not os.path.exists(args.deployments):
+        print(f"Error: File not found at '{args.deployments}'")
+        return 2
+
+    from core.watcher import FolderWatcher
+
+    watcher = FolderWatcher(
+        args.deployments, args.inputs, output_dir=args.output_dir, output_format=args.format,
+        sheet_pattern=args.sheets, match_mode=args.match_names, capacity_plan=args.capacity_plan,
+        history_store=open_history_store(args), drilldown=args.drilldown, interval=args.interval,
+        debounce=args.debounce, use_cache=CACHE_ENABLED and not args.no_cache
+    )
+    watcher.run()
+    return 0
+
+
+def run_history_command(args):
+    """
+    Run the history command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    if not os.path.exists(args.db):
+        print(f"Error: No history recorded yet at '{args.db}'")
+        return 2
+
+    from core.history import HistoryStore
+
+    store = HistoryStore(args.db)
+    if args.query == 'trend':
+        result_df = store.trend(resource=args.resource, project=args.project, last=args.last)
+    elif args.query == 'top':
+        result_df = store.top(period=args.period, by=args.by, n=args.n)
+    else:
+        result_df = store.runs()
+
+    if result_df.empty:
+        print("No recorded rows match the query.")
+    else:
+        print(result_df.to_string(index=False))
+
+    if args.output:
+        from core.file_handler import FileHandler
+        FileHandler.write_table(result_df, args.output, 'Historique')
+        print(f"\nResults saved to {args.output}")
+
+    return 0
+
+
+def run_scenario_command(args):
+    """
+    Run the scenario command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    for file_path in [args.deployments, args.input] + args.rules:
+        if not os.path.exists(file_path):
+            print(f"Error: File not found at '{file_path}'")
+            return 2
+
+    from core.cache import DataFrameCache
+    from core.file_handler import FileHandler
+    from core.pipeline import create_matcher, match_projects, read_lookup_table, read_pivot
+    from core.scenarios import compare_scenarios, load_scenarios
+
+    try:
+        scenarios = load_scenarios(args.rules)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+
+    output_file = args.output or get_default_output_path(args.input, "_scenarios")
+    cache = DataFrameCache() if CACHE_ENABLED and not args.no_cache else None
+
+    print(f"Reading data from '{args.input}'...")
+    try:
+        pivot_df = read_pivot(args.input, cache=cache, verbose=True, sheet_pattern=args.sheets)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"Reading deployments data from '{args.deployments}'...")
+    lookup_df = read_lookup_table(args.deployments, cache=cache, verbose=True)
+    matcher = create_matcher(lookup_df, args.match_names, cache is not None)
+    if matcher is not None:
+        lookup_df = match_projects(pivot_df['Projet'], lookup_df, matcher, True, args.match_report)
+
+    print(f"Evaluating {len(scenarios)} rule sets: {', '.join(scenarios)}")
+    result_df = compare_scenarios(pivot_df, lookup_df, scenarios)
+    for name in scenarios:
+        print(f"  {name}: Charge Theorique {result_df.at[0, f'Charge Theorique {name}']:,.2f}, "
+              f"Ecart {result_df.at[0, f'Ecart {name}']:,.2f}")
+
+    print(f"Writing results to '{output_file}'...")
+    FileHandler.write_table(result_df, output_file, 'Scenarios')
+
+    return 0
+
+
+def run_serve_command(args):
+    """
+    Run the serve command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    if not os.path.exists(args.deployments):
+        print(f"Error: File not found at '{args.deployments}'")
+        return 2
+
+    from core.service import SummaryService, serve
+
+    service = SummaryService(
+        args.deployments, workers=args.workers, use_cache=CACHE_ENABLED and not args.no_cache,
+        sheet_pattern=args.sheets, match_mode=args.match_names, diagnostics=args.diagnostics,
+        capacity_plan=args.capacity_plan, history_store=open_history_store(args), drilldown=args.drilldown
+    )
+    serve(service, port=args.port)
+    return 0
+
+
+def run_submit_command(args):
+    """
+    Run the submit command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    if not os.path.exists(args.input):
+        print(f"Error: File not found at '{args.input}'")
+        return 2
+
+    from core.service import submit_job
+
+    result = submit_job(args.input, args.output, port=args.port)
+    if result.get('error'):
+        print(f"Error: {result['error']}")
+        return 1
+
+    print(result['output'])
+    return 0
+
+
+def run_stream_command(args):
+    """
+    Run the stream command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    for file_path in (args.deployments, args.input):
+        if not os.path.exists(file_path):
+            print(f"Error: File not found at '{file_path}'")
+            return 2
+
+    from core.cache import DataFrameCache
+    from core.file_handler import FileHandler
+    from core.pipeline import build_sheets, create_matcher, match_projects, read_lookup_table
+    from core.streaming import aggregate_file
+
+    output_file = args.output or os.path.splitext(
+        get_default_output_path(args.input, "_resource_summary")
+    )[0] + '.xlsx'
+
+    print(f"Aggregating '{args.input}' in chunks of {args.chunk_size:,} rows...")
+    try:
+        pivot_df, row_count = aggregate_file(args.input, args.chunk_size)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Aggregated {row_count:,} rows into {len(pivot_df):,} resource/project pairs")
+
+    cache = DataFrameCache() if CACHE_ENABLED and not args.no_cache else None
+    print(f"Reading deployments data from '{args.deployments}'...")
+    lookup_df = read_lookup_table(args.deployments, cache=cache, verbose=True)
+    matcher = create_matcher(lookup_df, args.match_names, cache is not None)
+    if matcher is not None:
+        lookup_df = match_projects(pivot_df['Projet'], lookup_df, matcher, True, args.match_report)
+    sheets = build_sheets(
+        pivot_df, lookup_df, capacity_plan=args.capacity_plan,
+        history_store=open_history_store(args), source=os.path.basename(args.input), drilldown=args.drilldown
+    )
+
+    print(f"Writing results to '{output_file}'...")
+    FileHandler.write_tables(sheets, output_file)
+
+    return 0
+
+
+def run_incremental_command(args):
+    """
+    Run the incremental command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    for file_path in (args.deployments, args.input):
+        if not os.path.exists(file_path):
+            print(f"Error: File not found at '{file_path}'")
+            return 2
+
+    from core.cache import DataFrameCache
+    from core.data_processor import DataProcessor
+    from core.file_handler import FileHandler
+    from core.incremental import IncrementalAggregator
+    from core.pipeline import build_sheets, create_matcher, match_projects, read_lookup_table, read_timesheet
+    from core.validation import DataValidator
+
+    output_file = args.output or get_default_output_path(args.input, "_resource_summary")
+    state_path = args.state or os.path.splitext(args.input)[0] + "_state.pkl"
+    cache = DataFrameCache() if CACHE_ENABLED and not args.no_cache else None
+
+    print(f"Reading data from '{args.input}'...")
+    df = read_timesheet(args.input, cache=cache, verbose=True, sheet_pattern=args.sheets)
+    is_valid, missing_columns = DataProcessor.validate_dataframe(df, TIMESHEET_COLUMNS)
+    if not is_valid:
+        print(f"Error: The following required columns are missing: {missing_columns}")
+        return 1
+
+    # Check the rows: hours are coerced to numbers, offending rows are reported
+    df, issues = DataValidator.check_timesheet(df)
+    if issues:
+        print(f"Timesheet data checks: {DataValidator.describe_issues(issues)}")
+
+    aggregator = IncrementalAggregator(state_path)
+    pivot_df, delta_rows, rebuilt = aggregator.update(df, full_rebuild=args.full_rebuild)
+    if rebuilt:
+        print(f"Aggregated all {delta_rows:,} rows (full rebuild)")
+    else:
+        print(f"Aggregated {delta_rows:,} new rows (watermark: {aggregator.watermark:,})")
+
+    if args.verify:
+        if not aggregator.verify(df):
+            print("Error: Incremental aggregates differ from a full rebuild; rerun with --full-rebuild.")
+            return 1
+        print("Verified: incremental aggregates match a full rebuild.")
+
+    print(f"Reading deployments data from '{args.deployments}'...")
+    lookup_df = read_lookup_table(args.deployments, cache=cache, verbose=True)
+    matcher = create_matcher(lookup_df, args.match_names, cache is not None)
+    if matcher is not None:
+        lookup_df = match_projects(pivot_df['Projet'], lookup_df, matcher, True, args.match_report)
+    sheets = build_sheets(
+        pivot_df, lookup_df, capacity_plan=args.capacity_plan,
+        history_store=open_history_store(args), source=os.path.basename(args.input), drilldown=args.drilldown
+    )
+
+    print(f"Writing results to '{output_file}'...")
+    FileHandler.write_tables(sheets, output_file)
+
+    return 0
+
+
+def run_consolidate_command(args):
+    """
+    Run the consolidate command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    period_files = {}
+    for item in args.period:
+        period, separator, file_path = item.partition('=')
+        if not separator or not period or not file_path:
+            print(f"Error: Invalid period '{item}', expected PERIOD=FILE")
+            return 2
+        if not os.path.exists(file_path):
+            print(f"Error: File not found at '{file_path}'")
+            return 2
+        period_files[period] = file_path
+
+    from core.cache import DataFrameCache
+    from core.data_processor import DataProcessor
+    from core.file_handler import FileHandler
+    from core.periods import PeriodAggregates
+    from core.pipeline import create_matcher, match_projects, read_lookup_table, read_timesheet
+    from core.validation import DataValidator
+
+    cache = DataFrameCache() if CACHE_ENABLED and not args.no_cache else None
+    aggregates = PeriodAggregates.load(args.state) if args.state else PeriodAggregates()
+
+    # Only read the periods that still need to be aggregated
+    frames = {}
+    for period, file_path in period_files.items():
+        if period in aggregates.periods and not args.refresh:
+            print(f"Period {period}: reusing stored aggregates")
+            continue
+        print(f"Period {period}: reading '{file_path}'...")
+        df = read_timesheet(file_path, cache=cache, verbose=True, sheet_pattern=args.sheets)
+        is_valid, missing_columns = DataProcessor.validate_dataframe(df, TIMESHEET_COLUMNS)
+        if not is_valid:
+            print(f"Error: The following required columns are missing from '{file_path}': {missing_columns}")
+            return 1
+
+        df, issues = DataValidator.check_timesheet(df)
+        if issues:
+            print(f"Period {period}: timesheet data checks: {DataValidator.describe_issues(issues)}")
+        frames[period] = df
+
+    added_periods = aggregates.add_periods(frames, replace=args.refresh)
+    if not aggregates.periods:
+        print("Error: No period to consolidate.")
+        return 2
+
+    if args.state:
+        aggregates.save(args.state)
+
+    print(f"Reading deployments data from '{args.deployments}'...")
+    lookup_df = read_lookup_table(args.deployments, cache=cache, verbose=True)
+
+    matcher = create_matcher(lookup_df, args.match_names, cache is not None)
+    if matcher is not None:
+        lookup_df = match_projects(aggregates.pivot_df['Projet'], lookup_df, matcher, True, args.match_report)
+
+    # Each period read is recorded under its own label rather than the --history-period
+    history_store = open_history_store(args)
+    if history_store is not None:
+        period_labels = aggregates.pivot_df['Periode'].astype(str)
+        for period in added_periods:
+            history_store.record(
+                aggregates.pivot_df[period_labels == period], lookup_df,
+                os.path.basename(period_files[period]), period=period
+            )
+
+    print(f"Consolidating periods: {', '.join(aggregates.periods)}")
+    result_df = aggregates.consolidated_summary(lookup_df)
+
+    print(f"Writing results to '{args.output}'...")
+    FileHandler.write_table(result_df, args.output, 'Resource Summary')
+
+    return 0
+
+
+def run_batch_command(args):
+    """
+    Run the batch command.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    if not os.path.exists(args.deployments):
+        print(f"Error: File not found at '{args.deployments}'")
+        return 2
+
+    from core.batch import collect_input_files, print_timing_table, run_batch
+
+    input_files = collect_input_files(args.inputs)
+    if not input_files:
+        print("Error: No timesheet files matched the given inputs.")
+        return 2
+
+    try:
+        results = run_batch(
+            args.deployments, input_files, output_dir=args.output_dir,
+            workers=args.workers, use_cache=CACHE_ENABLED and not args.no_cache, sheet_pattern=args.sheets,
+            output_format=args.format, match_mode=args.match_names, diagnostics=args.diagnostics,
+            capacity_plan=args.capacity_plan, history_store=open_history_store(args), drilldown=args.drilldown
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    print_timing_table(results)
+
+    return 1 if any(result['error'] is not None for result in results) else 0
+
+
+def cli(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list): Command-line arguments, defaults to sys.argv[1:]
+
+    Returns:
+        int: Process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    tracing = bool(args.timings or args.memory or args.trace or args.profile)
+    tracer.configure(enabled=tracing, track_memory=args.memory, profile=bool(args.profile))
+
+    try:
+        return run_command(args)
+    finally:
+        if tracing:
+            tracer.print_summary()
+        if args.trace:
+            tracer.write_json(args.trace)
+            print(f"\nStage trace saved to {args.trace}")
+        if args.profile:
+            tracer.write_profile(args.profile)
+
+
+def run_command(args):
+    """
+    Run the command selected on the command line.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    # The capacity plan is shared by the interactive, batch, watch, serve, stream and incremental modes
+    args.capacity_plan = None
+    if args.capacity is not None:
+        from core.capacity import CapacityPlan
+        try:
+            args.capacity_plan = CapacityPlan.from_option(args.capacity, top=args.top)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 2
+
+    if args.clear_cache:
+        from core.cache import DataFrameCache
+        removed = DataFrameCache().clear()
+        print(f"Removed {removed} cache entries from '{CACHE_DIR}'")
+
+    if args.command == 'batch':
+        return run_batch_command(args)
+    if args.command == 'consolidate':
+        return run_consolidate_command(args)
+    if args.command == 'incremental':
+        return run_incremental_command(args)
+    if args.command == 'stream':
+        return run_stream_command(args)
+    if args.command == 'scenario':
+        return run_scenario_command(args)
+    if args.command == 'serve':
+        return run_serve_command(args)
+    if args.command == 'submit':
+        return run_submit_command(args)
+    if args.command == 'watch':
+        return run_watch_command(args)
+    if args.command == 'history':
+        return run_history_command(args)
+
+    if args.clear_cache:
+        return 0
+
+    main(
+        use_cache=CACHE_ENABLED and not args.no_cache, sheet_pattern=args.sheets,
+        match_mode=args.match_names, match_report_file=args.match_report, diagnostics=args.diagnostics,
+        capacity_plan=args.capacity_plan, history_store=open_history_store(args), drilldown=args.drilldown
+    )
+    return 0
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(cli())
\ No newline at end of file
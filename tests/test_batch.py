@@ -0,0 +1,54 @@
+import os
+
+import pandas as pd
+import pytest
+
+from core.batch import get_output_paths, run_batch
+from core.watcher import FolderWatcher
+
+
+def test_timesheets_sharing_a_summary_file_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match='same file'):
+        get_output_paths([str(tmp_path / 'ts.xlsx'), str(tmp_path / 'ts.csv')])
+
+
+def test_same_name_in_different_directories_collides_only_in_one_output_dir(tmp_path):
+    input_files = [str(tmp_path / 'a' / 'ts.xlsx'), str(tmp_path / 'b' / 'ts.xlsx')]
+
+    output_files = get_output_paths(input_files)
+    assert len(set(output_files.values())) == 2
+
+    with pytest.raises(ValueError, match='same file'):
+        get_output_paths(input_files, output_dir=str(tmp_path / 'out'))
+
+
+def test_watcher_skips_colliding_timesheets(tmp_path):
+    for name in ['deployments.xlsx', 'ts.xlsx', 'ts.csv', 'other.xlsx']:
+        (tmp_path / name).write_bytes(b'')
+
+    watcher = FolderWatcher(str(tmp_path / 'deployments.xlsx'), [str(tmp_path)])
+    watched = watcher.scan()
+
+    assert os.path.normpath(str(tmp_path / 'other.xlsx')) in watched
+    assert not any(os.path.basename(file_path).startswith('ts.') for file_path in watched)
+    assert len(watcher.collisions) == 1
+
+
+def test_numeric_resource_codes_are_written_to_parquet(tmp_path):
+    deployments_file = str(tmp_path / 'deployments.xlsx')
+    timesheet_file = str(tmp_path / 'timesheet.xlsx')
+    pd.DataFrame({
+        'Nom': ['Projet A', 'Projet B'], 'Niveau de connexion': ['Normée +', 'Connexion EDI Sortante'],
+        'Phase du projet': ['En production (VSR)', 'Autre'],
+    }).to_excel(deployments_file, index=False)
+    pd.DataFrame({
+        'Ressource': [1001, 1002, 1001], 'Projet': ['Projet A', 'Projet A', 'Projet B'], 'Soumise (h)': [8, 4, 2],
+    }).to_excel(timesheet_file, index=False)
+
+    results = run_batch(
+        deployments_file, [timesheet_file], output_dir=str(tmp_path), workers=1, output_format='parquet'
+    )
+
+    assert results[0]['error'] is None
+    summary = pd.read_parquet(results[0]['output'])
+    assert summary['Resource/ PROJET'].tolist()[:3] == ['1001', '    Projet A', '    Projet B']
@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from config.settings import TIMESHEET_COLUMNS
+from core.cache import DataFrameCache
+from core.excel_handler import ExcelHandler
+
+
+@pytest.mark.parametrize('timesheet', [
+    # Hours typed by hand: decimal commas, text and numbers in one column
+    {'Ressource': ['Alice', 'Bob', 'Alice', 'Bob'], 'Projet': ['A', 'A', 'B', 'B'],
+     'Soumise (h)': [5.5, '4,5', 'abc', -2]},
+    # Numeric project codes next to project names
+    {'Ressource': ['Alice', 'Bob', 'Alice'], 'Projet': [101, 'Projet A', 5], 'Soumise (h)': [8, 4, 2]},
+], ids=['messy-hours', 'numeric-project-codes'])
+def test_read_excel_with_uncacheable_columns(tmp_path, timesheet):
+    file_path = str(tmp_path / 'timesheet.xlsx')
+    pd.DataFrame(timesheet).to_excel(file_path, index=False)
+    cache = DataFrameCache(str(tmp_path / 'cache'))
+
+    uncached = ExcelHandler.read_excel(file_path, TIMESHEET_COLUMNS)
+    cached = ExcelHandler.read_excel(file_path, TIMESHEET_COLUMNS, cache=cache)
+
+    pd.testing.assert_frame_equal(cached, uncached)
+
+
+def test_cached_entries_round_trip(tmp_path):
+    cache = DataFrameCache(str(tmp_path))
+    df = pd.DataFrame({'Ressource': pd.Categorical(['Alice', 'Bob']), 'Soumise (h)': [8.0, 4.0]})
+
+    assert cache.put('key', df)
+    pd.testing.assert_frame_equal(cache.get('key'), df)
@@ -0,0 +1,140 @@
+import pandas as pd
+import pytest
+
+from benchmarks.generators import generate_deployments, generate_timesheet
+from core.data_processor import DataProcessor
+from core.drilldown import DrillDown
+from core.excel_handler import ExcelHandler
+from core.history import HistoryStore
+
+
+def make_lookup(rows):
+    deployments_df = pd.DataFrame(rows, columns=['Nom', 'Niveau de connexion', 'Phase du projet'])
+    return DataProcessor.create_lookup_table(deployments_df, ['Niveau de connexion', 'Phase du projet'])
+
+
+def test_encode_identifiers_sorts_mixed_type_names():
+    df = pd.DataFrame({
+        'Ressource': pd.Categorical(['Bob', 7, 'Alice']),
+        'Projet': pd.Categorical(['Projet A', 101, 5]),
+    })
+    # Unsorted categories, as read from a workbook
+    df['Projet'] = df['Projet'].cat.reorder_categories(['Projet A', 101, 5])
+
+    encoded = DataProcessor.encode_identifiers(df)
+
+    assert list(encoded['Projet'].cat.categories) == [101, 5, 'Projet A']
+    assert list(encoded['Projet']) == ['Projet A', 101, 5]
+
+
+def test_encoding_mixed_identifiers_twice_keeps_their_order():
+    df = pd.DataFrame({'Ressource': ['Alice', 12, 3], 'Projet': [101, 'Projet A', 5]})
+
+    encoded = DataProcessor.encode_identifiers(df)
+    assert encoded['Projet'].cat.categories.tolist() == [101, 5, 'Projet A']
+    assert encoded['Ressource'].cat.categories.tolist() == [12, 3, 'Alice']
+
+    again = DataProcessor.encode_identifiers(encoded)
+    assert again['Projet'].cat.categories.tolist() == [101, 5, 'Projet A']
+
+
+def test_mixed_type_project_names_are_summarized(tmp_path):
+    pivot_df = pd.DataFrame({
+        'Ressource': pd.Categorical(['Bob', 'Alice', 'Alice', 7]),
+        'Projet': pd.Categorical(['Projet A', 101, 'Projet A', 5], categories=['Projet A', 5, 101]),
+        'Charge JH': [2.0, 1.0, 0.5, 1.0],
+    })
+    lookup_df = make_lookup([[101, 'Normée', 'Développement'], ['Projet A', 'Connexion EDI', 'Recette interne']])
+
+    summary = DataProcessor.format_resource_summary(pivot_df, lookup_df)
+    assert summary['Resource/ PROJET'].tolist() == [
+        7, '    5', 'Alice', '    101', '    Projet A', 'Bob', '    Projet A'
+    ]
+    assert summary['Charge Theorique'].tolist()[3:5] == [0.25, 4.0]
+    assert isinstance(summary['Resource/ PROJET'].dtype, pd.CategoricalDtype)
+    assert summary['Charge JH'].dtype == 'float64'
+
+    sheets = DrillDown.build_sheets(pivot_df, lookup_df)
+    assert sheets['Par Projet']['Somme de Charge JH'].dropna().tolist() == [1.0, 1.0, 2.5]
+
+    store = HistoryStore(str(tmp_path / 'history.sqlite'), period='2024-01')
+    assert store.record(pivot_df, lookup_df, 'mixed.xlsx') == 4
+    assert store.top(by='projet')['Projet'].tolist() == ['101', 'Projet A']
+
+
+def row_by_row_summary(pivot_df, connection_dict, phase_dict):
+    """
+    The row-by-row format_resource_summary that the vectorized version replaced.
+    """
+    result_df = pd.DataFrame(columns=[
+        'Resource/ PROJET', 'Charge JH', 'Somme de Charge JH',
+        'Niveau de connexion', 'Phase du projet', 'Charge Theorique', 'Ecart'
+    ])
+    current_resource = None
+    row_index = 0
+    pivot_df = pivot_df.sort_values(['Ressource', 'Projet'])
+
+    for _, row in pivot_df.iterrows():
+        resource = row['Ressource']
+        project = row['Projet']
+        charge = row['Charge JH']
+
+        if resource != current_resource:
+            result_df.loc[row_index, 'Resource/ PROJET'] = resource
+            resource_charge = pivot_df[pivot_df['Ressource'] == resource]['Charge JH'].sum()
+            result_df.loc[row_index, 'Somme de Charge JH'] = resource_charge
+            row_index += 1
+            current_resource = resource
+
+        connection_level = connection_dict.get(project, '')
+        project_phase = phase_dict.get(project, '')
+
+        theoretical_charge = None
+        if connection_level and project_phase:
+            theoretical_charge = DataProcessor.calculate_theoretical_charge(connection_level, project_phase)
+
+        result_df.loc[row_index, 'Resource/ PROJET'] = f"    {project}"
+        result_df.loc[row_index, 'Charge JH'] = charge
+        result_df.loc[row_index, 'Niveau de connexion'] = connection_level
+        result_df.loc[row_index, 'Phase du projet'] = project_phase
+
+        if theoretical_charge is not None:
+            result_df.loc[row_index, 'Charge Theorique'] = theoretical_charge
+            result_df.loc[row_index, 'Ecart'] = theoretical_charge - charge
+
+        row_index += 1
+
+    return result_df
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_format_resource_summary_matches_row_by_row_output(seed):
+    timesheet_df = generate_timesheet(2000, seed=seed)
+    deployments_df = generate_deployments(2000, seed=seed)
+
+    # Numeric codes next to project and resource names, in both files
+    numeric_projects = {f"Projet {i:05d}": i for i in range(0, 40, 3)}
+    timesheet_df['Projet'] = timesheet_df['Projet'].replace(numeric_projects)
+    timesheet_df['Ressource'] = timesheet_df['Ressource'].replace({'Ressource 0001': 1, 'Ressource 0004': 4})
+    deployments_df['Nom'] = deployments_df['Nom'].replace(numeric_projects)
+
+    # Projects missing from the deployments file, and a connection level without a rule
+    deployments_df = deployments_df[~deployments_df['Nom'].isin(['Projet 00001', 'Projet 00002', 9])].copy()
+    deployments_df.loc[deployments_df['Nom'] == 'Projet 00005', 'Niveau de connexion'] = 'Niveau inconnu'
+
+    pivot_df = ExcelHandler.create_pivot_table(
+        DataProcessor.calculate_charge_jh(DataProcessor.encode_identifiers(timesheet_df)),
+        'Charge JH', ['Ressource', 'Projet']
+    )
+    columns = ['Niveau de connexion', 'Phase du projet']
+
+    expected = row_by_row_summary(
+        pivot_df,
+        DataProcessor.create_connection_dict(deployments_df, 'Niveau de connexion'),
+        DataProcessor.create_connection_dict(deployments_df, 'Phase du projet'),
+    )
+    result = DataProcessor.format_resource_summary(pivot_df, DataProcessor.create_lookup_table(deployments_df, columns))
+
+    assert deployments_df['Nom'].duplicated().any()
+    assert (expected['Niveau de connexion'] == '').any()
+    pd.testing.assert_frame_equal(result.astype(object), expected)
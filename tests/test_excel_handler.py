@@ -0,0 +1,30 @@
+import pandas as pd
+
+from config.settings import TIMESHEET_COLUMNS
+from core.excel_handler import ExcelHandler
+from core.pipeline import process_timesheet, read_lookup_table
+
+HOURS = [7.3, 0.1, 2.7]
+
+
+def test_hours_keep_their_precision(tmp_path):
+    deployments_file = str(tmp_path / 'deployments.xlsx')
+    timesheet_file = str(tmp_path / 'timesheet.xlsx')
+    output_file = str(tmp_path / 'summary.xlsx')
+    pd.DataFrame({
+        'Nom': ['Projet A', 'Projet B', 'Projet C'], 'Niveau de connexion': ['Normée +'] * 3,
+        'Phase du projet': ['En production (VSR)'] * 3,
+    }).to_excel(deployments_file, index=False)
+    pd.DataFrame({
+        'Ressource': ['Alice', 'Bob', 'Carol'], 'Projet': ['Projet A', 'Projet B', 'Projet C'], 'Soumise (h)': HOURS,
+    }).to_excel(timesheet_file, index=False)
+
+    df = ExcelHandler.read_excel(timesheet_file, TIMESHEET_COLUMNS)
+    assert df['Soumise (h)'].dtype == 'float64'
+
+    process_timesheet(timesheet_file, read_lookup_table(deployments_file), output_file)
+    summary = pd.read_excel(output_file)
+    resource_rows = summary[summary['Resource/ PROJET'].isin(['Alice', 'Bob', 'Carol'])]
+
+    # Exact float64 values, as with hours never downcast
+    assert resource_rows['Somme de Charge JH'].tolist() == [hours / 8 for hours in HOURS]
@@ -0,0 +1,33 @@
+import os
+
+import pandas as pd
+
+import core.pipeline
+from core.matching import normalize_names
+from main import cli
+
+
+def test_normalize_names_strips_accents_case_and_spacing():
+    names = pd.Series(['Connexion  EDI Sortante', 'Normée +', 'ÉTUDE\tPréalable'])
+    assert normalize_names(names).tolist() == ['connexion edi sortante', 'normee +', 'etude prealable']
+
+
+def test_no_cache_leaves_the_match_cache_alone(tmp_path, monkeypatch):
+    match_cache_file = str(tmp_path / 'project_matches.json')
+    monkeypatch.setattr(core.pipeline, 'MATCH_CACHE_FILE', match_cache_file)
+    deployments_file = str(tmp_path / 'deployments.xlsx')
+    timesheet_file = str(tmp_path / 'timesheet.csv')
+    pd.DataFrame({
+        'Nom': ['Projet A'], 'Niveau de connexion': ['Normée +'], 'Phase du projet': ['En production (VSR)'],
+    }).to_excel(deployments_file, index=False)
+    pd.DataFrame({'Ressource': ['Alice'], 'Projet': ['projet  a'], 'Soumise (h)': [8]}).to_csv(
+        timesheet_file, index=False
+    )
+
+    arguments = ['--match-names', 'normalized', 'stream', '-d', deployments_file, timesheet_file,
+                 '-o', str(tmp_path / 'summary.xlsx')]
+    assert cli(['--no-history', '--no-cache'] + arguments) == 0
+    assert not os.path.exists(match_cache_file)
+
+    assert cli(['--no-history'] + arguments) == 0
+    assert os.path.exists(match_cache_file)
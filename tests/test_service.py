@@ -0,0 +1,108 @@
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from config.settings import SERVICE_HOST
+from core.capacity import CapacityPlan
+from core.history import HistoryStore
+from core.service import SummaryService, serve
+
+
+def write_inputs(tmp_path):
+    deployments_file = str(tmp_path / 'deployments.xlsx')
+    timesheet_file = str(tmp_path / 'timesheet.xlsx')
+    pd.DataFrame({
+        'Nom': ['Projet A', 'Projet B'],
+        'Niveau de connexion': ['Normée +', 'Connexion EDI Sortante'],
+        'Phase du projet': ['En production (VSR)', 'Autre'],
+    }).to_excel(deployments_file, index=False)
+    pd.DataFrame({
+        'Ressource': ['Alice', 'Bob', 'Alice'],
+        'Projet': ['Projet A', 'Projet A', 'Projet B'],
+        'Soumise (h)': [8, 4, 2],
+    }).to_excel(timesheet_file, index=False)
+    return deployments_file, timesheet_file
+
+
+def test_jobs_use_the_service_options(tmp_path):
+    deployments_file, timesheet_file = write_inputs(tmp_path)
+    history_store = HistoryStore(str(tmp_path / 'history.db'), period='2026-01')
+    service = SummaryService(
+        deployments_file, workers=1, use_cache=False, diagnostics=True, capacity_plan=CapacityPlan(default=1.0),
+        history_store=history_store, drilldown=True
+    )
+
+    try:
+        result = service.run_job(timesheet_file, str(tmp_path / 'summary.xlsx'))
+    finally:
+        service.shutdown()
+
+    assert result['error'] is None
+    sheet_names = openpyxl.load_workbook(result['output'], read_only=True).sheetnames
+    assert {'Par Projet', 'Par Niveau', 'Par Phase', 'Diagnostics'} <= set(sheet_names)
+    assert any(name.startswith('Capacit') for name in sheet_names)
+    assert history_store.runs()['Source'].tolist() == ['timesheet.xlsx']
+
+
+def start_server(service):
+    with socket.socket() as probe:
+        probe.bind((SERVICE_HOST, 0))
+        port = probe.getsockname()[1]
+    threading.Thread(target=serve, args=(service, SERVICE_HOST, port), daemon=True).start()
+    return f"http://{SERVICE_HOST}:{port}"
+
+
+def request_status(url, path, body=None):
+    request = urllib.request.Request(url + path, data=body, method='GET' if body is None else 'POST')
+    for _ in range(50):
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except urllib.error.URLError:
+            # The server thread is not listening yet
+            time.sleep(0.1)
+    pytest.fail("The service did not answer")
+
+
+@pytest.mark.parametrize('body', [
+    b'[1]', b'"timesheet.xlsx"', b'{}', b'not json', b'{"timesheet": null}', b'{"timesheet": [1]}',
+    b'{"timesheet": 3}', b'{"timesheet": "timesheet.xlsx", "output": 1}',
+])
+def test_invalid_job_bodies_are_rejected(tmp_path, body):
+    deployments_file, _ = write_inputs(tmp_path)
+    service = SummaryService(deployments_file, workers=1, use_cache=False)
+
+    try:
+        assert request_status(start_server(service), '/summary', body) == 400
+    finally:
+        service.shutdown()
+
+
+def test_unreadable_deployments_keep_the_loaded_lookup(tmp_path):
+    deployments_file, timesheet_file = write_inputs(tmp_path)
+    service = SummaryService(deployments_file, workers=1, use_cache=False)
+    lookup_df = service.lookup_df
+    body = json.dumps({'timesheet': timesheet_file, 'output': str(tmp_path / 'summary.xlsx')}).encode('utf-8')
+
+    try:
+        url = start_server(service)
+        os.rename(deployments_file, deployments_file + '.bak')
+        assert request_status(url, '/status') == 503
+        assert request_status(url, '/summary', body) == 503
+        assert service.lookup_df is lookup_df
+
+        os.rename(deployments_file + '.bak', deployments_file)
+        assert request_status(url, '/status') == 200
+        assert request_status(url, '/summary', body) == 200
+    finally:
+        service.shutdown()
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from core.excel_handler import ExcelHandler
+from core.streaming import aggregate_chunks
+from core.validation import DataValidator
+from main import cli
+
+TEXT_HOURS = {
+    'Ressource': ['Alice', 'Bob', 'Alice', 'Bob'],
+    'Projet': ['Projet A', 'Projet A', 'Projet B', 'Projet B'],
+    'Soumise (h)': [8, '4,5', 'abc', '2'],
+}
+
+
+def test_streamed_text_hours_match_the_checked_timesheet():
+    df = pd.DataFrame(TEXT_HOURS)
+    checked, _ = DataValidator.check_timesheet(df)
+    expected = ExcelHandler.create_pivot_table(
+        checked.assign(**{'Charge JH': checked['Soumise (h)'] / 8}), 'Charge JH', ['Ressource', 'Projet']
+    )
+
+    pivot_df, row_count = aggregate_chunks([df.iloc[:2], df.iloc[2:]])
+
+    assert row_count == 4
+    assert pivot_df['Charge JH'].tolist() == pytest.approx(expected['Charge JH'].tolist())
+
+
+@pytest.mark.parametrize('command', ['stream', 'incremental', 'consolidate'])
+def test_commands_accept_text_hours(tmp_path, monkeypatch, command):
+    monkeypatch.setenv('RESOURCE_SUMMARY_CACHE_DIR', str(tmp_path / 'cache'))
+    deployments_file = str(tmp_path / 'deployments.xlsx')
+    timesheet_file = str(tmp_path / 'timesheet.csv')
+    output_file = str(tmp_path / 'summary.xlsx')
+    pd.DataFrame({
+        'Nom': ['Projet A', 'Projet B'],
+        'Niveau de connexion': ['Normée +', 'Connexion EDI Sortante'],
+        'Phase du projet': ['En production (VSR)', 'Autre'],
+    }).to_excel(deployments_file, index=False)
+    pd.DataFrame(TEXT_HOURS).to_csv(timesheet_file, index=False)
+
+    if command == 'consolidate':
+        arguments = ['-d', deployments_file, '--period', f'2026-01={timesheet_file}']
+    else:
+        arguments = ['-d', deployments_file, timesheet_file]
+    if command == 'incremental':
+        arguments += ['--state', str(tmp_path / 'state.pkl')]
+
+    assert cli(['--no-history', '--no-cache', command] + arguments + ['-o', output_file]) == 0
+
+    summary = pd.read_excel(output_file)
+    assert summary['Somme de Charge JH'].sum() == pytest.approx((8 + 4.5 + 2) / 8)
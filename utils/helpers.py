@@ -1,4 +1,6 @@
 import os
+import threading
+from contextlib import contextmanager
 
 
 def get_user_file_path(prompt, must_exist=True):
@@ -70,4 +72,35 @@ def create_directories(path_list):
     for directory in path_list:
         if not os.path.exists(directory):
             os.makedirs(directory)
-            print(f"Created directory: {directory}")
\ No newline at end of file
+            print(f"Created directory: {directory}")
+
+
+@contextmanager
+def atomic_output_path(file_path):
+    """
+    Give a temporary path to write a file to, renamed to file_path once written.
+
+    The temporary file is in the same directory, so the rename is atomic: readers
+    see either the previous file or the complete new one, never a partial write.
+    If writing fails, the temporary file is removed and file_path is left untouched.
+
+    Args:
+        file_path (str): Final path of the file
+
+    Yields:
+        str: The temporary path to write to
+    """
+    output_dir = os.path.dirname(file_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Hidden, with an extension that directory scans of input files ignore
+    temp_path = os.path.join(
+        output_dir, f".{os.path.basename(file_path)}.{os.getpid()}-{threading.get_ident()}.tmp"
+    )
+    try:
+        yield temp_path
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,234 @@
+import functools
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+class Tracer:
+    """
+    Collects per-stage timing and memory measurements of a run.
+
+    Disabled by default: instrumented functions then run with a single flag check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self.profile = False
+        self.records = []
+        self._depth = 0
+        self._started = 0
+        self._memory_peaks = []
+        self._hottest = None
+
+    def configure(self, enabled=True, track_memory=False, profile=False):
+        """
+        Enable or disable tracing and reset the collected measurements.
+
+        Args:
+            enabled (bool): Whether to record stages
+            track_memory (bool): Whether to measure Python memory peaks with tracemalloc
+            profile (bool): Whether to keep cProfile statistics of the slowest top-level stage
+        """
+        self.enabled = enabled
+        self.track_memory = enabled and track_memory
+        self.profile = enabled and profile
+        self.records = []
+        self._depth = 0
+        self._started = 0
+        self._memory_peaks = []
+        self._hottest = None
+
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """
+        Measure a block of code as a pipeline stage.
+
+        Args:
+            name (str): Stage name
+            rows_in (int): Number of input rows, if known
+
+        Yields:
+            dict: The stage record; callers may set 'rows_out'
+        """
+        if not self.enabled:
+            yield {}
+            return
+
+        record = {
+            'stage': name, 'order': self._started, 'depth': self._depth,
+            'rows_in': rows_in, 'rows_out': None
+        }
+        self._started += 1
+        profiler = None
+        if self.profile and self._depth == 0:
+            import cProfile
+            profiler = cProfile.Profile()
+
+        if self.track_memory:
+            # Fold the enclosing stage's peak so far into its running peak, then start ours
+            if self._memory_peaks:
+                self._memory_peaks[-1] = max(self._memory_peaks[-1], tracemalloc.get_traced_memory()[1])
+            self._memory_peaks.append(0)
+            tracemalloc.reset_peak()
+
+        self._depth += 1
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record['wall_s'] = time.perf_counter() - wall_start
+            record['cpu_s'] = time.process_time() - cpu_start
+            self._depth -= 1
+
+            if self.track_memory:
+                peak = max(self._memory_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                record['peak_traced_mb'] = peak / (1024 * 1024)
+                # The enclosing stage's peak includes this stage's peak
+                if self._memory_peaks:
+                    self._memory_peaks[-1] = max(self._memory_peaks[-1], peak)
+                tracemalloc.reset_peak()
+
+            record['peak_rss_mb'] = get_peak_rss_mb()
+
+            if profiler is not None and (self._hottest is None or record['wall_s'] > self._hottest[1]):
+                self._hottest = (name, record['wall_s'], profiler)
+
+            self.records.append(record)
+
+    def print_summary(self):
+        """
+        Print a table of the recorded stages, in execution order.
+        """
+        if not self.records:
+            return
+
+        records = self._ordered_records()
+        name_width = max(len(r['stage']) + 2 * r['depth'] for r in records)
+
+        print(f"\n{'Stage':<{name_width}}  {'Wall (s)':>9}  {'CPU (s)':>8}  {'Rows in':>10}  "
+              f"{'Rows out':>10}  {'Peak RSS':>9}" + ("  Peak traced" if self.track_memory else ""))
+        for r in records:
+            line = (f"{'  ' * r['depth'] + r['stage']:<{name_width}}  {r['wall_s']:>9.3f}  {r['cpu_s']:>8.3f}  "
+                    f"{_format_count(r['rows_in']):>10}  {_format_count(r['rows_out']):>10}  "
+                    f"{_format_mb(r['peak_rss_mb']):>9}")
+            if self.track_memory:
+                line += f"  {_format_mb(r['peak_traced_mb']):>11}"
+            print(line)
+
+    def write_json(self, file_path):
+        """
+        Write the recorded stages to a JSON trace file.
+
+        Args:
+            file_path (str): Path of the trace file
+        """
+        output_dir = os.path.dirname(file_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        with open(file_path, 'w', encoding='utf-8') as trace_file:
+            json.dump({'stages': self._ordered_records()}, trace_file, indent=2)
+
+    def write_profile(self, file_path, limit=20):
+        """
+        Save the cProfile statistics of the slowest top-level stage and print its top entries.
+
+        Args:
+            file_path (str): Path of the .prof file (readable with pstats or snakeviz)
+            limit (int): Number of entries to print
+        """
+        if self._hottest is None:
+            return
+
+        import pstats
+
+        name, wall_s, profiler = self._hottest
+        profiler.dump_stats(file_path)
+
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+        print(f"\nProfile of the slowest stage, {name} ({wall_s:.3f}s), saved to {file_path}")
+        print(stream.getvalue())
+
+    def _ordered_records(self):
+        # Records are appended when a stage ends, nested stages first; restore start order
+        return [
+            {key: value for key, value in record.items() if key != 'order'}
+            for record in sorted(self.records, key=lambda record: record['order'])
+        ]
+
+
+# Tracer shared by the whole process
+tracer = Tracer()
+
+
+def instrumented(func):
+    """
+    Decorator recording each call of a pipeline function as a stage of the global tracer.
+
+    The number of input rows is taken from the first DataFrame argument and the number
+    of output rows from a DataFrame result.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+
+        rows_in = next((len(arg) for arg in args if _is_frame(arg)), None)
+        with tracer.stage(name, rows_in) as record:
+            result = func(*args, **kwargs)
+            if _is_frame(result):
+                record['rows_out'] = len(result)
+        return result
+
+    return wrapper
+
+
+def get_peak_rss_mb():
+    """
+    Get the peak resident set size of the process so far.
+
+    Returns:
+        float: Peak RSS in MB, or None where the platform does not report it
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _is_frame(value):
+    return hasattr(value, 'columns') and hasattr(value, '__len__')
+
+
+def _format_count(value):
+    return f"{value:,}" if value is not None else '-'
+
+
+def _format_mb(value):
+    return f"{value:.1f} MB" if value is not None else '-'